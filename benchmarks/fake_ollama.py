@@ -0,0 +1,283 @@
+"""Fake Ollama - 부하 테스트용 로컬 Ollama 대역 서버
+
+/api/chat(일반·스트리밍)과 /api/embed를 HTTP로 흉내 낸다. 실제 모델 대신
+프롬프트 종류(라우터/플래너/그레이더/재작성/답변)에 맞는 고정 응답을 주고,
+지연 시간은 설정값으로 만든다.
+
+    지연 = latency_ms + 프롬프트 토큰 / prefill_rate + 출력 토큰 / token_rate
+
+임베딩은 문자 바이그램 해시로 만든 결정적 벡터라서 같은 텍스트는 항상 같은 벡터,
+겹치는 단어가 많은 텍스트는 가까운 벡터가 된다 (검색 결과가 의미를 가짐).
+
+단독 실행:
+    python -m benchmarks.fake_ollama --port 11435 --latency-ms 200 --token-rate 40
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from src.context_packer import estimate_tokens
+from src.prompts.grader import GRADER_PROMPT
+from src.prompts.planner import PLANNER_PROMPT, ROUTE_AND_PLAN_PROMPT
+from src.prompts.rewriter import REWRITER_PROMPT
+from src.prompts.router import ROUTER_PROMPT
+
+ANSWER_WORDS = (
+    "검색된 문서에 따르면 해당 규정은 인사팀 포털에서 신청하며 "
+    "팀장 승인 후 처리됩니다 자세한 내용은 사내 규정 문서를 참고하세요"
+).split()
+
+
+@dataclass
+class FakeOllamaConfig:
+    latency_ms: float = 0.0  # 요청마다 고정 지연 (모델 로딩·큐 대기 등)
+    token_rate: float = 0.0  # 출력 토큰/초 (0이면 지연 없음)
+    prefill_rate: float = 0.0  # 프롬프트 토큰/초 (0이면 지연 없음)
+    answer_tokens: int = 60  # 답변 생성 단계의 출력 토큰 수
+    embed_dim: int = 256
+    embed_latency_ms: float = 0.0  # /api/embed 요청마다 고정 지연
+    route: str = "INTERNAL_SEARCH"  # 라우터가 돌려줄 라우트
+    grade: str = "PASS"  # 그레이더가 돌려줄 판단
+
+
+def fake_embedding(text: str, dim: int = 256) -> list[float]:
+    """문자 바이그램을 해시해 만든 단위 벡터 (프로세스가 달라도 같은 결과)."""
+    vec = np.zeros(dim, dtype=np.float32)
+    for token in re.findall(r"\w+", text.lower()):
+        grams = [token] if len(token) == 1 else [token[i:i + 2] for i in range(len(token) - 1)]
+        for gram in grams:
+            h = int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+            vec[h % dim] += 1.0 if (h >> 32) & 1 else -1.0
+    norm = np.linalg.norm(vec)
+    if norm == 0:
+        vec[0] = 1.0
+        norm = 1.0
+    return (vec / norm).tolist()
+
+
+def _user_query(content: str) -> str:
+    """플래너 입력("## 사용자 질문\\n...")이나 재작성 입력("원본 질문: ...")에서 질문만 꺼낸다."""
+    if "## 사용자 질문" in content:
+        return content.rsplit("## 사용자 질문", 1)[1].strip()
+    if content.startswith("원본 질문:"):
+        return content.split(":", 1)[1].strip()
+    return content.strip()
+
+
+def fake_reply(messages: list[dict], config: FakeOllamaConfig) -> tuple[str, str]:
+    """(단계 이름, 응답 content)를 만든다. 단계는 시스템 프롬프트로 구분한다."""
+    system = messages[0].get("content", "") if messages and messages[0].get("role") == "system" else ""
+    user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    query = _user_query(user)
+    plan = {
+        "intent": f"{query}에 대한 정보 검색",
+        "keywords": re.findall(r"\w+", query)[:4],
+        "search_queries": [query],
+        "strategy": "SINGLE",
+    }
+
+    if system == ROUTER_PROMPT:
+        return "router", config.route
+    if system == PLANNER_PROMPT:
+        return "planner", json.dumps(plan, ensure_ascii=False)
+    if system == ROUTE_AND_PLAN_PROMPT:
+        return "route_planner", json.dumps({"route": config.route, **plan}, ensure_ascii=False)
+    if system == GRADER_PROMPT:
+        return "grader", config.grade
+    if system == REWRITER_PROMPT:
+        return "rewriter", f"{query} 규정 절차"
+    words = [ANSWER_WORDS[i % len(ANSWER_WORDS)] for i in range(config.answer_tokens)]
+    return "answer", " ".join(words)
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    """요청마다 스레드로 처리하는 Fake Ollama HTTP 서버 (keep-alive 지원)."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: FakeOllamaConfig | None = None):
+        super().__init__((host, port), _Handler)
+        self.config = config or FakeOllamaConfig()
+        self.requests: dict[str, int] = {}  # 단계별 요청 수
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, stage: str):
+        with self._lock:
+            self.requests[stage] = self.requests.get(stage, 0) + 1
+
+    def start(self) -> "FakeOllamaServer":
+        """백그라운드 스레드에서 서버를 띄운다."""
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # requests 세션의 keep-alive 연결 재사용
+
+    server: FakeOllamaServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": "invalid json"})
+            return
+
+        if self.path == "/api/chat":
+            self._chat(payload)
+        elif self.path == "/api/embed":
+            self._embed(payload)
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _write_chunk(self, body: dict):
+        data = (json.dumps(body, ensure_ascii=False) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _chat(self, payload: dict):
+        config = self.server.config
+        messages = payload.get("messages", [])
+        stage, content = fake_reply(messages, config)
+        self.server.count(stage)
+
+        prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in messages)
+        tokens = content.split(" ")
+        prefill_sec = config.latency_ms / 1000
+        if config.prefill_rate > 0:
+            prefill_sec += prompt_tokens / config.prefill_rate
+        token_sec = 1 / config.token_rate if config.token_rate > 0 else 0.0
+
+        start = time.perf_counter()
+        model = payload.get("model", "fake")
+        if not payload.get("stream"):
+            time.sleep(prefill_sec + token_sec * len(tokens))
+            self._send_json(200, {
+                "model": model,
+                "message": {"role": "assistant", "content": content},
+                "done": True,
+                **_metrics(start, prefill_sec, prompt_tokens, len(tokens)),
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        time.sleep(prefill_sec)
+        for i, token in enumerate(tokens):
+            if token_sec:
+                time.sleep(token_sec)
+            delta = token if i == 0 else f" {token}"
+            self._write_chunk({"model": model, "message": {"role": "assistant", "content": delta}, "done": False})
+        self._write_chunk({
+            "model": model,
+            "message": {"role": "assistant", "content": ""},
+            "done": True,
+            **_metrics(start, prefill_sec, prompt_tokens, len(tokens)),
+        })
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _embed(self, payload: dict):
+        config = self.server.config
+        texts = payload.get("input", [])
+        if isinstance(texts, str):
+            texts = [texts]
+        self.server.count("embed")
+        if config.embed_latency_ms:
+            time.sleep(config.embed_latency_ms / 1000)
+        self._send_json(200, {
+            "model": payload.get("model", "fake"),
+            "embeddings": [fake_embedding(t, config.embed_dim) for t in texts],
+        })
+
+
+def _metrics(start: float, prefill_sec: float, prompt_tokens: int, eval_tokens: int) -> dict:
+    """Ollama 응답과 같은 이름의 처리 시간(ns)·토큰 수."""
+    total_ns = int((time.perf_counter() - start) * 1e9)
+    prefill_ns = int(prefill_sec * 1e9)
+    return {
+        "total_duration": total_ns,
+        "load_duration": 0,
+        "prompt_eval_count": prompt_tokens,
+        "prompt_eval_duration": prefill_ns,
+        "eval_count": eval_tokens,
+        "eval_duration": max(total_ns - prefill_ns, 0),
+    }
+
+
+def add_config_args(parser: argparse.ArgumentParser):
+    """FakeOllamaConfig 옵션을 argparse에 추가한다 (load_test와 공용)."""
+    defaults = FakeOllamaConfig()
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="요청당 고정 지연 (ms)")
+    parser.add_argument("--token-rate", type=float, default=defaults.token_rate, help="출력 토큰/초 (0: 지연 없음)")
+    parser.add_argument("--prefill-rate", type=float, default=defaults.prefill_rate, help="프롬프트 토큰/초 (0: 지연 없음)")
+    parser.add_argument("--answer-tokens", type=int, default=defaults.answer_tokens, help="답변 출력 토큰 수")
+    parser.add_argument("--embed-dim", type=int, default=defaults.embed_dim, help="임베딩 차원")
+    parser.add_argument("--embed-latency-ms", type=float, default=defaults.embed_latency_ms, help="임베딩 요청당 지연 (ms)")
+    parser.add_argument("--grade", default=defaults.grade, choices=["PASS", "FAIL"], help="그레이더 LLM 판단")
+
+
+def config_from_args(args: argparse.Namespace) -> FakeOllamaConfig:
+    return FakeOllamaConfig(
+        latency_ms=args.latency_ms,
+        token_rate=args.token_rate,
+        prefill_rate=args.prefill_rate,
+        answer_tokens=args.answer_tokens,
+        embed_dim=args.embed_dim,
+        embed_latency_ms=args.embed_latency_ms,
+        grade=args.grade,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부하 테스트용 Fake Ollama 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    add_config_args(parser)
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(args.host, args.port, config_from_args(args))
+    print(f"Fake Ollama: {server.url} (종료: Ctrl+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""Load Test - Fake Ollama로 process_query 부하 테스트
+
+실제 Ollama 없이 파이프라인 전체(HTTP·JSON 직렬화·MCP 서브프로세스·ChromaDB)를
+돌려 단계별 지연 시간을 잰다. 순서는 다음과 같다.
+
+1. Fake Ollama 서버를 띄운다 (benchmarks/fake_ollama.py).
+2. 예제 문서(또는 --docs)를 임시 디렉터리에 인제스트한다 (python -m src.vectorstore.ingest).
+3. vector-search MCP 서버를 띄우고 main.process_query를 --concurrency개 스레드로 실행한다.
+4. 질의마다 trace(src/tracing.py)를 모아 단계별 p50/p95/p99와 초당 처리량을 출력한다.
+
+라우팅 모드, 추측 검색, 컨텍스트 예산, LLM 캐시 등 파이프라인 설정은 .env/환경 변수를
+그대로 따르므로 설정을 바꿔 가며 비교할 수 있다.
+
+사용법:
+    python -m benchmarks.load_test --queries 100 --concurrency 8 --latency-ms 150 --token-rate 40
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.fake_ollama import FakeOllamaServer, add_config_args, config_from_args
+from src.agent import AgentCore
+from src.config import Config
+from src.context_packer import ContextPacker
+from src.grader import Grader, GraderThresholds, QueryRewriter
+from src.hitl import HITLManager
+from src.llm_adapter import OllamaAdapter
+from src.llm_cache import create_llm_cache
+from src.main import StreamPrinter, _find_search_tool, _parse_mcp_results, process_query
+from src.mcp_client import MCPClient
+from src.planner import QueryPlanner, RoutePlanner
+from src.prompts.system import SYSTEM_PROMPT
+from src.router import FastRouter, Router
+from src.speculative import SpeculativeSearch
+from src.tracing import start_trace
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+SAMPLE_QUERIES = [
+    "연차 휴가 신청 방법 알려줘",
+    "출장비 정산 기한이 언제야?",
+    "재택근무 신청 조건",
+    "사내 보안 교육 이수 기준",
+    "경조사 휴가 일수",
+    "법인카드 사용 한도",
+    "신입사원 온보딩 절차",
+    "노트북 교체 주기",
+]
+
+_TOPICS = {
+    "leave": ("연차 휴가", "연차 휴가는 입사 1년 후 15일이 부여되며 HR 포털에서 신청한다"),
+    "travel": ("출장비 정산", "출장비는 출장 종료 후 7일 이내에 영수증과 함께 정산한다"),
+    "remote": ("재택근무", "재택근무는 주 2회까지 가능하며 팀장 승인이 필요하다"),
+    "security": ("보안 교육", "모든 임직원은 매년 상반기에 보안 교육을 이수해야 한다"),
+    "family": ("경조사 휴가", "본인 결혼 시 5일, 자녀 출산 시 10일의 경조사 휴가를 준다"),
+    "card": ("법인카드", "법인카드 사용 한도는 직급별로 월 100만원에서 300만원이다"),
+    "onboarding": ("온보딩", "신입사원은 첫 주에 계정 발급과 장비 수령, 멘토 배정을 거친다"),
+    "laptop": ("노트북 교체", "업무용 노트북은 4년 주기로 교체하며 IT 헬프데스크에 요청한다"),
+}
+
+
+def write_sample_documents(docs_dir: Path, sections: int = 6):
+    """주제별 예제 규정 문서를 만든다 (Parent-Child 청크가 여러 개 나오도록 길게)."""
+    docs_dir.mkdir(parents=True, exist_ok=True)
+    for name, (title, fact) in _TOPICS.items():
+        lines = [f"# {title} 규정", ""]
+        for i in range(1, sections + 1):
+            lines += [
+                f"## 제{i}조 {title} 세부 기준 {i}",
+                f"{fact}. 세부 기준 {i}에 따라 예외가 있을 수 있으며 소속 부서장과 협의한다. "
+                f"{title} 관련 문의는 담당 부서로 하고, 처리 결과는 사내 메일로 안내된다. "
+                "규정에 명시되지 않은 사항은 인사위원회 결정에 따른다.",
+                "",
+            ]
+        (docs_dir / f"{name}.md").write_text("\n".join(lines), encoding="utf-8")
+
+
+def ingest(workdir: Path, env: dict):
+    """workdir/data/documents를 workdir/data/chroma로 인제스트한다 (실제 인제스트 CLI 사용)."""
+    subprocess.run(
+        [sys.executable, "-m", "src.vectorstore.ingest"],
+        cwd=workdir, env=env, check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def write_mcp_config(workdir: Path, env: dict, workers: int = 1) -> Path:
+    """vector-search 서버만 등록한 MCP 설정 파일을 만든다."""
+    server = {
+        "command": sys.executable,
+        "args": [str(PROJECT_ROOT / "src" / "mcp_servers" / "vector_search_server.py")],
+        "env": env,
+    }
+    if workers > 1:
+        server["workers"] = workers
+    path = workdir / "mcp_config.json"
+    path.write_text(json.dumps({"mcpServers": {"vector-search": server}}, indent=2), encoding="utf-8")
+    return path
+
+
+def build_pipeline(config: Config, ollama_url: str, mcp: MCPClient) -> dict:
+    """main()과 같은 방식으로 파이프라인 컴포넌트를 만든다 (HITL은 끔, 로그 파일 미기록)."""
+    llm_cache = create_llm_cache() if config.llm_cache else None
+    llm = OllamaAdapter(model=config.llm_model, base_url=ollama_url, cache=llm_cache)
+
+    context_packer = None
+    if config.context_token_budget > 0:
+        context_packer = ContextPacker(config.context_token_budget, config.context_doc_max_tokens)
+
+    agent = AgentCore(
+        llm=llm, mcp=mcp,
+        system_prompt=SYSTEM_PROMPT,
+        max_tool_calls=config.max_tool_calls,
+        tool_concurrency=config.tool_concurrency,
+        tool_timeout=config.tool_call_timeout,
+        context_packer=context_packer,
+    )
+    fast_router = FastRouter(min_similarity=config.fast_router_min_similarity) if config.fast_router else None
+    router = Router(llm=llm, fast_router=fast_router, fast_threshold=config.fast_router_threshold)
+
+    speculative = None
+    search_tool = _find_search_tool(mcp, "INTERNAL_SEARCH")
+    if config.speculative_search and search_tool:
+        speculative = SpeculativeSearch(
+            lambda q: _parse_mcp_results(mcp.call_tool(search_tool, {"query": q, "top_k": 5})),
+            threshold=config.speculative_threshold,
+        )
+
+    return {
+        "agent": agent,
+        "router": router,
+        "planner": QueryPlanner(llm=llm),
+        "route_planner": RoutePlanner(llm=llm, router=router) if config.routing_mode == "fused" else None,
+        "grader": Grader(
+            llm=llm,
+            context_packer=context_packer,
+            thresholds=GraderThresholds.load() if config.grader_fast_path else None,
+        ),
+        "rewriter": QueryRewriter(llm=llm),
+        "hitl": HITLManager(mode="off"),
+        "speculative": speculative,
+    }
+
+
+def run_queries(
+    pipeline: dict, queries: list[str], concurrency: int, stream: bool = False,
+) -> tuple[list[dict], float]:
+    """queries를 concurrency개 스레드로 실행하고 (trace 기록 목록, 전체 소요 초)를 반환한다."""
+
+    def run_one(query: str) -> dict:
+        with start_trace(record=True, query=query) as trace:
+            process_query(
+                query=query,
+                conversation_history=[],
+                stream=StreamPrinter() if stream else None,  # 질의마다 따로 (동시 실행)
+                **pipeline,
+            )
+        return trace.to_record()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load") as pool:
+        records = list(pool.map(run_one, queries))
+    return records, time.perf_counter() - start
+
+
+@dataclass
+class StageStats:
+    stage: str
+    count: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    per_sec: float  # 전체 실행 시간 기준 초당 처리 횟수
+
+
+def summarize(records: list[dict], wall_sec: float) -> list[StageStats]:
+    """trace 기록을 단계(span 이름)별 지연 분포로 요약한다. 첫 줄은 질의 전체(query).
+
+    llm span은 호출한 단계별로 나눈다 (llm.router, llm.answer 등).
+    """
+    durations: dict[str, list[float]] = {"query": [r["total_ms"] for r in records]}
+    for record in records:
+        for span in record["spans"]:
+            name = span["name"]
+            if name == "llm":
+                name = f"llm.{span.get('stage') or span.get('parent') or '?'}"
+            durations.setdefault(name, []).append(span["duration_ms"])
+
+    stats = []
+    for stage, values in durations.items():
+        if not values:
+            continue
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        stats.append(StageStats(
+            stage=stage,
+            count=len(values),
+            p50_ms=round(float(p50), 2),
+            p95_ms=round(float(p95), 2),
+            p99_ms=round(float(p99), 2),
+            mean_ms=round(float(np.mean(values)), 2),
+            per_sec=round(len(values) / wall_sec, 2) if wall_sec > 0 else 0.0,
+        ))
+    return stats
+
+
+def format_report(stats: list[StageStats]) -> str:
+    header = f"{'stage':<40} {'count':>6} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'/s':>8}"
+    lines = [header, "-" * len(header)]
+    for s in stats:
+        lines.append(
+            f"{s.stage:<40} {s.count:>6} {s.p50_ms:>9.1f} {s.p95_ms:>9.1f} {s.p99_ms:>9.1f} {s.per_sec:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def run_load_test(args: argparse.Namespace) -> list[StageStats]:
+    server = FakeOllamaServer(config=config_from_args(args)).start()
+    tmp = tempfile.TemporaryDirectory(prefix="rag-load-") if not args.workdir else None
+    workdir = Path(args.workdir or tmp.name).resolve()
+    mcp = None
+    pipeline = {}
+    try:
+        env = {
+            "OLLAMA_URL": server.url,
+            "CHROMA_PERSIST_DIR": str(workdir / "data" / "chroma"),
+            "EMBED_CACHE_PATH": "",
+            "ANONYMIZED_TELEMETRY": "False",
+        }
+        docs_dir = workdir / "data" / "documents"
+        if args.docs:
+            docs_dir.mkdir(parents=True, exist_ok=True)
+            for path in Path(args.docs).glob("*"):
+                if path.suffix in (".md", ".txt"):
+                    (docs_dir / path.name).write_text(path.read_text(encoding="utf-8"), encoding="utf-8")
+        else:
+            write_sample_documents(docs_dir)
+        print(f"[부하 테스트] 인제스트: {docs_dir}")
+        ingest(workdir, {**os.environ, **env, "PYTHONPATH": str(PROJECT_ROOT)})
+
+        mcp = MCPClient(
+            config_path=str(write_mcp_config(workdir, env, workers=args.server_workers)),
+            call_timeout=Config().mcp_call_timeout,
+        )
+        mcp.connect_all()
+        pipeline = build_pipeline(Config(), server.url, mcp)
+
+        queries = [SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)] for i in range(args.queries)]
+        warmup = [SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)] for i in range(args.warmup)]
+        print(f"[부하 테스트] 질의 {len(queries)}건, 동시 실행 {args.concurrency} (워밍업 {len(warmup)}건)")
+
+        # 파이프라인 print 로그는 숨긴다 (--verbose로 표시)
+        quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with quiet:
+            if warmup:
+                run_queries(pipeline, warmup, 1, stream=args.stream)
+            records, wall = run_queries(pipeline, queries, args.concurrency, stream=args.stream)
+
+        stats = summarize(records, wall)
+        print(f"[부하 테스트] {len(records)}건 / {wall:.2f}s = {len(records) / wall:.2f} qps")
+        print(format_report(stats))
+        print(f"[Fake Ollama] 요청 수: {server.requests}")
+
+        if args.out:
+            Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump({
+                    "queries": len(records),
+                    "concurrency": args.concurrency,
+                    "wall_sec": round(wall, 3),
+                    "qps": round(len(records) / wall, 3),
+                    "fake_ollama": asdict(server.config),
+                    "stages": [asdict(s) for s in stats],
+                }, f, ensure_ascii=False, indent=2)
+            print(f"[부하 테스트] 결과 저장: {args.out}")
+        if args.traces:
+            with open(args.traces, "w", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return stats
+    finally:
+        if pipeline.get("speculative"):
+            pipeline["speculative"].close()
+        if mcp:
+            mcp.disconnect_all()
+        server.stop()
+        if tmp:
+            tmp.cleanup()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fake Ollama 기반 process_query 부하 테스트")
+    parser.add_argument("--queries", type=int, default=40, help="측정할 질의 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 실행할 질의 수")
+    parser.add_argument("--warmup", type=int, default=2, help="측정 전 워밍업 질의 수 (BM25 구축·모델 로딩 제외)")
+    parser.add_argument("--stream", action="store_true", help="답변을 스트리밍 경로로 생성")
+    parser.add_argument("--server-workers", type=int, default=1, help="vector-search 서버 프로세스 수")
+    parser.add_argument("--docs", help="인제스트할 문서 폴더 (기본: 예제 문서 생성)")
+    parser.add_argument("--workdir", help="Chroma/문서 작업 폴더 (기본: 임시 폴더, 종료 시 삭제)")
+    parser.add_argument("--out", help="단계별 통계 JSON 저장 경로")
+    parser.add_argument("--traces", help="질의별 trace JSONL 저장 경로")
+    parser.add_argument("--verbose", action="store_true", help="파이프라인 로그 출력")
+    add_config_args(parser)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    run_load_test(parse_args())
@@ -5,10 +5,18 @@
 2. 응답에 tool_calls가 있으면 MCP를 통해 도구 실행
 3. 실행 결과를 다시 Ollama에게 전송 (반복)
 4. text 응답이 나오면 최종 답변으로 반환
+
+한 응답에 tool_calls가 여러 개면 동시에 실행하되, 결과는 원래 순서대로 추가한다.
 """
 
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from src.context_packer import ContextPacker
 from src.llm_adapter import OllamaAdapter, LLMResponse
 from src.mcp_client import MCPClient
+from src.tracing import propagate
 
 
 class AgentCore:
@@ -18,11 +26,17 @@ class AgentCore:
         mcp: MCPClient,
         system_prompt: str,
         max_tool_calls: int = 5,
+        tool_concurrency: int = 4,
+        tool_timeout: float | None = 60.0,
+        context_packer: ContextPacker | None = None,
     ):
         self.llm = llm
         self.mcp = mcp
         self.system_prompt = system_prompt
         self.max_tool_calls = max_tool_calls
+        self.tool_concurrency = tool_concurrency  # 한 턴에서 동시에 실행할 도구 호출 수
+        self.tool_timeout = tool_timeout  # 도구 호출 1건당 대기 시간(초)
+        self.context_packer = context_packer  # 있으면 문서를 토큰 예산에 맞춰 축약
 
     def run(self, messages: list, tool_filter: str | None = None) -> tuple[str, list[dict]]:
         """에이전트 루프를 실행하여 최종 답변과 수집된 문서를 반환한다.
@@ -57,9 +71,9 @@ class AgentCore:
                 ]
             full_messages.append(assistant_msg)
 
-            # 도구 실행 및 결과 수집
-            for tc in response.tool_calls:
-                result = self.mcp.call_tool(tc.name, tc.arguments)
+            # 도구 실행 (동시) 및 결과 수집 (원래 순서대로)
+            results = self._execute_tool_calls(response.tool_calls)
+            for tc, result in zip(response.tool_calls, results):
                 full_messages.append({
                     "role": "tool",
                     "tool_call_id": tc.id,
@@ -70,14 +84,41 @@ class AgentCore:
 
         return "답변 생성에 실패했습니다. 다시 시도해 주세요.", collected_documents
 
+    def _execute_tool_calls(self, tool_calls: list) -> list[str]:
+        """한 턴의 도구 호출을 동시에 실행하고 tool_calls 순서대로 결과를 반환한다."""
+        workers = min(max(self.tool_concurrency, 1), len(tool_calls))
+        if workers <= 1:
+            return [self._call_tool(tc) for tc in tool_calls]
+
+        print(f"  [Agent] 도구 {len(tool_calls)}개 동시 실행 (최대 {workers}개)")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tool-call") as pool:
+            return list(pool.map(propagate(self._call_tool), tool_calls))
+
+    def _call_tool(self, tc) -> str:
+        try:
+            return self.mcp.call_tool(tc.name, tc.arguments, timeout=self.tool_timeout)
+        except Exception as e:
+            # 한 도구의 실패가 같은 턴의 다른 결과를 막지 않도록 에러 결과로 전달
+            print(f"  [Agent] 도구 실행 실패 ({tc.name}): {e}")
+            return json.dumps({"error": str(e)}, ensure_ascii=False)
+
     def answer_with_context(
-        self, query: str, documents: list[dict], conversation_history: list,
+        self,
+        query: str,
+        documents: list[dict],
+        conversation_history: list,
+        on_token: Callable[[str], None] | None = None,
     ) -> str:
         """사전 검색된 문서를 바탕으로 답변을 생성한다 (도구 호출 없이).
 
         Planner가 최적화한 쿼리로 직접 검색한 결과를 LLM에게 전달하여
-        답변 생성에만 집중하도록 한다.
+        답변 생성에만 집중하도록 한다. on_token이 주어지면 답변을 스트리밍한다.
         """
+        if self.context_packer:
+            packed = self.context_packer.pack(documents)
+            print(f"  [컨텍스트] {packed.summary()}")
+            documents = packed.documents
+
         context_parts = []
         for i, doc in enumerate(documents):
             content = doc.get("content", "")
@@ -98,16 +139,21 @@ class AgentCore:
             ),
         })
 
-        response = self.llm.chat(messages)
+        response = self.llm.chat(messages, on_token=on_token)
         return response.content
 
-    def direct_answer(self, query: str, conversation_history: list) -> str:
+    def direct_answer(
+        self,
+        query: str,
+        conversation_history: list,
+        on_token: Callable[[str], None] | None = None,
+    ) -> str:
         """도구 없이 LLM 직접 답변 (CHITCHAT용)."""
         messages = [{"role": "system", "content": self.system_prompt}]
         messages.extend(conversation_history)
         messages.append({"role": "user", "content": query})
 
-        response = self.llm.chat(messages)
+        response = self.llm.chat(messages, on_token=on_token)
         return response.content
 
     def _get_filtered_tools(self, tool_filter: str | None) -> list[dict]:
@@ -120,7 +166,6 @@ class AgentCore:
     def _collect_documents(self, result_json: str, documents: list[dict]):
         """도구 실행 결과에서 문서를 추출한다."""
         try:
-            import json
             result = json.loads(result_json)
             # MCP 서버의 content 배열에서 text 추출
             if isinstance(result, dict) and "content" in result:
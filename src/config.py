@@ -13,11 +13,27 @@ class Config:
         self.ollama_url: str = os.getenv("OLLAMA_URL", "http://localhost:11434")
         self.llm_model: str = os.getenv("LLM_MODEL", "qwen3:14b")
         self.mcp_config_path: str = os.getenv("MCP_CONFIG_PATH", "mcp_config.json")
+        self.mcp_call_timeout: float = float(os.getenv("MCP_CALL_TIMEOUT", "120"))
         self.chroma_persist_dir: str = os.getenv("CHROMA_PERSIST_DIR", "./data/chroma")
         self.embedding_model: str = os.getenv("EMBEDDING_MODEL", "bona/bge-m3-korean:latest")
         self.hitl_mode: str = os.getenv("HITL_MODE", "auto")
         self.max_tool_calls: int = int(os.getenv("MAX_TOOL_CALLS", "5"))
+        self.context_token_budget: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+        self.context_doc_max_tokens: int = int(os.getenv("CONTEXT_DOC_MAX_TOKENS", "500"))
+        self.grader_fast_path: bool = os.getenv("GRADER_FAST_PATH", "true").lower() in ("1", "true", "yes")
+        self.tool_concurrency: int = int(os.getenv("TOOL_CONCURRENCY", "4"))
+        self.tool_call_timeout: float = float(os.getenv("TOOL_CALL_TIMEOUT", "60"))
+        self.llm_cache: bool = os.getenv("LLM_CACHE", "false").lower() in ("1", "true", "yes")
+        self.trace: bool = os.getenv("TRACE", "false").lower() in ("1", "true", "yes")
+        self.stream_output: bool = os.getenv("STREAM_OUTPUT", "true").lower() in ("1", "true", "yes")
         self.max_history_turns: int = int(os.getenv("MAX_HISTORY_TURNS", "10"))
+        self.fast_router: bool = os.getenv("FAST_ROUTER", "false").lower() in ("1", "true", "yes")
+        self.fast_router_threshold: float = float(os.getenv("FAST_ROUTER_THRESHOLD", "0.35"))
+        self.fast_router_min_similarity: float = float(os.getenv("FAST_ROUTER_MIN_SIMILARITY", "0.5"))
+        self.router_examples_path: str = os.getenv("ROUTER_EXAMPLES_PATH", "")
+        self.routing_mode: str = os.getenv("ROUTING_MODE", "separate")  # "separate" | "fused"
+        self.speculative_search: bool = os.getenv("SPECULATIVE_SEARCH", "false").lower() in ("1", "true", "yes")
+        self.speculative_threshold: float = float(os.getenv("SPECULATIVE_THRESHOLD", "0.5"))
 
     @property
     def project_root(self) -> Path:
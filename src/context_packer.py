@@ -0,0 +1,119 @@
+"""Context Packer - 토큰 예산에 맞춘 검색 문서 컨텍스트 구성
+
+answer_with_context와 Grader가 검색된 Parent 전문을 그대로 프롬프트에 넣으면
+문서 수만큼 프롬프트 처리 시간이 늘어난다. 문서를 관련도 순으로 예산(토큰)만큼만
+채우고, 긴 Parent는 매칭된 Child 주변만 남긴다.
+"""
+
+import math
+import os
+import re
+from dataclasses import dataclass, field
+
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+CONTEXT_DOC_MAX_TOKENS = int(os.getenv("CONTEXT_DOC_MAX_TOKENS", "500"))
+MIN_PARTIAL_TOKENS = 64  # 남은 예산이 이보다 작으면 문서를 잘라 넣지 않고 제외
+
+_CJK_RE = re.compile(r"[ㄱ-ㆎ가-힣぀-ヿ一-鿿]")
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_SYMBOL_RE = re.compile(r"[^\sA-Za-z0-9ㄱ-ㆎ가-힣぀-ヿ一-鿿]")
+
+
+def estimate_tokens(text: str) -> int:
+    """한국어/영어 혼합 텍스트의 토큰 수를 추정한다.
+
+    한글·한자는 글자당 1토큰, 영문·숫자는 4글자당 1토큰(단어당 최소 1),
+    기호는 1개당 1토큰으로 센다. 토크나이저 없이 쓰는 보수적 근사치이다.
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK_RE.findall(text))
+    words = sum(math.ceil(len(w) / 4) for w in _WORD_RE.findall(text))
+    symbols = len(_SYMBOL_RE.findall(text))
+    return cjk + words + symbols
+
+
+def trim_around(text: str, focus: str, max_tokens: int) -> str:
+    """text에서 focus(매칭된 Child) 주변을 max_tokens 이내로 잘라낸다.
+
+    focus를 찾지 못하면 앞부분을 남긴다. 잘린 쪽에는 "…"를 붙인다.
+    """
+    total = estimate_tokens(text)
+    if total <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    pos = text.find(focus) if focus else -1
+    center = pos + len(focus) // 2 if pos >= 0 else 0
+
+    chars = max(int(len(text) * max_tokens / total), 1)
+    while True:
+        start = max(0, min(center - chars // 2, len(text) - chars))
+        end = min(len(text), start + chars)
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if end < len(text) else ""
+        piece = f"{prefix}{text[start:end].strip()}{suffix}"
+        if estimate_tokens(piece) <= max_tokens or chars <= 1:
+            return piece
+        chars = int(chars * 0.9)
+
+
+@dataclass
+class PackedContext:
+    documents: list[dict] = field(default_factory=list)  # 예산 안에 들어간 문서 (content 조정됨)
+    used_tokens: int = 0
+    dropped_tokens: int = 0  # 원문 대비 잘라내거나 제외한 토큰 수
+    dropped_docs: int = 0  # 통째로 제외된 문서 수
+    trimmed_docs: int = 0  # 일부만 남긴 문서 수
+
+    def summary(self) -> str:
+        return (
+            f"문서 {len(self.documents)}건, {self.used_tokens} 토큰 "
+            f"(잘라냄 {self.trimmed_docs}건, 제외 {self.dropped_docs}건, 버린 토큰 {self.dropped_tokens})"
+        )
+
+
+class ContextPacker:
+    """검색 문서를 토큰 예산에 맞게 관련도 순으로 채운다.
+
+    문서에 rrf_score가 있으면 높은 순으로, 없으면 주어진 순서를 관련도 순으로 본다.
+    child_content가 있으면 긴 Parent를 그 주변으로 줄인다.
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int = CONTEXT_TOKEN_BUDGET,
+        max_doc_tokens: int = CONTEXT_DOC_MAX_TOKENS,
+    ):
+        self.budget_tokens = budget_tokens
+        self.max_doc_tokens = max_doc_tokens
+
+    def pack(self, documents: list[dict]) -> PackedContext:
+        ordered = list(documents)
+        if ordered and all("rrf_score" in d for d in ordered):
+            ordered.sort(key=lambda d: d["rrf_score"], reverse=True)
+
+        packed = PackedContext()
+        remaining = self.budget_tokens
+        for doc in ordered:
+            content = doc.get("content", "")
+            focus = doc.get("child_content", "")
+            original = estimate_tokens(content)
+
+            if original > remaining and remaining < MIN_PARTIAL_TOKENS:
+                packed.dropped_docs += 1
+                packed.dropped_tokens += original
+                continue
+
+            limit = min(self.max_doc_tokens, remaining) if self.max_doc_tokens > 0 else remaining
+            text = trim_around(content, focus, limit)
+            used = estimate_tokens(text)
+            if text != content:
+                packed.trimmed_docs += 1
+            packed.documents.append({**doc, "content": text})
+            packed.used_tokens += used
+            packed.dropped_tokens += original - used
+            remaining -= used
+
+        return packed
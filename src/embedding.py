@@ -5,16 +5,24 @@ SentenceTransformer와 동일한 인터페이스(encode)를 제공하여 기존
 """
 
 import os
-import urllib3
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import requests
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from src.http_session import default_timeout, get_shared_session
 
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
 DEFAULT_MODEL = os.getenv("EMBEDDING_MODEL", "bona/bge-m3-korean:latest")
 
+# 대량 임베딩(인제스트) 배치 설정
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "2"))
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "3"))
+
 
 class OllamaEmbedder:
     """Ollama /api/embed를 사용하는 임베딩 클래스.
@@ -22,9 +30,18 @@ class OllamaEmbedder:
     SentenceTransformer.encode()와 동일한 시그니처를 지원한다.
     """
 
-    def __init__(self, model: str = DEFAULT_MODEL, base_url: str = OLLAMA_URL):
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        base_url: str = OLLAMA_URL,
+        session: requests.Session | None = None,
+        timeout: tuple[float, float] | float | None = None,
+    ):
         self.model = model
         self.base_url = base_url.rstrip("/")
+        # 기본은 프로세스 공유 keep-alive 풀 (OllamaAdapter와 같은 연결 재사용)
+        self.session = session or get_shared_session()
+        self.timeout = timeout or default_timeout()
 
     def encode(self, texts, **kwargs) -> np.ndarray:
         """텍스트(문자열 또는 리스트)를 임베딩 벡터로 변환한다.
@@ -39,11 +56,10 @@ class OllamaEmbedder:
         if single:
             texts = [texts]
 
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/api/embed",
             json={"model": self.model, "input": texts},
-            timeout=120,
-            verify=False,
+            timeout=self.timeout,
         )
         response.raise_for_status()
         data = response.json()
@@ -53,3 +69,83 @@ class OllamaEmbedder:
         if single:
             return embeddings[0]
         return embeddings
+
+
+def iter_embedded(
+    embedder,
+    batches,
+    max_workers: int = EMBED_CONCURRENCY,
+    max_retries: int = EMBED_MAX_RETRIES,
+    retry_delay: float = 1.0,
+):
+    """(payload, texts) 배치 스트림을 병렬 임베딩하여 입력 순서대로 yield한다.
+
+    batches는 제너레이터여도 되며 필요할 때만 다음 배치를 꺼낸다. 동시에 요청
+    중인 배치는 최대 max_workers개이고, 결과는 소비되는 즉시 버려지므로 메모리에
+    전체 임베딩을 쌓지 않는다. 실패한 배치는 지수 백오프로 max_retries번까지
+    해당 배치만 재시도한다.
+
+    Args:
+        embedder: encode(list[str]) -> (N, dim) 배열을 제공하는 객체
+        batches: (payload, texts) 튜플의 iterable. payload는 그대로 돌려준다.
+    Yields:
+        (payload, embeddings): (len(texts), dim) float32 배열
+    """
+
+    def encode_batch(texts: list[str]) -> np.ndarray:
+        for attempt in range(max_retries + 1):
+            try:
+                embeddings = np.asarray(embedder.encode(texts), dtype=np.float32)
+                if len(embeddings) != len(texts):
+                    raise ValueError(f"임베딩 수 불일치: {len(embeddings)} != {len(texts)}")
+                return embeddings
+            except Exception as e:
+                if attempt == max_retries:
+                    raise
+                print(
+                    f"  [Embedding] 배치({len(texts)}건) 실패, "
+                    f"재시도 {attempt + 1}/{max_retries}: {e}",
+                    file=sys.stderr,
+                )
+                time.sleep(retry_delay * 2 ** attempt)
+
+    max_workers = max(1, max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = deque()
+        try:
+            for payload, texts in batches:
+                pending.append((payload, pool.submit(encode_batch, texts)))
+                if len(pending) >= max_workers:
+                    done_payload, future = pending.popleft()
+                    yield done_payload, future.result()
+            while pending:
+                done_payload, future = pending.popleft()
+                yield done_payload, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def iter_embeddings(
+    embedder,
+    texts: list[str],
+    batch_size: int = EMBED_BATCH_SIZE,
+    max_workers: int = EMBED_CONCURRENCY,
+    max_retries: int = EMBED_MAX_RETRIES,
+    retry_delay: float = 1.0,
+):
+    """텍스트를 고정 크기 배치로 나눠 병렬 임베딩하고, 입력 순서대로 yield한다.
+
+    Yields:
+        (start, embeddings): 배치 시작 인덱스와 (배치 크기, dim) float32 배열
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size는 1 이상이어야 합니다.")
+    batches = (
+        (start, texts[start:start + batch_size])
+        for start in range(0, len(texts), batch_size)
+    )
+    yield from iter_embedded(
+        embedder, batches,
+        max_workers=max_workers, max_retries=max_retries, retry_delay=retry_delay,
+    )
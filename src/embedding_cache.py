@@ -0,0 +1,187 @@
+"""Embedding Cache - 디스크 기반 임베딩 캐시
+
+(모델명, 텍스트 해시)를 키로 float32 벡터를 SQLite 파일에 저장한다.
+인제스트와 vector-search MCP 서버가 같은 파일을 공유할 수 있으며,
+용량이 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 지운다.
+
+용량은 열 때 한 번 계산한 뒤 저장할 때마다 누적해 추정하고, 추정치가
+max_bytes를 넘을 때만 전체 합계를 다시 센다. 적중 시 사용 시각 갱신은
+모아 두었다가 저장·정리 시점이나 일정 개수마다 한 번에 기록한다.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "")
+EMBED_CACHE_MAX_MB = int(os.getenv("EMBED_CACHE_MAX_MB", "512"))
+TOUCH_FLUSH_SIZE = 256  # 모아 둔 사용 시각 갱신을 한 번에 기록할 개수
+
+
+def cache_key(model: str, text: str) -> str:
+    """모델명과 텍스트로 캐시 키(SHA-256)를 만든다."""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite에 임베딩 벡터를 float32 바이트로 저장하는 LRU 캐시.
+
+    여러 스레드에서 같은 인스턴스를 사용할 수 있고, WAL 모드라
+    여러 프로세스가 같은 파일을 동시에 열어도 된다.
+    """
+
+    def __init__(self, path: str, max_bytes: int = EMBED_CACHE_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched: dict[str, float] = {}  # 아직 기록하지 않은 사용 시각
+
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " vector BLOB NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)"
+        )
+        self._conn.commit()
+        # 용량 추정치 (다른 프로세스의 저장은 max_bytes를 넘겨 다시 셀 때 반영)
+        self._bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()[0]
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """존재하는 키의 벡터를 반환하고 사용 시각을 갱신한다 (기록은 모아서)."""
+        if not keys:
+            return {}
+        found = {}
+        now = time.time()
+        with self._lock:
+            # SQLite 변수 개수 제한을 피하기 위해 나눠서 조회
+            for i in range(0, len(keys), 500):
+                part = keys[i:i + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", part,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+            for key in found:
+                self._touched[key] = now
+            if len(self._touched) >= TOUCH_FLUSH_SIZE:
+                self._flush_touched()
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, items: dict[str, np.ndarray]):
+        """벡터를 저장하고, 용량을 넘으면 오래된 항목을 정리한다."""
+        if not items:
+            return
+        now = time.time()
+        rows = [
+            (key, np.asarray(vec, dtype=np.float32).tobytes(), now)
+            for key, vec in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)", rows,
+            )
+            self._bytes += sum(len(blob) for _, blob, _ in rows)
+            self._flush_touched()
+            if self._bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _flush_touched(self):
+        """모아 둔 사용 시각을 기록한다 (lock 보유 상태에서 호출, commit은 호출자가)."""
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE embeddings SET last_used = ? WHERE key = ?",
+            [(used, key) for key, used in self._touched.items()],
+        )
+        self._touched.clear()
+
+    def _evict(self):
+        """실제 용량이 max_bytes를 넘으면 최근 사용 순으로 90%까지 줄인다 (lock 보유 상태에서 호출)."""
+        total, count = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0), COUNT(*) FROM embeddings"
+        ).fetchone()
+        self._bytes = total
+        if total <= self.max_bytes or count == 0:
+            return
+        avg = total / count
+        n_delete = int((total - self.max_bytes * 0.9) / avg) + 1
+        deleted = self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            " SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+            (n_delete,),
+        ).rowcount
+        self._bytes = max(total - int(deleted * avg), 0)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+            self._conn.close()
+
+
+class CachedEmbedder:
+    """encode() 결과를 EmbeddingCache에 메모이즈하는 임베더 래퍼.
+
+    OllamaEmbedder와 같은 encode() 시그니처를 제공하며, 캐시에 없는
+    텍스트만 (중복 제거 후) 내부 임베더에 한 번에 요청한다.
+    """
+
+    def __init__(self, embedder, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+        self.model = embedder.model
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        keys = [cache_key(self.model, t) for t in texts]
+        cached = self.cache.get_many(keys)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        if missing:
+            vectors = np.asarray(self.embedder.encode(list(missing.values())), dtype=np.float32)
+            fresh = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(fresh)
+            cached.update(fresh)
+
+        embeddings = np.stack([cached[key] for key in keys]).astype(np.float32, copy=False)
+        if single:
+            return embeddings[0]
+        return embeddings
+
+
+def with_cache(embedder, cache_path: str | None = EMBED_CACHE_PATH, max_mb: int = EMBED_CACHE_MAX_MB):
+    """cache_path가 설정되어 있으면 임베더를 디스크 캐시로 감싼다."""
+    if not cache_path:
+        return embedder
+    return CachedEmbedder(embedder, EmbeddingCache(cache_path, max_bytes=max_mb * 1024 * 1024))
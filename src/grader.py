@@ -2,22 +2,159 @@
 
 Phase 3의 핵심 컴포넌트로, 검색 결과를 이진(PASS/FAIL) 판단하고,
 FAIL 시 쿼리를 재작성한다.
+
+thresholds가 주어지면 검색 신호(최소 벡터 거리, RRF 1·2위 차, Planner 핵심어
+포함 비율)로 판단이 분명한 경우는 LLM 없이 결정하고, 애매한 경우만 LLM에 묻는다.
+임계값은 grader_calibration으로 판단 로그와 피드백에서 맞추며, 보정된 파일이
+없으면 빠른 판단을 쓰지 않는다.
 """
 
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from src.context_packer import ContextPacker
 from src.llm_adapter import OllamaAdapter
 from src.prompts.grader import GRADER_PROMPT
 from src.prompts.rewriter import REWRITER_PROMPT
 
+GRADER_THRESHOLDS_PATH = os.getenv("GRADER_THRESHOLDS_PATH", "./data/grader_thresholds.json")
+GRADER_LOG_PATH = os.getenv("GRADER_LOG_PATH", "")  # 비어 있으면 판단 로그를 남기지 않음
+
+
+@dataclass
+class RetrievalSignals:
+    best_distance: float | None = None  # 가장 가까운 문서의 벡터 거리 (cosine, 없으면 None)
+    rrf_margin: float = 0.0  # 1위와 2위 문서의 RRF 점수 차
+    keyword_overlap: float = 0.0  # Planner 핵심어 중 상위 문서에 나타나는 비율
+
+    @classmethod
+    def from_documents(
+        cls, query: str, documents: list[dict], keywords: list[str] | None = None, top_n: int = 3,
+    ) -> "RetrievalSignals":
+        distances = [d["distance"] for d in documents if isinstance(d.get("distance"), (int, float))]
+        scores = sorted(
+            (d["rrf_score"] for d in documents if isinstance(d.get("rrf_score"), (int, float))),
+            reverse=True,
+        )
+        if len(scores) >= 2:
+            margin = scores[0] - scores[1]
+        else:
+            margin = scores[0] if scores else 0.0
+
+        # 핵심어가 없으면 질문의 두 글자 이상 어절을 사용
+        terms = [k.lower() for k in (keywords or []) if k.strip()]
+        if not terms:
+            terms = [w.lower() for w in query.split() if len(w) >= 2]
+        text = " ".join(d.get("content", "") for d in documents[:top_n]).lower()
+        overlap = sum(1 for t in terms if t in text) / len(terms) if terms else 0.0
+
+        return cls(
+            best_distance=min(distances) if distances else None,
+            rrf_margin=margin,
+            keyword_overlap=overlap,
+        )
+
+
+@dataclass
+class GraderThresholds:
+    """검색 신호만으로 PASS/FAIL을 정하는 기준. 둘 다 아니면 LLM에 묻는다."""
+
+    pass_max_distance: float = 0.35
+    pass_min_overlap: float = 0.5
+    pass_min_rrf_margin: float = 0.0
+    fail_min_distance: float = 0.7
+    fail_max_overlap: float = 0.0
+
+    def decide(self, signals: RetrievalSignals) -> str | None:
+        if signals.best_distance is None:
+            return None  # 웹 검색 등 거리 정보가 없는 결과
+        if (
+            signals.best_distance <= self.pass_max_distance
+            and signals.keyword_overlap >= self.pass_min_overlap
+            and signals.rrf_margin >= self.pass_min_rrf_margin
+        ):
+            return "PASS"
+        if (
+            signals.best_distance >= self.fail_min_distance
+            and signals.keyword_overlap <= self.fail_max_overlap
+        ):
+            return "FAIL"
+        return None
+
+    def save(self, path: str = GRADER_THRESHOLDS_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(asdict(self), indent=2), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str = GRADER_THRESHOLDS_PATH) -> "GraderThresholds | None":
+        """보정된 임계값 파일을 읽는다. 없으면 None (보정 전에는 빠른 판단을 쓰지 않음)."""
+        if not Path(path).exists():
+            return None
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
 
 class Grader:
-    def __init__(self, llm: OllamaAdapter):
+    def __init__(
+        self,
+        llm: OllamaAdapter,
+        context_packer: ContextPacker | None = None,
+        thresholds: GraderThresholds | None = None,
+        decision_log: str | None = None,
+    ):
         self.llm = llm
+        self.context_packer = context_packer  # 있으면 문서를 토큰 예산에 맞춰 축약
+        self.thresholds = thresholds  # 있으면 검색 신호로 먼저 판단
+        self.decision_log = decision_log  # 판단 로그 (보정용 JSONL)
+        self.fast_decisions = 0  # 검색 신호로 끝난 횟수
+        self.llm_calls = 0  # LLM까지 간 횟수
 
-    def evaluate(self, query: str, documents: list[dict]) -> str:
+    def evaluate(self, query: str, documents: list[dict], keywords: list[str] | None = None) -> str:
         """검색 결과의 관련성을 PASS/FAIL로 평가한다."""
         if not documents:
             return "FAIL"
 
+        signals = RetrievalSignals.from_documents(query, documents, keywords)
+        if self.thresholds:
+            decision = self.thresholds.decide(signals)
+            if decision:
+                self.fast_decisions += 1
+                print(
+                    f"  [평가] 검색 신호로 {decision} (거리 {signals.best_distance:.3f}, "
+                    f"핵심어 {signals.keyword_overlap:.0%}, RRF 차 {signals.rrf_margin:.4f})"
+                )
+                self._log(query, signals, decision, "fast")
+                return decision
+
+        self.llm_calls += 1
+        decision = self._llm_evaluate(query, documents)
+        self._log(query, signals, decision, "llm")
+        return decision
+
+    def _log(self, query: str, signals: RetrievalSignals, decision: str, source: str):
+        if not self.decision_log:
+            return
+        path = Path(self.decision_log)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "query": query,
+            "signals": asdict(signals),
+            "decision": decision,
+            "source": source,
+            "timestamp": datetime.now().isoformat(),
+        }
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _llm_evaluate(self, query: str, documents: list[dict]) -> str:
+        if self.context_packer:
+            packed = self.context_packer.pack(documents)
+            print(f"  [평가 컨텍스트] {packed.summary()}")
+            documents = packed.documents
+
         docs_text = "\n\n---\n\n".join(
             f"[문서 {i + 1}]\n{doc.get('content', '')}"
             for i, doc in enumerate(documents)
@@ -33,7 +170,8 @@ class Grader:
                         f"## 검색된 문서\n{docs_text}"
                     ),
                 },
-            ]
+            ],
+            cache_stage="grader",
         )
 
         result = response.content.strip().upper()
@@ -54,7 +192,8 @@ class QueryRewriter:
             messages=[
                 {"role": "system", "content": REWRITER_PROMPT},
                 {"role": "user", "content": f"원본 질문: {original_query}"},
-            ]
+            ],
+            cache_stage="rewriter",
         )
 
         rewritten = response.content.strip()
@@ -0,0 +1,163 @@
+"""Grader 임계값 보정
+
+Grader 판단 로그(GRADER_LOG_PATH, 기본 data/grader_log.jsonl)와 사용자 피드백(data/feedback.jsonl)으로
+검색 신호 기반 PASS/FAIL 임계값을 맞춘다.
+
+정답 라벨은 피드백이 있으면 피드백(up → PASS, down → FAIL), 없으면 LLM 판단을 쓴다.
+검색 신호로 결정한 로그는 피드백이 있을 때만 사용한다 (자기 판단으로 학습하지 않도록).
+목표 정밀도를 만족하는 조합 중 LLM 없이 결정하는 비율이 가장 큰 임계값을 고른다.
+
+사용법:
+    python -m src.grader_calibration
+"""
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+
+from src.grader import GRADER_LOG_PATH, GRADER_THRESHOLDS_PATH, GraderThresholds, RetrievalSignals
+
+LOG_PATH = GRADER_LOG_PATH or "./data/grader_log.jsonl"
+FEEDBACK_PATH = "./data/feedback.jsonl"
+TARGET_PRECISION = 0.95
+MIN_SUPPORT = 5  # 임계값 하나를 믿으려면 필요한 최소 표본 수
+MAX_CANDIDATES = 20  # 신호별 후보 임계값 수 (분위수)
+
+NEVER_PASS_DISTANCE = -1.0  # 빠른 PASS 비활성화
+NEVER_FAIL_DISTANCE = 3.0  # 빠른 FAIL 비활성화 (cosine 거리는 최대 2)
+
+
+def _read_jsonl(path: str) -> list[dict]:
+    if not Path(path).exists():
+        return []
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+    return entries
+
+
+def load_samples(
+    log_path: str = LOG_PATH, feedback_path: str = FEEDBACK_PATH,
+) -> list[tuple[RetrievalSignals, str]]:
+    """(검색 신호, 라벨) 표본을 만든다."""
+    ratings = {f["query"]: f["rating"] for f in _read_jsonl(feedback_path)}
+
+    samples = []
+    for entry in _read_jsonl(log_path):
+        signals = RetrievalSignals(**entry.get("signals", {}))
+        if signals.best_distance is None:
+            continue
+        rating = ratings.get(entry.get("query"))
+        if rating == "up":
+            label = "PASS"
+        elif rating == "down":
+            label = "FAIL"
+        elif entry.get("source") == "llm":
+            label = entry.get("decision")
+        else:
+            continue
+        if label in ("PASS", "FAIL"):
+            samples.append((signals, label))
+    return samples
+
+
+def _candidates(values: np.ndarray) -> np.ndarray:
+    unique = np.unique(values)
+    if len(unique) <= MAX_CANDIDATES:
+        return unique
+    return np.unique(np.quantile(values, np.linspace(0, 1, MAX_CANDIDATES)))
+
+
+def fit_thresholds(
+    samples: list[tuple[RetrievalSignals, str]],
+    precision: float = TARGET_PRECISION,
+    min_support: int = MIN_SUPPORT,
+) -> tuple[GraderThresholds, dict]:
+    """표본에 맞는 임계값과 보정 결과 요약을 반환한다."""
+    dist = np.array([s.best_distance for s, _ in samples], dtype=float)
+    overlap = np.array([s.keyword_overlap for s, _ in samples], dtype=float)
+    margin = np.array([s.rrf_margin for s, _ in samples], dtype=float)
+    is_pass = np.array([label == "PASS" for _, label in samples], dtype=bool)
+
+    thresholds = GraderThresholds(
+        pass_max_distance=NEVER_PASS_DISTANCE,
+        fail_min_distance=NEVER_FAIL_DISTANCE,
+    )
+    report = {"samples": len(samples), "pass_covered": 0, "fail_covered": 0,
+              "pass_precision": None, "fail_precision": None}
+    if not samples:
+        return thresholds, report
+
+    # PASS: 거리 ≤ d, 핵심어 ≥ o, RRF 차 ≥ m
+    best = 0
+    for d in _candidates(dist):
+        for o in _candidates(overlap):
+            base = (dist <= d) & (overlap >= o)
+            for m in _candidates(margin):
+                mask = base & (margin >= m)
+                n = int(mask.sum())
+                if n < min_support or n <= best:
+                    continue
+                p = is_pass[mask].mean()
+                if p >= precision:
+                    best = n
+                    thresholds.pass_max_distance = float(d)
+                    thresholds.pass_min_overlap = float(o)
+                    thresholds.pass_min_rrf_margin = float(m)
+                    report["pass_covered"], report["pass_precision"] = n, float(p)
+
+    # FAIL: 거리 ≥ d, 핵심어 ≤ o
+    best = 0
+    for d in _candidates(dist):
+        for o in _candidates(overlap):
+            mask = (dist >= d) & (overlap <= o)
+            n = int(mask.sum())
+            if n < min_support or n <= best:
+                continue
+            p = (~is_pass[mask]).mean()
+            if p >= precision:
+                best = n
+                thresholds.fail_min_distance = float(d)
+                thresholds.fail_max_overlap = float(o)
+                report["fail_covered"], report["fail_precision"] = n, float(p)
+
+    return thresholds, report
+
+
+def calibrate(
+    log_path: str = LOG_PATH,
+    feedback_path: str = FEEDBACK_PATH,
+    out_path: str = GRADER_THRESHOLDS_PATH,
+    precision: float = TARGET_PRECISION,
+) -> GraderThresholds | None:
+    samples = load_samples(log_path, feedback_path)
+    if not samples:
+        print(f"보정할 표본이 없습니다. ({log_path}, {feedback_path})")
+        return None
+
+    thresholds, report = fit_thresholds(samples, precision=precision)
+    thresholds.save(out_path)
+
+    n = report["samples"]
+    print(f"표본 {n}건 (PASS {sum(1 for _, l in samples if l == 'PASS')}건)")
+    for side in ("pass", "fail"):
+        covered = report[f"{side}_covered"]
+        if covered:
+            print(
+                f"  빠른 {side.upper()}: {covered}건 ({covered / n:.0%}), "
+                f"정밀도 {report[f'{side}_precision']:.0%}"
+            )
+        else:
+            print(f"  빠른 {side.upper()}: 목표 정밀도({precision:.0%})를 만족하는 임계값 없음 → 비활성화")
+    print(f"임계값 저장: {out_path}")
+    print(json.dumps(asdict(thresholds), indent=2))
+    return thresholds
+
+
+if __name__ == "__main__":
+    calibrate()
@@ -0,0 +1,64 @@
+"""HTTP Session - Ollama 호출용 커넥션 풀 세션
+
+OllamaAdapter와 OllamaEmbedder가 요청마다 새 TCP 연결을 맺지 않도록
+keep-alive 커넥션 풀을 가진 requests.Session을 제공한다.
+기본적으로 프로세스 안의 모든 어댑터가 하나의 풀을 공유한다.
+"""
+
+import os
+import threading
+import urllib3
+
+import requests
+from requests.adapters import HTTPAdapter
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+HTTP_KEEP_ALIVE = os.getenv("HTTP_KEEP_ALIVE", "true").lower() in ("1", "true", "yes")
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "120"))
+
+_shared_session: requests.Session | None = None
+_shared_lock = threading.Lock()
+
+
+def default_timeout() -> tuple[float, float]:
+    """(연결, 읽기) 타임아웃 기본값."""
+    return (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+
+def create_session(
+    pool_size: int = HTTP_POOL_SIZE,
+    keep_alive: bool = HTTP_KEEP_ALIVE,
+) -> requests.Session:
+    """커넥션 풀이 설정된 새 세션을 만든다.
+
+    Args:
+        pool_size: 호스트당 유지할 최대 연결 수 (동시 요청 수 이상으로 설정)
+        keep_alive: False면 매 요청 후 연결을 닫는다
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.verify = False
+    session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+    return session
+
+
+def get_shared_session() -> requests.Session:
+    """프로세스 전체가 공유하는 세션을 반환한다 (최초 호출 시 생성)."""
+    global _shared_session
+    if _shared_session is None:
+        with _shared_lock:
+            if _shared_session is None:
+                _shared_session = create_session()
+    return _shared_session
+
+
+def set_shared_session(session: requests.Session | None):
+    """공유 세션을 교체한다 (풀 크기 변경, 테스트 등). None이면 다음 호출 시 재생성."""
+    global _shared_session
+    with _shared_lock:
+        _shared_session = session
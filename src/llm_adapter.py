@@ -1,17 +1,20 @@
 """LLM Adapter - Ollama 래퍼
 
 Ollama의 /api/chat 엔드포인트를 통해 Tool Calling을 수행한다.
+chat_stream()은 생성 중인 답변을 조각(delta) 단위로 내보낸다.
 """
 
 import json
 import re
 import uuid
-import urllib3
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
 
 import requests
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-from dataclasses import dataclass, field
+from src import tracing
+from src.http_session import default_timeout, get_shared_session
+from src.llm_cache import llm_cache_key
 
 
 @dataclass
@@ -31,16 +34,98 @@ class LLMResponse:
 
 
 class OllamaAdapter:
-    def __init__(self, model: str = "qwen3:14b", base_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        model: str = "qwen3:14b",
+        base_url: str = "http://localhost:11434",
+        session: requests.Session | None = None,
+        timeout: tuple[float, float] | float | None = None,
+        cache=None,
+    ):
         self.model = model
         self.base_url = base_url.rstrip("/")
+        # 기본은 프로세스 공유 keep-alive 풀 (OllamaEmbedder와 같은 연결 재사용)
+        self.session = session or get_shared_session()
+        self.timeout = timeout or default_timeout()
+        # LLMCache/SQLiteLLMCache (선택). cache_stage를 지정한 호출만 사용한다.
+        self.cache = cache
+
+    def chat(
+        self,
+        messages: list,
+        tools: list | None = None,
+        on_token: Callable[[str], None] | None = None,
+        cache_stage: str | None = None,
+    ) -> LLMResponse:
+        """Ollama /api/chat 호출. OpenAI 호환 tool calling 형식.
+
+        on_token이 주어지면 스트리밍으로 호출하고 content 조각마다 on_token을 부른다.
+        cache_stage("router" 등)가 캐시에서 켜진 단계면 같은 요청의 응답을 재사용한다.
+        """
+        with tracing.span("llm", stage=cache_stage, stream=bool(on_token)):
+            return self._chat(messages, tools, on_token, cache_stage)
+
+    def _chat(self, messages, tools, on_token, cache_stage) -> LLMResponse:
+        if on_token:
+            stream = self.chat_stream(messages, tools)
+            for delta in stream:
+                on_token(delta)
+            return stream.response
+
+        payload = self._build_payload(messages, tools, stream=False)
+        use_cache = self.cache is not None and self.cache.enabled_for(cache_stage)
+        if use_cache:
+            key = llm_cache_key(payload)
+            cached = self.cache.get(key)
+            self.cache.record(cache_stage, hit=cached is not None)
+            tracing.annotate(cache_hit=cached is not None)
+            if cached is not None:
+                return _response_from_dict(cached)
+
+        response = self._post_chat(payload)
+        if use_cache:
+            self.cache.put(key, _response_to_dict(response))
+        return response
+
+    def _post_chat(self, payload: dict) -> LLMResponse:
+        resp = self.session.post(
+            f"{self.base_url}/api/chat",
+            json=payload,
+            timeout=self.timeout,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        tracing.annotate(**ollama_metrics(data))
+        msg = data.get("message", {})
+
+        content = msg.get("content", "")
+        # qwen3 등 thinking 모델의 <think>...</think> 태그 제거
+        content = re.sub(r"<think>.*?</think>\s*", "", content, flags=re.DOTALL)
+
+        return LLMResponse(
+            content=content.strip(),
+            tool_calls=_parse_tool_calls(msg.get("tool_calls", [])),
+        )
+
+    def chat_stream(self, messages: list, tools: list | None = None) -> "ChatStream":
+        """스트리밍 /api/chat 호출. 순회하면 <think>가 제거된 content 조각을 내보낸다.
 
-    def chat(self, messages: list, tools: list | None = None) -> LLMResponse:
-        """Ollama /api/chat 호출. OpenAI 호환 tool calling 형식."""
+        순회가 끝나면 stream.response에 최종 LLMResponse(도구 호출 포함)가 담긴다.
+        """
+        resp = self.session.post(
+            f"{self.base_url}/api/chat",
+            json=self._build_payload(messages, tools, stream=True),
+            timeout=self.timeout,
+            stream=True,
+        )
+        resp.raise_for_status()
+        return ChatStream(resp)
+
+    def _build_payload(self, messages: list, tools: list | None, stream: bool) -> dict:
         payload = {
             "model": self.model,
             "messages": messages,
-            "stream": False,
+            "stream": stream,
         }
 
         if tools:
@@ -59,31 +144,152 @@ class OllamaAdapter:
             payload["options"] = {"num_ctx": 8192}
             payload["think"] = False
 
-        resp = requests.post(
-            f"{self.base_url}/api/chat",
-            json=payload,
-            timeout=120,
-            verify=False,
+        return payload
+
+
+class ChatStream:
+    """스트리밍 응답(NDJSON)을 content 조각으로 풀어내는 이터레이터."""
+
+    def __init__(self, resp: requests.Response):
+        self._resp = resp
+        self._filter = ThinkFilter()
+        self._parts: list[str] = []
+        self._tool_calls: list[ToolCall] = []
+        self.response: LLMResponse | None = None  # 순회가 끝나면 채워짐
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            for line in self._resp.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(f"Ollama 스트리밍 오류: {chunk['error']}")
+                msg = chunk.get("message", {})
+                self._tool_calls.extend(_parse_tool_calls(msg.get("tool_calls", [])))
+                delta = self._filter.feed(msg.get("content", ""))
+                if delta:
+                    self._parts.append(delta)
+                    yield delta
+                if chunk.get("done"):
+                    tracing.annotate(**ollama_metrics(chunk))
+                    break
+            tail = self._filter.flush()
+            if tail:
+                self._parts.append(tail)
+                yield tail
+        finally:
+            self._resp.close()
+
+        self.response = LLMResponse(
+            content="".join(self._parts).strip(),
+            tool_calls=self._tool_calls,
         )
-        resp.raise_for_status()
-        msg = resp.json().get("message", {})
-
-        tool_calls = []
-        for tc in msg.get("tool_calls", []):
-            fn = tc.get("function", {})
-            args = fn.get("arguments", {})
-            if isinstance(args, str):
-                args = json.loads(args)
-            call_id = f"call_{uuid.uuid4().hex[:8]}"
-            tool_calls.append(
-                ToolCall(id=call_id, name=fn.get("name", ""), arguments=args)
-            )
 
-        content = msg.get("content", "")
-        # qwen3 등 thinking 모델의 <think>...</think> 태그 제거
-        content = re.sub(r"<think>.*?</think>\s*", "", content, flags=re.DOTALL)
 
-        return LLMResponse(
-            content=content.strip(),
-            tool_calls=tool_calls,
+class ThinkFilter:
+    """스트리밍 텍스트에서 <think>...</think> 블록을 점진적으로 제거한다.
+
+    태그가 여러 조각에 걸쳐 와도 되도록 태그의 앞부분일 수 있는 끝부분은
+    다음 조각이 올 때까지 보류한다. 답변 앞의 공백과 </think> 뒤 공백도 버린다.
+    """
+
+    OPEN = "<think>"
+    CLOSE = "</think>"
+
+    def __init__(self):
+        self._buf = ""
+        self._in_think = False
+        self._skip_ws = True  # 답변 시작 전 / </think> 직후 공백 제거
+
+    def feed(self, text: str) -> str:
+        """조각을 받아 지금 내보내도 되는 텍스트를 반환한다."""
+        self._buf += text
+        out = []
+        while True:
+            if self._in_think:
+                i = self._buf.find(self.CLOSE)
+                if i < 0:
+                    keep = _partial_suffix_len(self._buf, self.CLOSE)
+                    self._buf = self._buf[len(self._buf) - keep:]
+                    break
+                self._buf = self._buf[i + len(self.CLOSE):]
+                self._in_think = False
+                self._skip_ws = True
+                continue
+
+            if self._skip_ws:
+                self._buf = self._buf.lstrip()
+                if not self._buf:
+                    break
+                self._skip_ws = False
+
+            i = self._buf.find(self.OPEN)
+            if i >= 0:
+                out.append(self._buf[:i])
+                self._buf = self._buf[i + len(self.OPEN):]
+                self._in_think = True
+                continue
+
+            keep = _partial_suffix_len(self._buf, self.OPEN)
+            out.append(self._buf[:len(self._buf) - keep])
+            self._buf = self._buf[len(self._buf) - keep:]
+            break
+        return "".join(out)
+
+    def flush(self) -> str:
+        """스트림 종료 시 보류 중인 텍스트를 반환한다 (닫히지 않은 <think>는 버림)."""
+        tail = "" if self._in_think or self._skip_ws else self._buf
+        self._buf = ""
+        return tail
+
+
+def _partial_suffix_len(text: str, tag: str) -> int:
+    """text 끝이 tag의 앞부분과 겹치는 최대 길이 (tag 전체는 제외)."""
+    for k in range(min(len(tag) - 1, len(text)), 0, -1):
+        if text.endswith(tag[:k]):
+            return k
+    return 0
+
+
+def ollama_metrics(data: dict) -> dict:
+    """/api/chat 응답의 Ollama 처리 시간·토큰 수 (duration은 ns → ms)."""
+    metrics = {}
+    for key in ("total_duration", "load_duration", "prompt_eval_duration", "eval_duration"):
+        if key in data:
+            metrics[f"ollama_{key.removesuffix('_duration')}_ms"] = round(data[key] / 1e6, 3)
+    for key in ("prompt_eval_count", "eval_count"):
+        if key in data:
+            metrics[key] = data[key]
+    return metrics
+
+
+def _response_to_dict(response: LLMResponse) -> dict:
+    return {
+        "content": response.content,
+        "tool_calls": [
+            {"id": tc.id, "name": tc.name, "arguments": tc.arguments}
+            for tc in response.tool_calls
+        ],
+    }
+
+
+def _response_from_dict(data: dict) -> LLMResponse:
+    return LLMResponse(
+        content=data.get("content", ""),
+        tool_calls=[ToolCall(**tc) for tc in data.get("tool_calls", [])],
+    )
+
+
+def _parse_tool_calls(raw_calls: list) -> list[ToolCall]:
+    tool_calls = []
+    for tc in raw_calls:
+        fn = tc.get("function", {})
+        args = fn.get("arguments", {})
+        if isinstance(args, str):
+            args = json.loads(args)
+        call_id = f"call_{uuid.uuid4().hex[:8]}"
+        tool_calls.append(
+            ToolCall(id=call_id, name=fn.get("name", ""), arguments=args)
         )
+    return tool_calls
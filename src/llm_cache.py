@@ -0,0 +1,202 @@
+"""LLM Cache - 결정적 파이프라인 단계의 LLM 응답 캐시
+
+Router/Planner/Grader/Rewriter는 사용자가 달라도 같은 프롬프트를 자주 보낸다
+("연차 신청 방법" 등). (모델, 메시지, 도구, 옵션)의 해시를 키로 LLMResponse를
+저장해 같은 요청이면 Ollama를 호출하지 않는다.
+
+메모리(LRU) 또는 SQLite 파일에 저장하며, 둘 다 TTL과 최대 항목 수로 정리한다.
+단계(stage)별 적중/실패 횟수를 기록한다.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")  # 비어 있으면 메모리 캐시
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))  # 초
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+LLM_CACHE_STAGES = os.getenv("LLM_CACHE_STAGES", "router,planner,route_planner,grader,rewriter")
+
+
+def llm_cache_key(payload: dict) -> str:
+    """/api/chat 페이로드(모델, 메시지, 도구, 옵션)로 캐시 키(SHA-256)를 만든다."""
+    body = {k: v for k, v in payload.items() if k != "stream"}
+    canonical = json.dumps(body, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _StageStats:
+    """단계별 적중/실패 카운터 (두 백엔드 공용)."""
+
+    def _init_stats(self, stages):
+        self.stages = set(stages)
+        self.stats: dict[str, dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+
+    def enabled_for(self, stage: str | None) -> bool:
+        return bool(stage) and stage in self.stages
+
+    def record(self, stage: str, hit: bool):
+        with self._stats_lock:
+            counts = self.stats.setdefault(stage, {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+
+    def hit_rate(self, stage: str) -> float:
+        counts = self.stats.get(stage, {})
+        total = counts.get("hits", 0) + counts.get("misses", 0)
+        return counts.get("hits", 0) / total if total else 0.0
+
+    def summary(self) -> str:
+        if not self.stats:
+            return "호출 없음"
+        return ", ".join(
+            f"{stage} {c['hits']}/{c['hits'] + c['misses']} ({self.hit_rate(stage):.0%})"
+            for stage, c in sorted(self.stats.items())
+        )
+
+
+class LLMCache(_StageStats):
+    """메모리 LRU 캐시. 값은 LLMResponse를 직렬화한 dict."""
+
+    def __init__(
+        self,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        ttl: float = LLM_CACHE_TTL,
+        stages=LLM_CACHE_STAGES.split(","),
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._init_stats(s.strip() for s in stages if s.strip())
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            created, value = item
+            if self.ttl > 0 and time.time() - created > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: dict):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def close(self):
+        pass
+
+
+class SQLiteLLMCache(_StageStats):
+    """SQLite 파일 캐시. 재시작 후에도 유지되며 여러 프로세스가 공유할 수 있다."""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        ttl: float = LLM_CACHE_TTL,
+        stages=LLM_CACHE_STAGES.split(","),
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._init_stats(s.strip() for s in stages if s.strip())
+
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses(last_used)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> dict | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created FROM llm_responses WHERE key = ?", (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            response, created = row
+            if self.ttl > 0 and now - created > self.ttl:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(response)
+
+    def put(self, key: str, value: dict):
+        if self.max_entries <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, response, created, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """만료 항목을 지우고, max_entries를 넘으면 최근 사용 순으로 90%까지 줄인다."""
+        if self.ttl > 0:
+            self._conn.execute("DELETE FROM llm_responses WHERE created < ?", (now - self.ttl,))
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        n_delete = count - int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM llm_responses WHERE key IN ("
+            " SELECT key FROM llm_responses ORDER BY last_used ASC LIMIT ?)",
+            (n_delete,),
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_llm_cache(
+    path: str = LLM_CACHE_PATH,
+    max_entries: int = LLM_CACHE_MAX_ENTRIES,
+    ttl: float = LLM_CACHE_TTL,
+    stages: str = LLM_CACHE_STAGES,
+) -> LLMCache | SQLiteLLMCache:
+    """path가 있으면 SQLite, 없으면 메모리 캐시를 만든다."""
+    stage_list = stages.split(",")
+    if path:
+        return SQLiteLLMCache(path, max_entries=max_entries, ttl=ttl, stages=stage_list)
+    return LLMCache(max_entries=max_entries, ttl=ttl, stages=stage_list)
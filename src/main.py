@@ -9,15 +9,20 @@ Phase 1~4를 모두 통합한 최종 실행 파일이다.
 """
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 from src.config import Config
+from src.context_packer import ContextPacker
 from src.llm_adapter import OllamaAdapter
+from src.llm_cache import create_llm_cache
 from src.mcp_client import MCPClient
 from src.agent import AgentCore
-from src.router import Router
-from src.planner import QueryPlanner
-from src.grader import Grader, QueryRewriter
+from src.router import FastRouter, Router, load_router_examples
+from src.planner import QueryPlanner, RoutePlanner
+from src.grader import GRADER_LOG_PATH, Grader, GraderThresholds, QueryRewriter
 from src.hitl import HITLManager, HITLContext, FeedbackStore
+from src.speculative import SpeculativeSearch
+from src.tracing import TraceWriter, annotate_trace, propagate, span, start_trace
 from src.prompts.system import SYSTEM_PROMPT
 
 
@@ -25,25 +30,62 @@ def main():
     config = Config()
 
     # 핵심 인프라 초기화
-    llm = OllamaAdapter(model=config.llm_model, base_url=config.ollama_url)
-    mcp = MCPClient(config_path=config.mcp_config_path)
+    # LLM 응답 캐시 (opt-in): 라우터/플래너/그레이더/재작성 단계의 같은 요청 재사용
+    llm_cache = create_llm_cache() if config.llm_cache else None
+    llm = OllamaAdapter(model=config.llm_model, base_url=config.ollama_url, cache=llm_cache)
+    mcp = MCPClient(config_path=config.mcp_config_path, call_timeout=config.mcp_call_timeout)
 
     print("Simple Agentic RAG Bot 시작 중...")
     mcp.connect_all()
 
+    # 검색 문서를 토큰 예산에 맞춰 축약 (CONTEXT_TOKEN_BUDGET=0이면 전문 사용)
+    context_packer = None
+    if config.context_token_budget > 0:
+        context_packer = ContextPacker(config.context_token_budget, config.context_doc_max_tokens)
+
     # 파이프라인 컴포넌트 초기화 (모두 같은 LLM 인스턴스 공유)
     agent = AgentCore(
         llm=llm, mcp=mcp,
         system_prompt=SYSTEM_PROMPT,
         max_tool_calls=config.max_tool_calls,
+        tool_concurrency=config.tool_concurrency,
+        tool_timeout=config.tool_call_timeout,
+        context_packer=context_packer,
     )
-    router = Router(llm=llm)
+    fast_router = None
+    if config.fast_router:
+        examples = load_router_examples(config.router_examples_path) if config.router_examples_path else None
+        fast_router = FastRouter(examples, min_similarity=config.fast_router_min_similarity)
+    router = Router(llm=llm, fast_router=fast_router, fast_threshold=config.fast_router_threshold)
     planner = QueryPlanner(llm=llm)
-    grader = Grader(llm=llm)
+    # fused 모드: 라우팅과 플래닝을 LLM 호출 한 번으로 처리
+    route_planner = RoutePlanner(llm=llm, router=router) if config.routing_mode == "fused" else None
+    # 보정된 임계값이 있으면 검색 신호로 분명한 경우 LLM 없이 평가 (python -m src.grader_calibration)
+    grader = Grader(
+        llm=llm,
+        context_packer=context_packer,
+        thresholds=GraderThresholds.load() if config.grader_fast_path else None,
+        decision_log=GRADER_LOG_PATH or None,
+    )
     rewriter = QueryRewriter(llm=llm)
     hitl = HITLManager(mode=config.hitl_mode)
     feedback_store = FeedbackStore()
 
+    # 추측 검색 (opt-in): 라우팅/플래닝 중에 원문 쿼리로 사내 문서 검색을 미리 시작
+    speculative = None
+    search_tool = _find_search_tool(mcp, "INTERNAL_SEARCH")
+    if config.speculative_search and search_tool:
+        speculative = SpeculativeSearch(
+            lambda q: _parse_mcp_results(mcp.call_tool(search_tool, {"query": q, "top_k": 5})),
+            threshold=config.speculative_threshold,
+        )
+
+    # 답변 토큰 스트리밍 출력
+    stream = StreamPrinter() if config.stream_output else None
+
+    # 질의별 단계 지연 시간 기록 (data/traces.jsonl)
+    trace_writer = TraceWriter() if config.trace else None
+
     conversation_history = []
 
     print("준비 완료! (종료: quit)\n")
@@ -56,18 +98,26 @@ def main():
             if query.lower() in ("quit", "exit", "종료"):
                 break
 
-            answer = process_query(
-                query=query,
-                conversation_history=conversation_history,
-                agent=agent,
-                router=router,
-                planner=planner,
-                grader=grader,
-                rewriter=rewriter,
-                hitl=hitl,
-            )
+            with start_trace(trace_writer, query=query):
+                answer = process_query(
+                    query=query,
+                    conversation_history=conversation_history,
+                    agent=agent,
+                    router=router,
+                    planner=planner,
+                    grader=grader,
+                    rewriter=rewriter,
+                    hitl=hitl,
+                    speculative=speculative,
+                    route_planner=route_planner,
+                    stream=stream,
+                )
 
-            print(f"\n[봇] {answer}\n")
+            # 스트리밍으로 이미 출력한 답변은 다시 출력하지 않는다 (HITL 수정/거부 등은 출력)
+            if not (stream and stream.shown(answer)):
+                print(f"\n[봇] {answer}\n")
+            if stream:
+                stream.reset()
 
             # 대화 히스토리 관리 (최근 N턴)
             conversation_history.append({"role": "user", "content": query})
@@ -83,14 +133,68 @@ def main():
     except KeyboardInterrupt:
         print("\n종료합니다.")
     finally:
+        if fast_router:
+            print(f"  [라우팅] 로컬 분류 {router.fast_hits}회, LLM 분류 {router.llm_calls}회")
+        if speculative:
+            print(f"  [추측 검색] {speculative.stats.summary()}")
+            speculative.close()
+        if grader.thresholds:
+            print(f"  [평가] 검색 신호 판단 {grader.fast_decisions}회, LLM 평가 {grader.llm_calls}회")
+        if llm_cache:
+            print(f"  [LLM 캐시] {llm_cache.summary()}")
+            llm_cache.close()
+        if trace_writer:
+            print(f"  [추적] {trace_writer.path}")
         mcp.disconnect_all()
 
 
+class StreamPrinter:
+    """답변 토큰을 생성되는 대로 출력한다.
+
+    재검색으로 답변이 다시 생성되면 새 [봇] 줄에 출력한다.
+    """
+
+    def __init__(self):
+        self.last = ""  # 마지막으로 출력을 마친 답변
+        self._parts: list[str] = []
+
+    def __call__(self, delta: str):
+        if not self._parts:
+            print("\n[봇] ", end="", flush=True)
+        self._parts.append(delta)
+        print(delta, end="", flush=True)
+
+    def end(self):
+        """답변 하나의 출력을 마친다."""
+        if self._parts:
+            print("\n", flush=True)
+            self.last = "".join(self._parts).strip()
+            self._parts = []
+
+    def shown(self, answer: str) -> bool:
+        """answer가 방금 스트리밍으로 출력된 답변이면 True."""
+        return bool(self.last) and answer.strip() == self.last
+
+    def reset(self):
+        self.last = ""
+        self._parts = []
+
+
+def _end_stream(stream: StreamPrinter | None):
+    if stream:
+        stream.end()
+
+
 def _find_search_tool(mcp, route: str) -> str | None:
     """라우트에 맞는 MCP 검색 도구 이름을 찾는다."""
     keyword = "search_vector_db" if route == "INTERNAL_SEARCH" else "web_search"
+    return _find_tool(mcp, keyword)
+
+
+def _find_tool(mcp, name: str) -> str | None:
+    """MCP 도구 이름(서버 접두사 제외)이 정확히 일치하는 도구를 찾는다."""
     for tool in mcp.get_tools_for_llm():
-        if keyword in tool["name"]:
+        if tool["name"].split("__", 1)[-1] == name:
             return tool["name"]
     return None
 
@@ -112,6 +216,22 @@ def _parse_mcp_results(result_json: str) -> list[dict]:
     return []
 
 
+def _parse_mcp_batch_results(result_json: str) -> list[list[dict]]:
+    """배치 검색 결과에서 쿼리별 문서 리스트를 추출한다 (content 항목 하나가 쿼리 하나)."""
+    try:
+        result = json.loads(result_json)
+        if isinstance(result, dict) and "content" in result:
+            batch = []
+            for item in result["content"]:
+                if item.get("type") == "text":
+                    docs = json.loads(item["text"])
+                    batch.append(docs if isinstance(docs, list) else [])
+            return batch
+    except (json.JSONDecodeError, TypeError, KeyError, AttributeError):
+        pass
+    return []
+
+
 def _dedup_documents(documents: list[dict]) -> list[dict]:
     """문서 중복 제거."""
     seen = set()
@@ -124,12 +244,43 @@ def _dedup_documents(documents: list[dict]) -> list[dict]:
     return result
 
 
-def _direct_search(mcp, tool_name: str, queries: list[str], top_k: int = 5) -> list[dict]:
-    """Planner의 최적화된 쿼리로 MCP 검색을 직접 수행한다."""
+def _direct_search(
+    mcp, tool_name: str, queries: list[str], top_k: int = 5,
+    prefetched: dict[str, list[dict]] | None = None,
+) -> list[dict]:
+    """Planner의 최적화된 쿼리로 MCP 검색을 직접 수행한다.
+
+    서버가 배치 도구(<tool>_batch)를 제공하면 모든 쿼리를 한 번에 요청하고,
+    아니면 쿼리별 요청을 동시에 보낸다. 결과는 쿼리 순서대로 합친 뒤 중복 제거한다.
+    prefetched에 결과가 있는 쿼리(추측 검색 적중)는 다시 검색하지 않는다.
+    """
+    def search(sq: str) -> list[dict]:
+        return _parse_mcp_results(mcp.call_tool(tool_name, {"query": sq, "top_k": top_k}))
+
+    prefetched = prefetched or {}
+    pending = [sq for sq in queries if sq not in prefetched]
+
+    results = None
+    batch_tool = _find_tool(mcp, tool_name.split("__", 1)[-1] + "_batch")
+    if batch_tool and pending:
+        results = _parse_mcp_batch_results(
+            mcp.call_tool(batch_tool, {"queries": pending, "top_k": top_k})
+        )
+        if len(results) != len(pending):
+            print("  [검색] 배치 검색 응답이 올바르지 않아 쿼리별로 재검색합니다.")
+            results = None
+
+    if results is None:
+        if len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+                results = list(pool.map(propagate(search), pending))
+        else:
+            results = [search(sq) for sq in pending]
+
+    fetched = {**dict(zip(pending, results)), **prefetched}
     all_docs = []
     for sq in queries:
-        result_json = mcp.call_tool(tool_name, {"query": sq, "top_k": top_k})
-        docs = _parse_mcp_results(result_json)
+        docs = fetched[sq]
         print(f"  [검색] '{sq}' → {len(docs)}건")
         for i, doc in enumerate(docs):
             dist = doc.get("distance", "?")
@@ -148,23 +299,46 @@ def process_query(
     grader: Grader,
     rewriter: QueryRewriter,
     hitl: HITLManager,
+    speculative: SpeculativeSearch | None = None,
+    route_planner: RoutePlanner | None = None,
+    stream: StreamPrinter | None = None,
 ) -> str:
     """하나의 사용자 질문을 전체 파이프라인으로 처리한다.
 
     핵심 변경: Planner가 최적화한 검색어로 직접 MCP 검색을 수행한 뒤,
     검색 결과를 LLM에게 전달하여 답변 생성에만 집중하도록 한다.
     (기존: LLM이 도구 호출 쿼리를 독립적으로 결정 → Planner 쿼리 무시 가능)
+
+    speculative가 주어지면 라우팅 전에 원문 쿼리로 사내 문서 검색을 시작하고,
+    Planner 검색어가 원문과 비슷하면 그 결과를 재사용한다.
+
+    route_planner가 주어지면 라우팅과 플래닝을 LLM 호출 한 번으로 처리한다.
+    stream이 주어지면 답변 토큰을 생성되는 대로 출력한다.
     """
+    spec = speculative.start(query) if speculative else None
 
-    # Phase 2: 라우팅
-    route = router.classify(query)
+    # Phase 2: 라우팅 (fused 모드면 플래닝까지 한 번에)
+    if route_planner:
+        with span("route_planner"):
+            route, plan = route_planner.route_and_plan(query, conversation_history)
+    else:
+        with span("router"):
+            route, plan = router.classify(query), None
+    annotate_trace(route=route)
     print(f"  [라우팅] {route}")
 
     if route == "CHITCHAT":
-        return agent.direct_answer(query, conversation_history)
+        if spec:
+            speculative.discard(spec)
+        with span("answer"):
+            answer = agent.direct_answer(query, conversation_history, on_token=stream)
+        _end_stream(stream)
+        return answer
 
     # Phase 2.5: 질의 분석 & 최적화
-    plan = planner.plan(query, route, conversation_history)
+    if plan is None:
+        with span("planner"):
+            plan = planner.plan(query, route, conversation_history)
     print(f"  [플래닝] 의도: {plan.intent}")
     print(f"  [플래닝] 검색어: {plan.search_queries}")
 
@@ -173,33 +347,51 @@ def process_query(
     tool_filter = "search_vector_db" if route == "INTERNAL_SEARCH" else "web_search"
     documents = []
 
+    prefetched = {}
+    if spec:
+        if route == "INTERNAL_SEARCH":
+            prefetched = speculative.resolve(spec, plan.search_queries)
+        else:
+            speculative.discard(spec)
+
     if tool_name:
-        documents = _direct_search(agent.mcp, tool_name, plan.search_queries)
+        with span("search", queries=len(plan.search_queries), prefetched=len(prefetched)):
+            documents = _direct_search(agent.mcp, tool_name, plan.search_queries, prefetched=prefetched)
 
     # 검색 결과 기반 답변 생성
     if documents:
-        answer = agent.answer_with_context(query, documents, conversation_history)
+        with span("answer", documents=len(documents)):
+            answer = agent.answer_with_context(query, documents, conversation_history, on_token=stream)
+        _end_stream(stream)
     else:
         # 폴백: 기존 Agent 루프 (도구 호출 포함)
         messages = conversation_history + [{"role": "user", "content": query}]
-        answer, documents = agent.run(messages, tool_filter=tool_filter)
+        with span("agent_loop"):
+            answer, documents = agent.run(messages, tool_filter=tool_filter)
 
     # Phase 3: 검색 결과 평가
     retry_count = 0
     grade = "PASS"
     if documents:
-        grade = grader.evaluate(query, documents)
+        with span("grade") as s:
+            grade = grader.evaluate(query, documents, keywords=plan.keywords)
+            s.set(grade=grade)
         print(f"  [평가] {grade}")
 
         if grade == "FAIL":
-            rewritten = rewriter.rewrite(query)
+            with span("rewrite"):
+                rewritten = rewriter.rewrite(query)
             print(f"  [재작성] {rewritten}")
             # 재작성된 쿼리로 직접 재검색
             if tool_name:
-                new_docs = _direct_search(agent.mcp, tool_name, [rewritten])
+                with span("search", queries=1, retry=True):
+                    new_docs = _direct_search(agent.mcp, tool_name, [rewritten])
                 if new_docs:
                     documents = new_docs
-                    answer = agent.answer_with_context(query, documents, conversation_history)
+                    print("  [재검색] 답변을 다시 생성합니다")
+                    with span("answer", documents=len(documents), retry=True):
+                        answer = agent.answer_with_context(query, documents, conversation_history, on_token=stream)
+                    _end_stream(stream)
             retry_count = 1
             grade = "PASS"  # 재검색 후 강제 진행
 
@@ -220,7 +412,9 @@ def process_query(
         search_queries=plan.search_queries,
     )
 
-    decision = hitl.request_review(context)
+    with span("hitl", confidence=confidence) as s:
+        decision = hitl.request_review(context)
+        s.set(action=decision.action)
 
     if decision.action == "approve":
         return answer
@@ -231,9 +425,11 @@ def process_query(
         if tool_name:
             retry_docs = _direct_search(agent.mcp, tool_name, [decision.new_query])
             if retry_docs:
-                return agent.answer_with_context(
-                    decision.new_query, retry_docs, conversation_history,
+                answer = agent.answer_with_context(
+                    decision.new_query, retry_docs, conversation_history, on_token=stream,
                 )
+                _end_stream(stream)
+                return answer
         msgs = conversation_history + [{"role": "user", "content": decision.new_query}]
         new_answer, _ = agent.run(msgs, tool_filter=tool_filter)
         return new_answer
@@ -2,14 +2,22 @@
 
 시작 시 mcp_config.json의 서버에 연결하여 도구 목록을 수집하고,
 Agent Core가 도구를 호출할 때 해당 MCP 서버로 요청을 중계한다.
+서버별 채널은 요청 id로 응답을 매칭하므로 같은 서버에 여러 요청을
+동시에 보낼 수 있다. 설정의 "workers"가 2 이상이면 같은 서버를 여러
+프로세스로 띄우고 대기 요청이 가장 적은 프로세스로 분산한다.
 """
 
+import itertools
 import json
 import os
 import subprocess
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
 from pathlib import Path
 
+from src import tracing
+
 
 @dataclass
 class MCPTool:
@@ -30,12 +38,254 @@ class MCPTool:
         }
 
 
+class MCPConnection:
+    """MCP 서버 프로세스 하나와의 다중화 JSON-RPC 채널.
+
+    요청마다 고유 id를 붙여 보내고, 백그라운드 reader 스레드가 응답을
+    id로 찾아 대기 중인 Future에 전달한다. 여러 스레드가 같은 서버에
+    동시에 요청을 보낼 수 있으며, 알 수 없는 id의 응답은 버린다.
+    """
+
+    def __init__(self, name: str, proc: subprocess.Popen):
+        self.name = name
+        self.proc = proc
+        self._ids = itertools.count(1)
+        self._pending: dict[int, Future] = {}
+        self._lock = threading.Lock()  # _pending, id 발급, 종료 상태
+        self._write_lock = threading.Lock()  # stdin 쓰기 직렬화
+        self._closed = False
+        self._reader = threading.Thread(
+            target=self._read_loop, name=f"mcp-reader-{name}", daemon=True,
+        )
+        self._reader.start()
+
+    @property
+    def alive(self) -> bool:
+        return not self._closed and self.proc.poll() is None
+
+    @property
+    def pending(self) -> int:
+        """응답을 기다리는 요청 수."""
+        with self._lock:
+            return len(self._pending)
+
+    def submit(self, method: str, params: dict) -> tuple[int, Future]:
+        """요청을 보내고 (id, 응답 Future)를 반환한다."""
+        with self._lock:
+            if self._closed:
+                raise ConnectionError(f"서버 '{self.name}' 연결이 종료되었습니다.")
+            req_id = next(self._ids)
+            future = Future()
+            self._pending[req_id] = future
+
+        req = {"jsonrpc": "2.0", "id": req_id, "method": method, "params": params}
+        try:
+            with self._write_lock:
+                self.proc.stdin.write((json.dumps(req) + "\n").encode())
+                self.proc.stdin.flush()
+        except (OSError, ValueError) as e:
+            with self._lock:
+                self._closed = True
+            self._discard(req_id)
+            raise ConnectionError(f"서버 '{self.name}' 요청 전송 실패: {e}") from e
+        return req_id, future
+
+    def request(self, method: str, params: dict, timeout: float | None = None) -> dict:
+        """요청을 보내고 응답의 result를 기다린다.
+
+        Raises:
+            TimeoutError: timeout(초) 안에 응답이 없을 때
+            ConnectionError: 서버 프로세스가 종료되었거나 쓰기에 실패했을 때
+        """
+        req_id, future = self.submit(method, params)
+        try:
+            response = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self._discard(req_id)
+            raise TimeoutError(
+                f"서버 '{self.name}' 응답 시간 초과 (method={method}, {timeout:g}초)"
+            ) from None
+
+        if "error" in response:
+            err = response["error"]
+            print(f"  [MCP] 서버 에러 (method={method}): {err.get('message', err)}")
+        return response.get("result", {})
+
+    def _discard(self, req_id: int):
+        with self._lock:
+            self._pending.pop(req_id, None)
+
+    def _read_loop(self):
+        """stdout 응답을 id별 Future로 전달한다 (스트림이 닫힐 때까지)."""
+        for raw in iter(self.proc.stdout.readline, b""):
+            line = raw.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            try:
+                msg = json.loads(line)
+                req_id = msg.get("id")
+                with self._lock:
+                    future = self._pending.pop(req_id, None)
+            except (json.JSONDecodeError, AttributeError, TypeError):
+                print(f"  [MCP] {self.name} 잘못된 응답 무시: {line[:80]}")
+                continue
+            if future is None:
+                # 알림에 대한 응답 또는 이미 타임아웃된 요청의 늦은 응답
+                if req_id is not None:
+                    print(f"  [MCP] {self.name} 대기 중이 아닌 응답 무시 (id={req_id})")
+                continue
+            future.set_result(msg)
+        self._fail_pending(ConnectionError(f"서버 '{self.name}'의 출력이 종료되었습니다."))
+
+    def _fail_pending(self, error: Exception):
+        with self._lock:
+            self._closed = True
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(error)
+
+    def close(self):
+        """서버 프로세스를 종료하고 대기 중인 요청을 실패 처리한다."""
+        with self._lock:
+            self._closed = True
+        try:
+            self.proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            self.proc.terminate()
+            self.proc.wait(timeout=5)
+        except Exception:
+            self.proc.kill()
+        self._fail_pending(ConnectionError(f"서버 '{self.name}' 연결이 종료되었습니다."))
+
+
+class MCPServerPool:
+    """같은 MCP 서버 프로세스 N개를 묶은 워커 풀.
+
+    요청은 대기 중인 요청이 가장 적은 워커로 보내고, 종료된 워커는
+    다음 요청 때 새 프로세스로 교체한다. 교체(핸드셰이크 포함)는 락 밖에서 하므로
+    그동안 다른 요청은 살아 있는 워커를 쓴다.
+    """
+
+    def __init__(self, name: str, cfg: dict, cwd: str, timeout: float | None = None):
+        self.name = name
+        self.cfg = cfg
+        self.cwd = cwd
+        self.timeout = timeout
+        self.size = max(int(cfg.get("workers", 1)), 1)
+        self.workers: list[MCPConnection] = []
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)  # 워커 교체 완료 알림
+        self._respawning: set[int] = set()  # 재시작 중인 워커 슬롯
+
+    def start(self) -> list[dict]:
+        """워커를 모두 띄워 핸드셰이크하고, 첫 워커의 도구 목록을 반환한다.
+
+        도중에 실패하면 이미 띄운 워커를 정리하고 예외를 다시 던진다.
+        """
+        try:
+            for _ in range(self.size):
+                self.workers.append(self._spawn())
+            result = self.workers[0].request("tools/list", {}, timeout=self.timeout)
+        except Exception:
+            self.close()
+            raise
+        return result.get("tools", [])
+
+    def _spawn(self) -> MCPConnection:
+        proc = subprocess.Popen(
+            [self.cfg["command"]] + self.cfg.get("args", []),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=None,  # MCP 서버 stderr을 터미널에 표시 (디버그 로그용)
+            cwd=self.cwd,
+            env={**os.environ, "PYTHONUNBUFFERED": "1", "PYTHONIOENCODING": "utf-8", **self.cfg.get("env", {})},
+        )
+        conn = MCPConnection(self.name, proc)
+        try:
+            # 초기화 핸드셰이크
+            conn.request("initialize", {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "agentic-rag-bot"},
+            }, timeout=self.timeout)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _pick(self) -> MCPConnection:
+        """대기 요청이 가장 적은 워커를 고른다 (종료된 워커는 먼저 재시작).
+
+        살아 있는 워커가 하나도 없으면 다른 요청이 재시작 중인 워커를 기다린다.
+        """
+        while True:
+            with self._changed:
+                dead = next(
+                    (i for i, c in enumerate(self.workers) if not c.alive and i not in self._respawning),
+                    None,
+                )
+                if dead is None:
+                    live = [c for c in self.workers if c.alive]
+                    if live:
+                        return min(live, key=lambda c: c.pending)
+                    if not self._respawning:
+                        raise ConnectionError(f"서버 '{self.name}'에 살아 있는 워커가 없습니다.")
+                    self._changed.wait()
+                    continue
+                self._respawning.add(dead)
+                old = self.workers[dead]
+            self._respawn(dead, old)
+
+    def _respawn(self, i: int, old: MCPConnection):
+        """슬롯 i의 종료된 워커를 새 프로세스로 바꾼다 (락 없이 호출).
+
+        프로세스를 띄우지 못하면 (실행 파일 없음, 권한 등) ConnectionError로 알린다.
+        """
+        print(f"  [MCP] {self.name} 워커 {i} 종료 감지, 재시작합니다.")
+        old.close()
+        conn = None
+        try:
+            conn = self._spawn()
+        except ConnectionError:
+            raise
+        except OSError as e:
+            raise ConnectionError(f"{self.name} 워커 재시작 실패: {e}") from e
+        finally:
+            with self._changed:
+                self._respawning.discard(i)
+                if conn is not None:
+                    if i < len(self.workers) and self.workers[i] is old:
+                        self.workers[i] = conn
+                        self.restarts += 1
+                    else:  # 그 사이 close()됨
+                        conn.close()
+                self._changed.notify_all()
+
+    def request(self, method: str, params: dict, timeout: float | None = None) -> dict:
+        """워커 하나에 요청을 보낸다. 워커가 도중에 죽으면 다른 워커로 한 번 재시도한다."""
+        try:
+            return self._pick().request(method, params, timeout=timeout)
+        except ConnectionError as e:
+            print(f"  [MCP] {self.name} 워커 연결 끊김, 재시도합니다: {e}")
+            return self._pick().request(method, params, timeout=timeout)
+
+    def close(self):
+        with self._lock:
+            for conn in self.workers:
+                conn.close()
+            self.workers = []
+
+
 class MCPClient:
-    def __init__(self, config_path: str = "mcp_config.json"):
+    def __init__(self, config_path: str = "mcp_config.json", call_timeout: float = 120.0):
         self.config_path = Path(config_path)
         # MCP 서버의 작업 디렉토리를 프로젝트 루트로 고정
         self.project_root = str(self.config_path.resolve().parent)
-        self.servers: dict[str, subprocess.Popen] = {}
+        self.call_timeout = call_timeout  # 요청 1건당 응답 대기 시간(초)
+        self.servers: dict[str, MCPServerPool] = {}
         self.tools: dict[str, MCPTool] = {}
 
     def connect_all(self):
@@ -46,27 +296,13 @@ class MCPClient:
 
         config = json.loads(self.config_path.read_text())
         for name, cfg in config.get("mcpServers", {}).items():
+            pool = MCPServerPool(name, cfg, cwd=self.project_root, timeout=self.call_timeout)
             try:
-                proc = subprocess.Popen(
-                    [cfg["command"]] + cfg.get("args", []),
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=None,  # MCP 서버 stderr을 터미널에 표시 (디버그 로그용)
-                    cwd=self.project_root,
-                    env={**os.environ, "PYTHONUNBUFFERED": "1", "PYTHONIOENCODING": "utf-8", **cfg.get("env", {})},
-                )
-                self.servers[name] = proc
-
-                # 초기화 핸드셰이크
-                self._send(proc, "initialize", {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {},
-                    "clientInfo": {"name": "agentic-rag-bot"},
-                })
+                tools = pool.start()
+                self.servers[name] = pool
 
                 # 도구 목록 수집
-                result = self._send(proc, "tools/list", {})
-                for t in result.get("tools", []):
+                for t in tools:
                     tool = MCPTool(
                         server_name=name,
                         name=t["name"],
@@ -75,52 +311,43 @@ class MCPClient:
                     )
                     self.tools[tool.full_name] = tool
 
-                print(f"  [MCP] {name} 연결 완료 (도구 {len(result.get('tools', []))}개)")
+                workers = f", 워커 {pool.size}개" if pool.size > 1 else ""
+                print(f"  [MCP] {name} 연결 완료 (도구 {len(tools)}개{workers})")
             except Exception as e:
+                pool.close()
                 print(f"  [MCP] {name} 연결 실패: {e}")
 
     def get_tools_for_llm(self) -> list[dict]:
         """LLM에 전달할 도구 스키마 목록을 반환한다."""
         return [t.to_llm_tool() for t in self.tools.values()]
 
-    def call_tool(self, full_name: str, arguments: dict) -> str:
-        """MCP 서버에 도구 호출을 중계한다."""
+    def call_tool(self, full_name: str, arguments: dict, timeout: float | None = None) -> str:
+        """MCP 서버에 도구 호출을 중계한다. timeout(초)을 주면 call_timeout 대신 사용한다."""
         tool = self.tools.get(full_name)
         if not tool:
             return json.dumps({"error": f"도구 '{full_name}'을 찾을 수 없습니다."})
 
-        proc = self.servers.get(tool.server_name)
-        if not proc:
+        pool = self.servers.get(tool.server_name)
+        if not pool:
             return json.dumps({"error": f"서버 '{tool.server_name}'에 연결되지 않았습니다."})
 
-        result = self._send(proc, "tools/call", {
-            "name": tool.name,
-            "arguments": arguments,
-        })
+        params = {"name": tool.name, "arguments": arguments}
+        with tracing.span("mcp", tool=full_name):
+            if tracing.active():
+                params["_meta"] = {"trace": True}  # 서버 내부 단계 span 요청
+            try:
+                result = pool.request("tools/call", params, timeout=timeout or self.call_timeout)
+            except (TimeoutError, ConnectionError) as e:
+                print(f"  [MCP] 도구 호출 실패 ({full_name}): {e}")
+                return json.dumps({"error": str(e)})
+            meta = result.pop("_meta", None) if isinstance(result, dict) else None
+            if isinstance(meta, dict):
+                tracing.add_remote_spans(meta.get("spans", []), prefix=f"{tool.server_name}:")
         return json.dumps(result, ensure_ascii=False)
 
-    def _send(self, proc: subprocess.Popen, method: str, params: dict) -> dict:
-        """MCP 서버에 JSON-RPC 요청을 보내고 응답을 받는다."""
-        req = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
-        proc.stdin.write((json.dumps(req) + "\n").encode())
-        proc.stdin.flush()
-        line = proc.stdout.readline().decode()
-        if not line:
-            print(f"  [MCP] 서버 응답 없음 (method={method})")
-            return {}
-        response = json.loads(line)
-        if "error" in response:
-            err = response["error"]
-            print(f"  [MCP] 서버 에러 (method={method}): {err.get('message', err)}")
-        return response.get("result", {})
-
     def disconnect_all(self):
         """모든 MCP 서버 프로세스를 종료한다."""
-        for name, proc in self.servers.items():
-            try:
-                proc.terminate()
-                proc.wait(timeout=5)
-            except Exception:
-                proc.kill()
+        for pool in self.servers.values():
+            pool.close()
         self.servers.clear()
         self.tools.clear()
@@ -2,11 +2,14 @@
 
 stdio를 통해 JSON-RPC 메시지를 주고받는 MCP 서버이다.
 Hybrid Search (Vector + BM25) + RRF + Parent Lookup을 수행한다.
+tools/call 요청은 워커 풀에서 동시에 처리하고, 끝나는 순서대로 id를 붙여 응답한다.
 """
 
 import json
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # 프로젝트 루트를 sys.path에 추가하여 'from src.xxx import ...' 가 동작하도록 한다.
 _PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -26,47 +29,58 @@ if hasattr(sys.stderr, "reconfigure"):
 CHROMA_DIR = os.path.abspath(os.getenv("CHROMA_PERSIST_DIR", "./data/chroma"))
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "bona/bge-m3-korean:latest")
 VERBOSE = os.getenv("RETRIEVER_VERBOSE", "").lower() in ("1", "true", "yes")
+BM25_BACKEND = os.getenv("BM25_BACKEND", "python")  # "python" | "numpy"
+SEARCH_WORKERS = int(os.getenv("VECTOR_SEARCH_WORKERS", "4"))
 
 # Lazy 초기화 (서버 시작 시가 아니라 첫 검색 호출 시 로딩)
 _embedder = None
 _chroma = None
 _retriever = None
+_init_lock = threading.RLock()  # 워커들이 동시에 첫 검색을 해도 한 번만 초기화
 
 
 def _get_embedder():
     global _embedder
-    if _embedder is None:
-        from src.embedding import OllamaEmbedder
-        _embedder = OllamaEmbedder(model=EMBEDDING_MODEL)
+    with _init_lock:
+        if _embedder is None:
+            from src.embedding import OllamaEmbedder
+            from src.embedding_cache import with_cache
+            # EMBED_CACHE_PATH가 설정되면 인제스트와 같은 디스크 캐시를 공유
+            _embedder = with_cache(OllamaEmbedder(model=EMBEDDING_MODEL))
     return _embedder
 
 
 def _get_chroma():
     global _chroma
-    if _chroma is None:
-        import chromadb
-        print(f"  [MCP:vector-search] ChromaDB 경로: {CHROMA_DIR}", file=sys.stderr, flush=True)
-        print(f"  [MCP:vector-search] CWD: {os.getcwd()}", file=sys.stderr, flush=True)
-        _chroma = chromadb.PersistentClient(path=CHROMA_DIR)
-        # 컬렉션 상태 확인
-        try:
-            cols = _chroma.list_collections()
-            for col in cols:
-                print(f"  [MCP:vector-search] 컬렉션 '{col.name}': {col.count()}건", file=sys.stderr, flush=True)
-        except Exception as e:
-            print(f"  [MCP:vector-search] 컬렉션 확인 실패: {e}", file=sys.stderr, flush=True)
+    with _init_lock:
+        if _chroma is None:
+            import chromadb
+            print(f"  [MCP:vector-search] ChromaDB 경로: {CHROMA_DIR}", file=sys.stderr, flush=True)
+            print(f"  [MCP:vector-search] CWD: {os.getcwd()}", file=sys.stderr, flush=True)
+            _chroma = chromadb.PersistentClient(path=CHROMA_DIR)
+            # 컬렉션 상태 확인
+            try:
+                cols = _chroma.list_collections()
+                for col in cols:
+                    print(f"  [MCP:vector-search] 컬렉션 '{col.name}': {col.count()}건", file=sys.stderr, flush=True)
+            except Exception as e:
+                print(f"  [MCP:vector-search] 컬렉션 확인 실패: {e}", file=sys.stderr, flush=True)
     return _chroma
 
 
 def _get_retriever():
     global _retriever
-    if _retriever is None:
-        from src.retriever import AdvancedRetriever
-        _retriever = AdvancedRetriever(
-            chroma_client=_get_chroma(),
-            embedder=_get_embedder(),
-            verbose=VERBOSE,
-        )
+    with _init_lock:
+        if _retriever is None:
+            from src.retriever import AdvancedRetriever, bm25_index_path
+            _retriever = AdvancedRetriever(
+                chroma_client=_get_chroma(),
+                embedder=_get_embedder(),
+                verbose=VERBOSE,
+                bm25_backend=BM25_BACKEND,
+                bm25_index_dir=bm25_index_path(CHROMA_DIR),
+                corpus_dir=CHROMA_DIR,
+            )
     return _retriever
 
 TOOLS = [
@@ -85,29 +99,64 @@ TOOLS = [
             },
             "required": ["query"],
         },
-    }
+    },
+    {
+        "name": "search_vector_db_batch",
+        "description": "여러 검색어로 사내 문서를 한 번에 검색합니다. 검색어별 결과를 순서대로 반환합니다.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "queries": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "검색할 쿼리 문자열 목록",
+                },
+                "top_k": {
+                    "type": "integer",
+                    "description": "쿼리별 반환할 최대 문서 수",
+                    "default": 5,
+                },
+            },
+            "required": ["queries"],
+        },
+    },
 ]
 
 
+def _to_docs(results) -> list[dict]:
+    from src.retriever import AdvancedRetriever
+    return [
+        {
+            "content": r.parent_content,
+            # 매칭된 Child (컨텍스트 축약 기준). Parent에서 찾을 수 있도록 [출처] 헤더는 뗀다
+            "child_content": AdvancedRetriever._strip_contextual_header(r.content),
+            "metadata": r.metadata,
+            "distance": r.distance,
+            "rrf_score": r.rrf_score,
+        }
+        for r in results
+    ]
+
+
 def search(query: str, top_k: int = 5) -> dict:
     retriever = _get_retriever()
     results = retriever.search(query=query, top_k=top_k)
 
-    if not results:
-        return {
-            "content": [{"type": "text", "text": json.dumps([], ensure_ascii=False)}]
-        }
+    return {
+        "content": [{"type": "text", "text": json.dumps(_to_docs(results), ensure_ascii=False)}]
+    }
 
-    docs = []
-    for r in results:
-        docs.append({
-            "content": r.parent_content,
-            "metadata": r.metadata,
-            "distance": r.distance,
-        })
+
+def search_batch(queries: list[str], top_k: int = 5) -> dict:
+    """쿼리 목록을 한 번에 검색한다. content[i]가 queries[i]의 문서 목록이다."""
+    retriever = _get_retriever()
+    batch = retriever.search_batch(queries=queries, top_k=top_k)
 
     return {
-        "content": [{"type": "text", "text": json.dumps(docs, ensure_ascii=False)}]
+        "content": [
+            {"type": "text", "text": json.dumps(_to_docs(results), ensure_ascii=False)}
+            for results in batch
+        ]
     }
 
 
@@ -127,34 +176,76 @@ def handle_request(req: dict) -> dict:
     elif method == "tools/call":
         params = req.get("params", {})
         args = params.get("arguments", {})
+        if params.get("name") == "search_vector_db_batch":
+            return search_batch(args.get("queries", []), args.get("top_k", 5))
         return search(args.get("query", ""), args.get("top_k", 5))
     else:
         return {}
 
 
+def _handle_traced(req: dict) -> dict:
+    """클라이언트가 params._meta.trace를 보내면 검색 단계별 span을 result._meta에 담는다."""
+    meta = (req.get("params") or {}).get("_meta") or {}
+    if not meta.get("trace"):
+        return handle_request(req)
+    from src.tracing import start_trace
+    with start_trace(record=True) as trace:
+        result = handle_request(req)
+    return {**result, "_meta": {"spans": trace.to_record()["spans"]}}
+
+
+def respond(req: dict) -> dict:
+    """요청 하나를 처리해 JSON-RPC 응답(result 또는 error)을 만든다."""
+    try:
+        return {"jsonrpc": "2.0", "id": req.get("id"), "result": _handle_traced(req)}
+    except Exception as e:
+        import traceback
+        print(f"  [MCP:vector-search] ERROR: {e}", file=sys.stderr, flush=True)
+        traceback.print_exc(file=sys.stderr)
+        return {
+            "jsonrpc": "2.0",
+            "id": req.get("id"),
+            "error": {"code": -32603, "message": str(e)},
+        }
+
+
+def serve(stdin=None, stdout=None, workers: int = SEARCH_WORKERS):
+    """stdin의 요청을 읽어 stdout으로 응답한다.
+
+    tools/call은 워커 풀에 맡겨 동시에 처리하고 완료되는 대로 응답한다
+    (응답 순서는 요청 순서와 다를 수 있으며 id로 구분한다).
+    나머지 메서드는 읽은 순서대로 바로 처리한다.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    write_lock = threading.Lock()
+
+    def write(response: dict):
+        with write_lock:
+            stdout.write(json.dumps(response) + "\n")
+            stdout.flush()
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="vector-search") as pool:
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                req = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"  [MCP:vector-search] ERROR: {e}", file=sys.stderr, flush=True)
+                write({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": str(e)}})
+                continue
+            if not isinstance(req, dict):
+                write({"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request"}})
+                continue
+
+            if req.get("method") == "tools/call":
+                pool.submit(lambda r=req: write(respond(r)))
+            else:
+                write(respond(req))
+    # stdin이 닫히면 진행 중인 검색의 응답까지 쓴 뒤 종료 (with 블록이 대기)
+
+
 if __name__ == "__main__":
-    for line in sys.stdin:
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            req = json.loads(line)
-            result = handle_request(req)
-            response = {
-                "jsonrpc": "2.0",
-                "id": req.get("id"),
-                "result": result,
-            }
-            sys.stdout.write(json.dumps(response) + "\n")
-            sys.stdout.flush()
-        except Exception as e:
-            import traceback
-            print(f"  [MCP:vector-search] ERROR: {e}", file=sys.stderr, flush=True)
-            traceback.print_exc(file=sys.stderr)
-            error_resp = {
-                "jsonrpc": "2.0",
-                "id": req.get("id") if isinstance(req, dict) else None,
-                "error": {"code": -32603, "message": str(e)},
-            }
-            sys.stdout.write(json.dumps(error_resp) + "\n")
-            sys.stdout.flush()
+    serve()
@@ -1,14 +1,15 @@
 """Query Planner - 질의 분석 및 최적화
 
 Router 이후, 검색 이전에 위치하여 사용자 질문을 벡터 검색에
-최적화된 쿼리로 변환한다.
+최적화된 쿼리로 변환한다. RoutePlanner는 라우팅과 플래닝을
+한 번의 LLM 호출로 처리한다.
 """
 
 import json
 from dataclasses import dataclass, field
 
 from src.llm_adapter import OllamaAdapter
-from src.prompts.planner import PLANNER_PROMPT
+from src.prompts.planner import PLANNER_PROMPT, ROUTE_AND_PLAN_PROMPT
 
 
 @dataclass
@@ -33,13 +34,7 @@ class QueryPlanner:
         conversation_history: list | None = None,
     ) -> QueryPlan:
         """사용자 질문을 분석하여 최적화된 검색 계획을 반환한다."""
-        history_context = ""
-        if conversation_history:
-            recent = conversation_history[-6:]  # 최근 3턴
-            history_context = "\n".join(
-                f"{'사용자' if m['role'] == 'user' else '어시스턴트'}: {m['content'][:200]}"
-                for m in recent
-            )
+        history_context = format_history(conversation_history)
 
         user_message = f"## 라우팅 결과\n{route}\n\n"
         if history_context:
@@ -50,7 +45,8 @@ class QueryPlanner:
             messages=[
                 {"role": "system", "content": PLANNER_PROMPT},
                 {"role": "user", "content": user_message},
-            ]
+            ],
+            cache_stage="planner",
         )
 
         return self._parse_plan(response.content, query)
@@ -58,32 +54,119 @@ class QueryPlanner:
     def _parse_plan(self, response_text: str, original_query: str) -> QueryPlan:
         """LLM 응답에서 QueryPlan을 파싱한다."""
         try:
-            # JSON 블록 추출
-            text = response_text.strip()
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0].strip()
-            elif "```" in text:
-                text = text.split("```")[1].split("```")[0].strip()
-
-            data = json.loads(text)
-            plan = QueryPlan(
-                intent=data.get("intent", ""),
-                keywords=data.get("keywords", []),
-                search_queries=data.get("search_queries", [original_query]),
-                strategy=data.get("strategy", "SINGLE"),
-            )
-
-            # 빈 search_queries 방어
-            if not plan.search_queries:
-                plan.search_queries = [original_query]
-
-            return plan
-
-        except (json.JSONDecodeError, KeyError, IndexError):
+            return plan_from_data(extract_json(response_text), original_query)
+        except (json.JSONDecodeError, KeyError, IndexError, AttributeError):
             # 파싱 실패 시 원본 쿼리를 그대로 사용
-            return QueryPlan(
-                intent=original_query,
-                keywords=[],
-                search_queries=[original_query],
-                strategy="SINGLE",
-            )
+            return fallback_plan(original_query)
+
+
+class RoutePlanner:
+    """라우팅과 검색 계획을 LLM 호출 한 번으로 수행한다.
+
+    router의 로컬 분류기가 확신하면 그 라우트를 쓰고 (CHITCHAT이면 LLM 호출 없음,
+    그 외에는 QueryPlanner 한 번), 아니면 통합 프롬프트로 라우트와 계획을 함께 받는다.
+    """
+
+    VALID_ROUTES = {"INTERNAL_SEARCH", "WEB_SEARCH", "CHITCHAT"}
+
+    def __init__(self, llm: OllamaAdapter, router=None):
+        self.llm = llm
+        self.router = router  # FastRouter를 가진 Router (선택)
+        self.planner = QueryPlanner(llm)
+
+    def route_and_plan(
+        self,
+        query: str,
+        conversation_history: list | None = None,
+    ) -> tuple[str, QueryPlan | None]:
+        """(라우트, 검색 계획)을 반환한다. CHITCHAT이면 계획은 None."""
+        route = self.router.fast_classify(query) if self.router else None
+        if route == "CHITCHAT":
+            return route, None
+        if route:
+            return route, self.planner.plan(query, route, conversation_history)
+        if self.router:
+            self.router.llm_calls += 1  # 통합 프롬프트가 LLM 분류를 겸한다
+
+        history_context = format_history(conversation_history)
+        user_message = ""
+        if history_context:
+            user_message += f"## 대화 히스토리\n{history_context}\n\n"
+        user_message += f"## 사용자 질문\n{query}"
+
+        response = self.llm.chat(
+            messages=[
+                {"role": "system", "content": ROUTE_AND_PLAN_PROMPT},
+                {"role": "user", "content": user_message},
+            ],
+            cache_stage="route_planner",
+        )
+        return self._parse(response.content, query)
+
+    def _parse(self, response_text: str, original_query: str) -> tuple[str, QueryPlan | None]:
+        try:
+            data = extract_json(response_text)
+            route = str(data.get("route", "")).strip().upper()
+            if route not in self.VALID_ROUTES:
+                route = "INTERNAL_SEARCH"  # 폴백
+            if route == "CHITCHAT":
+                return route, None
+            return route, plan_from_data(data, original_query)
+        except (json.JSONDecodeError, KeyError, IndexError, AttributeError):
+            # JSON이 아니면 응답에서 라우트 단어만 찾고 원본 쿼리로 검색
+            for word in response_text.upper().split():
+                if word in self.VALID_ROUTES:
+                    route = word
+                    break
+            else:
+                route = "INTERNAL_SEARCH"
+            return route, None if route == "CHITCHAT" else fallback_plan(original_query)
+
+
+def format_history(conversation_history: list | None) -> str:
+    """최근 3턴의 대화를 프롬프트용 텍스트로 만든다."""
+    if not conversation_history:
+        return ""
+    recent = conversation_history[-6:]  # 최근 3턴
+    return "\n".join(
+        f"{'사용자' if m['role'] == 'user' else '어시스턴트'}: {m['content'][:200]}"
+        for m in recent
+    )
+
+
+def extract_json(response_text: str) -> dict:
+    """LLM 응답에서 JSON 객체를 추출한다 (```json 블록 허용)."""
+    text = response_text.strip()
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0].strip()
+    elif "```" in text:
+        text = text.split("```")[1].split("```")[0].strip()
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise json.JSONDecodeError("JSON 객체가 아닙니다", text, 0)
+    return data
+
+
+def plan_from_data(data: dict, original_query: str) -> QueryPlan:
+    plan = QueryPlan(
+        intent=data.get("intent", ""),
+        keywords=data.get("keywords", []),
+        search_queries=data.get("search_queries", [original_query]),
+        strategy=data.get("strategy", "SINGLE"),
+    )
+
+    # 빈 search_queries 방어
+    if not plan.search_queries:
+        plan.search_queries = [original_query]
+
+    return plan
+
+
+def fallback_plan(original_query: str) -> QueryPlan:
+    """파싱 실패 시 원본 쿼리를 그대로 사용하는 계획."""
+    return QueryPlan(
+        intent=original_query,
+        keywords=[],
+        search_queries=[original_query],
+        strategy="SINGLE",
+    )
@@ -16,3 +16,64 @@ ROUTER_PROMPT = """당신은 사용자 질문을 분류하는 라우터입니다
 ## 출력 형식
 
 카테고리_이름"""
+
+
+# FastRouter 기본 학습 예시 (ROUTER_EXAMPLES_PATH로 교체 가능)
+ROUTER_EXAMPLES = {
+    "CHITCHAT": [
+        "안녕",
+        "안녕하세요",
+        "하이",
+        "ㅎㅇ",
+        "반가워",
+        "반갑습니다",
+        "고마워",
+        "고맙습니다",
+        "감사합니다",
+        "감사해요",
+        "수고하세요",
+        "잘 있어",
+        "좋은 하루 보내",
+        "너는 누구야?",
+        "이름이 뭐야?",
+        "뭐 할 수 있어?",
+        "ㅋㅋㅋ",
+        "hello",
+        "hi",
+        "thanks",
+    ],
+    "INTERNAL_SEARCH": [
+        "연차 휴가 신청 방법 알려줘",
+        "휴가 며칠 쓸 수 있어?",
+        "출장비 정산 절차가 어떻게 돼?",
+        "경비 처리 규정 알려줘",
+        "재택근무 신청은 어떻게 해?",
+        "신입사원 온보딩 일정",
+        "사내 보안 정책이 뭐야?",
+        "복리후생 제도 알려줘",
+        "인사 평가 기준",
+        "회사 조직도 어디서 봐?",
+        "법인카드 사용 규정",
+        "회의실 예약 방법",
+        "사내 메신저 사용 가이드",
+        "육아휴직 신청 절차",
+        "업무 보고서 작성 양식",
+    ],
+    "WEB_SEARCH": [
+        "오늘 서울 날씨 어때?",
+        "내일 날씨 알려줘",
+        "오늘 주가 알려줘",
+        "삼성전자 주가",
+        "원달러 환율",
+        "오늘 뉴스 알려줘",
+        "최신 AI 뉴스",
+        "파이썬 최신 버전이 뭐야?",
+        "이번 주 경기 결과",
+        "비트코인 시세",
+        "요즘 인기 있는 영화",
+        "최신 기술 동향",
+        "현재 유가",
+        "미국 금리 발표",
+        "오늘 코스피 지수",
+    ],
+}
@@ -8,16 +8,114 @@
 5. Parent Lookup: Child 매칭 → Parent 컨텍스트 확장
 """
 
+import heapq
 import json
 import math
 import os
 import re
+import shutil
 import sys
+import threading
+import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from src import tracing
+
 os.environ["ANONYMIZED_TELEMETRY"] = "False"
 
 
+# 디스크 BM25 인덱스 (ingest가 쓰고 retriever가 memory-map으로 읽는다)
+BM25_INDEX_DIRNAME = "bm25"
+BM25_INDEX_FORMAT = 3
+BM25_INDEX_POINTER = "CURRENT"  # 현재 버전 디렉토리 이름을 담은 포인터 파일
+_BM25_ARRAYS = ("term_offsets", "post_doc_ids", "post_tfs", "term_idf", "doc_lengths", "doc_norms")
+
+
+def bm25_index_path(chroma_dir: str) -> str:
+    """Chroma 저장소에 대응하는 BM25 인덱스 디렉토리 경로."""
+    return os.path.join(chroma_dir, BM25_INDEX_DIRNAME)
+
+
+# 코퍼스 세대 마커 (ingest가 끝날 때마다 새 값으로 갱신, retriever 캐시 무효화 기준)
+CORPUS_GENERATION_FILENAME = "generation"
+PARENT_CACHE_SIZE = int(os.getenv("PARENT_CACHE_SIZE", "2048"))
+
+
+def corpus_generation_path(chroma_dir: str) -> str:
+    """Chroma 저장소에 대응하는 세대 마커 파일 경로."""
+    return os.path.join(chroma_dir, CORPUS_GENERATION_FILENAME)
+
+
+def read_corpus_generation(chroma_dir: str) -> str | None:
+    """현재 코퍼스 세대를 읽는다 (마커가 없으면 None)."""
+    try:
+        with open(corpus_generation_path(chroma_dir), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def new_corpus_generation() -> str:
+    """새 코퍼스 세대 값을 만든다."""
+    return uuid.uuid4().hex
+
+
+def write_corpus_generation(chroma_dir: str, generation: str | None = None) -> str:
+    """코퍼스 세대를 기록하고 그 값을 반환한다 (generation이 없으면 새로 만든다)."""
+    generation = generation or new_corpus_generation()
+    path = corpus_generation_path(chroma_dir)
+    os.makedirs(chroma_dir, exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(generation)
+    os.replace(path + ".tmp", path)
+    return generation
+
+
+class LRUCache:
+    """스레드 안전한 크기 제한 LRU 캐시."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys) -> dict:
+        """존재하는 키의 값을 반환하고 최근 사용으로 갱신한다."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    found[key] = self._data[key]
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, items: dict):
+        """값을 저장하고, maxsize를 넘으면 가장 오래된 항목부터 버린다."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            for key, value in items.items():
+                self._data[key] = value
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
 class _NoOpEF:
     """chromadb 기본 EF(onnx 다운로드)를 방지하는 더미.
 
@@ -56,7 +154,11 @@ class RetrievalResult:
 
 
 class BM25:
-    """순수 Python BM25 구현 (한국어 바이그램 지원)."""
+    """순수 Python BM25 구현 (한국어 바이그램 지원).
+
+    토큰 → [(문서 인덱스, tf), ...] 역색인(postings)을 유지하여
+    검색 시 쿼리 토큰을 포함한 문서만 스코어링한다.
+    """
 
     def __init__(self, k1: float = 1.5, b: float = 0.75):
         self.k1 = k1
@@ -64,19 +166,22 @@ class BM25:
         self.doc_count = 0
         self.avg_dl = 0.0
         self.doc_lengths: list[int] = []
-        self.term_freqs: list[dict[str, int]] = []
+        self.postings: dict[str, list[tuple[int, int]]] = {}
         self.doc_freq: dict[str, int] = {}
+        self.idf: dict[str, float] = {}
         self.documents: list[dict] = []
         self.doc_ids: list[str] = []
 
     def index(self, documents: list[dict]):
-        """문서 목록을 BM25 인덱스에 추가한다."""
+        """문서 목록으로 BM25 역색인을 구축한다."""
         self.documents = documents
         self.doc_ids = [d.get("id", str(i)) for i, d in enumerate(documents)]
         self.doc_count = len(documents)
+        self.doc_lengths = []
+        self.postings = {}
 
         total_length = 0
-        for doc in documents:
+        for doc_idx, doc in enumerate(documents):
             # keywords 메타데이터 또는 본문에서 토큰 추출
             text = doc.get("keywords", "") + " " + doc.get("content", "")
             tokens = self._tokenize(text)
@@ -86,36 +191,50 @@ class BM25:
             tf = {}
             for token in tokens:
                 tf[token] = tf.get(token, 0) + 1
-            self.term_freqs.append(tf)
-
-            for token in set(tokens):
-                self.doc_freq[token] = self.doc_freq.get(token, 0) + 1
+            for token, freq in tf.items():
+                self.postings.setdefault(token, []).append((doc_idx, freq))
 
         self.avg_dl = total_length / max(self.doc_count, 1)
+        self.doc_freq = {token: len(plist) for token, plist in self.postings.items()}
+        self.idf = {
+            token: math.log((self.doc_count - df + 0.5) / (df + 0.5) + 1)
+            for token, df in self.doc_freq.items()
+        }
 
     def search(self, query: str, top_k: int = 10) -> list[tuple[int, float]]:
-        """쿼리에 대해 BM25 스코어가 높은 문서 인덱스를 반환한다."""
-        query_tokens = self._tokenize(query)
-        scores = []
+        """쿼리에 대해 BM25 스코어가 높은 문서 인덱스를 반환한다.
 
-        for i in range(self.doc_count):
-            score = 0.0
-            dl = self.doc_lengths[i]
+        쿼리 토큰의 postings에 등장한 문서만 스코어링한다. 매칭 문서가
+        top_k보다 적으면 기존 전체 스캔 결과와 같도록 0점 문서로 채운다.
+        """
+        if self.doc_count == 0 or top_k <= 0:
+            return []
 
-            for token in query_tokens:
-                if token not in self.term_freqs[i]:
-                    continue
-                tf = self.term_freqs[i][token]
-                df = self.doc_freq.get(token, 0)
-                idf = math.log((self.doc_count - df + 0.5) / (df + 0.5) + 1)
+        avg_dl = max(self.avg_dl, 1)
+        scores: dict[int, float] = {}
+
+        for token in self._tokenize(query):
+            plist = self.postings.get(token)
+            if not plist:
+                continue
+            idf = self.idf[token]
+            for doc_idx, tf in plist:
+                dl = self.doc_lengths[doc_idx]
                 numerator = tf * (self.k1 + 1)
-                denominator = tf + self.k1 * (1 - self.b + self.b * dl / max(self.avg_dl, 1))
-                score += idf * numerator / denominator
+                denominator = tf + self.k1 * (1 - self.b + self.b * dl / avg_dl)
+                scores[doc_idx] = scores.get(doc_idx, 0.0) + idf * numerator / denominator
 
-            scores.append((i, score))
+        # 동점은 문서 인덱스 오름차순 (전체 정렬 결과와 동일한 순서)
+        top = heapq.nsmallest(top_k, scores.items(), key=lambda x: (-x[1], x[0]))
 
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores[:top_k]
+        if len(top) < top_k:
+            for doc_idx in range(self.doc_count):
+                if doc_idx not in scores:
+                    top.append((doc_idx, 0.0))
+                    if len(top) >= top_k:
+                        break
+
+        return top
 
     def _tokenize(self, text: str) -> list[str]:
         """한국어 + 영어 토큰 추출 (한국어 바이그램 포함).
@@ -136,6 +255,292 @@ class BM25:
         return tokens
 
 
+class NumpyBM25(BM25):
+    """NumPy 배열 기반 BM25 (BM25와 동일한 index()/search() 인터페이스).
+
+    postings를 CSR 형태의 연속 배열로 보관한다.
+    - term_offsets[t]:term_offsets[t+1] 구간이 토큰 t의 postings
+    - post_doc_ids(int32), post_tfs(float32)
+    - doc_norms(float32): 문서별 k1 * (1 - b + b * dl / avg_dl) 사전 계산값
+    검색은 dense 스코어 배열에 벡터 누적 후 argpartition으로 top_k만 고른다.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        super().__init__(k1=k1, b=b)
+        self.vocab: dict[str, int] = {}
+        self.doc_lengths = np.zeros(0, dtype=np.int32)
+        self.term_offsets = np.zeros(1, dtype=np.int64)
+        self.post_doc_ids = np.zeros(0, dtype=np.int32)
+        self.post_tfs = np.zeros(0, dtype=np.float32)
+        self.term_idf = np.zeros(0, dtype=np.float32)
+        self.doc_norms = np.zeros(0, dtype=np.float32)
+        self.generation: str | None = None  # 디스크 인덱스를 만든 코퍼스 세대
+
+    def index(self, documents: list[dict]):
+        """문서 목록으로 배열 기반 postings를 구축한다."""
+        builder = BM25Builder(self)
+        builder.add(documents)
+        builder.build()
+        self.documents = documents
+
+    def update(self, documents: list[dict], remove_ids=()):
+        """기존 인덱스에서 문서를 제거/추가한다 (전체 재토큰화 없이).
+
+        remove_ids에 해당하는 문서의 postings를 걸러내고, documents만 토큰화하여
+        병합한다. idf/평균 길이/길이 정규화는 갱신된 통계로 다시 계산한다.
+        결과는 (남은 문서 + 추가 문서) 순서로 index()를 호출한 것과 같다.
+        """
+        builder = BM25Builder.from_index(self, remove_ids=remove_ids)
+        builder.add(documents)
+        builder.build()
+
+    def _set_postings(self, term_ids, doc_idx, tfs, tokens: list[str], doc_lengths):
+        """(토큰, 문서, tf) 평탄 배열로 CSR postings와 통계를 구성한다.
+
+        postings가 없는 토큰은 어휘에서 제외하고, 각 토큰의 postings는
+        문서 인덱스 오름차순으로 정렬한다.
+        """
+        counts = np.bincount(term_ids, minlength=len(tokens))
+        live = counts > 0
+        remap = (np.cumsum(live) - 1).astype(np.int64)
+        term_ids = remap[term_ids]
+        tokens = [token for token, alive in zip(tokens, live) if alive]
+        counts = counts[live]
+
+        order = np.lexsort((doc_idx, term_ids))
+        self.post_doc_ids = doc_idx[order].astype(np.int32)
+        self.post_tfs = tfs[order].astype(np.float32)
+        self.term_offsets = np.zeros(len(tokens) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.term_offsets[1:])
+        self.vocab = {token: i for i, token in enumerate(tokens)}
+
+        self.doc_lengths = doc_lengths.astype(np.int32)
+        self.doc_count = len(self.doc_lengths)
+        self.avg_dl = float(self.doc_lengths.sum()) / max(self.doc_count, 1)
+
+        df = counts.astype(np.float64)
+        self.term_idf = np.log((self.doc_count - df + 0.5) / (df + 0.5) + 1).astype(np.float32)
+        dl = self.doc_lengths.astype(np.float32)
+        self.doc_norms = (
+            self.k1 * (1 - self.b + self.b * dl / max(self.avg_dl, 1))
+        ).astype(np.float32)
+
+    def search(self, query: str, top_k: int = 10) -> list[tuple[int, float]]:
+        """벡터화된 BM25 스코어링 후 상위 top_k 문서를 반환한다.
+
+        결과 순서는 BM25.search와 같다 (스코어 내림차순, 동점은 인덱스 오름차순,
+        매칭 문서가 부족하면 0점 문서로 채움).
+        """
+        if self.doc_count == 0 or top_k <= 0:
+            return []
+
+        scores = np.zeros(self.doc_count, dtype=np.float32)
+        k1_plus_1 = np.float32(self.k1 + 1)
+
+        for token in self._tokenize(query):
+            term_id = self.vocab.get(token)
+            if term_id is None:
+                continue
+            start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+            doc_ids = self.post_doc_ids[start:end]
+            tfs = self.post_tfs[start:end]
+            # 한 토큰의 postings 안에서 doc_id는 중복되지 않으므로 fancy index 누적이 안전하다
+            scores[doc_ids] += self.term_idf[term_id] * tfs * k1_plus_1 / (tfs + self.doc_norms[doc_ids])
+
+        k = min(top_k, self.doc_count)
+        matched = np.flatnonzero(scores > 0)
+
+        if len(matched) > k:
+            part = np.argpartition(-scores[matched], k - 1)[:k]
+            top_ids = matched[part]
+        else:
+            top_ids = matched
+
+        # 스코어 내림차순, 동점은 인덱스 오름차순
+        top_ids = top_ids[np.lexsort((top_ids, -scores[top_ids]))]
+        results = [(int(i), float(scores[i])) for i in top_ids]
+
+        if len(results) < k:
+            for doc_idx in range(self.doc_count):
+                if scores[doc_idx] == 0:
+                    results.append((doc_idx, 0.0))
+                    if len(results) >= k:
+                        break
+
+        return results
+
+    def save(self, index_dir: str, generation: str | None = None):
+        """인덱스를 index_dir 아래 새 버전 디렉토리에 저장한다 (배열은 .npy, 어휘/ID 테이블은 JSON).
+
+        버전 디렉토리를 다 쓴 뒤 CURRENT 포인터 파일만 원자적으로 교체하므로,
+        실행 중인 서버가 memory-map으로 열어 둔 이전 버전은 건드리지 않는다.
+        이전 버전은 가능한 경우에만 지운다 (열려 있어 삭제가 실패하면 다음 저장 때 다시 시도).
+        """
+        index_dir = os.path.abspath(index_dir)
+        version = generation or uuid.uuid4().hex
+        version_dir = os.path.join(index_dir, version)
+        shutil.rmtree(version_dir, ignore_errors=True)
+        os.makedirs(version_dir)
+
+        for name in _BM25_ARRAYS:
+            np.save(os.path.join(version_dir, f"{name}.npy"), np.ascontiguousarray(getattr(self, name)))
+
+        vocab = sorted(self.vocab, key=self.vocab.get)
+        meta = {
+            "format": BM25_INDEX_FORMAT,
+            "generation": generation,
+            "k1": self.k1,
+            "b": self.b,
+            "doc_count": self.doc_count,
+            "avg_dl": self.avg_dl,
+            "vocab": vocab,
+            "doc_ids": self.doc_ids,
+        }
+        with open(os.path.join(version_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        pointer = os.path.join(index_dir, BM25_INDEX_POINTER)
+        with open(pointer + ".tmp", "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(pointer + ".tmp", pointer)
+        self.generation = generation
+
+        for name in os.listdir(index_dir):
+            path = os.path.join(index_dir, name)
+            if name in (version, BM25_INDEX_POINTER):
+                continue
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    @classmethod
+    def load(cls, index_dir: str, mmap: bool = True) -> "NumpyBM25":
+        """save()로 저장한 인덱스 중 CURRENT가 가리키는 버전을 읽는다.
+
+        mmap=True면 배열을 읽기 전용 memory-map으로 열어 로딩 비용이 거의 없고,
+        여러 서버 프로세스가 같은 페이지 캐시를 공유한다.
+        """
+        with open(os.path.join(index_dir, BM25_INDEX_POINTER), "r", encoding="utf-8") as f:
+            version_dir = os.path.join(index_dir, f.read().strip())
+        with open(os.path.join(version_dir, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format") != BM25_INDEX_FORMAT:
+            raise ValueError(f"지원하지 않는 BM25 인덱스 형식: {meta.get('format')}")
+
+        bm25 = cls(k1=meta["k1"], b=meta["b"])
+        bm25.generation = meta.get("generation")
+        bm25.doc_count = meta["doc_count"]
+        bm25.avg_dl = meta["avg_dl"]
+        bm25.doc_ids = meta["doc_ids"]
+        bm25.vocab = {token: i for i, token in enumerate(meta["vocab"])}
+
+        mmap_mode = "r" if mmap else None
+        for name in _BM25_ARRAYS:
+            setattr(bm25, name, np.load(os.path.join(version_dir, f"{name}.npy"), mmap_mode=mmap_mode))
+        return bm25
+
+
+class BM25Builder:
+    """NumpyBM25를 문서 묶음 단위로 점진 구축한다.
+
+    add()로 들어온 문서는 바로 토큰화하여 (토큰, 문서, tf) 배열로만 보관하므로
+    원문을 모아둘 필요가 없다. build()에서 한 번에 CSR postings로 정리한다.
+    """
+
+    def __init__(self, target: NumpyBM25 | None = None):
+        self.target = target if target is not None else NumpyBM25()
+        self.tokens: list[str] = []
+        self.vocab: dict[str, int] = {}
+        self.doc_ids: list[str] = []
+        self._parts: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._lengths: list[np.ndarray] = []
+
+    @classmethod
+    def from_index(cls, bm25: NumpyBM25, remove_ids=()) -> "BM25Builder":
+        """기존 인덱스에서 remove_ids를 뺀 나머지로 시작하는 빌더."""
+        builder = cls(bm25)
+        remove_ids = set(remove_ids)
+        keep = np.array([doc_id not in remove_ids for doc_id in bm25.doc_ids], dtype=bool)
+        new_position = (np.cumsum(keep) - 1).astype(np.int32)
+
+        builder.tokens = sorted(bm25.vocab, key=bm25.vocab.get)
+        builder.vocab = dict(bm25.vocab)
+        builder.doc_ids = [doc_id for doc_id, k in zip(bm25.doc_ids, keep) if k]
+
+        post_terms = np.repeat(
+            np.arange(len(builder.tokens), dtype=np.int64), np.diff(bm25.term_offsets),
+        )
+        post_keep = keep[bm25.post_doc_ids]
+        builder._parts.append((
+            post_terms[post_keep],
+            new_position[bm25.post_doc_ids[post_keep]],
+            np.asarray(bm25.post_tfs[post_keep], dtype=np.float32),
+        ))
+        builder._lengths.append(np.asarray(bm25.doc_lengths, dtype=np.int32)[keep])
+        return builder
+
+    def add(self, documents: list[dict]):
+        """문서 묶음을 토큰화하여 postings 버퍼에 추가한다."""
+        base = len(self.doc_ids)
+        term_ids, doc_idx, tfs, lengths = [], [], [], []
+        for j, doc in enumerate(documents):
+            text = doc.get("keywords", "") + " " + doc.get("content", "")
+            tokens = self.target._tokenize(text)
+            lengths.append(len(tokens))
+
+            tf = {}
+            for token in tokens:
+                tf[token] = tf.get(token, 0) + 1
+            for token, freq in tf.items():
+                term_id = self.vocab.get(token)
+                if term_id is None:
+                    term_id = self.vocab[token] = len(self.tokens)
+                    self.tokens.append(token)
+                term_ids.append(term_id)
+                doc_idx.append(base + j)
+                tfs.append(freq)
+            self.doc_ids.append(doc.get("id", str(base + j)))
+
+        self._parts.append((
+            np.asarray(term_ids, dtype=np.int64),
+            np.asarray(doc_idx, dtype=np.int32),
+            np.asarray(tfs, dtype=np.float32),
+        ))
+        self._lengths.append(np.asarray(lengths, dtype=np.int32))
+
+    def build(self) -> NumpyBM25:
+        """버퍼를 CSR postings로 정리하여 대상 인덱스에 반영한다."""
+        bm25 = self.target
+        bm25.doc_ids = self.doc_ids
+        bm25.documents = []
+        bm25._set_postings(
+            np.concatenate([p[0] for p in self._parts] or [np.zeros(0, dtype=np.int64)]),
+            np.concatenate([p[1] for p in self._parts] or [np.zeros(0, dtype=np.int32)]),
+            np.concatenate([p[2] for p in self._parts] or [np.zeros(0, dtype=np.float32)]),
+            self.tokens,
+            np.concatenate(self._lengths or [np.zeros(0, dtype=np.int32)]),
+        )
+        return bm25
+
+
+BM25_BACKENDS = {
+    "python": BM25,
+    "numpy": NumpyBM25,
+}
+
+
+def make_bm25(backend: str = "python", **kwargs) -> BM25:
+    """이름으로 BM25 구현을 생성한다 ("python" | "numpy")."""
+    try:
+        return BM25_BACKENDS[backend](**kwargs)
+    except KeyError:
+        raise ValueError(f"알 수 없는 BM25 백엔드: {backend}") from None
+
+
 def reciprocal_rank_fusion(
     vector_results: list[tuple[int, float]],
     bm25_results: list[tuple[int, float]],
@@ -160,15 +565,26 @@ def reciprocal_rank_fusion(
 class AdvancedRetriever:
     """Hybrid Search + RRF + Parent Lookup + Optional LLM Reranking."""
 
-    def __init__(self, chroma_client, embedder, llm=None, verbose=False):
+    def __init__(
+        self, chroma_client, embedder, llm=None, verbose=False,
+        bm25_backend="python", bm25_index_dir=None,
+        corpus_dir=None, parent_cache_size=PARENT_CACHE_SIZE,
+    ):
         self.chroma = chroma_client
         self.embedder = embedder
         self.llm = llm  # Optional: LLM reranking용
         self.verbose = verbose
-        self.bm25 = BM25()
+        self.bm25_backend = bm25_backend
+        self.bm25 = make_bm25(bm25_backend)
+        self.bm25_index_dir = bm25_index_dir  # ingest가 저장한 디스크 인덱스 (있으면 우선 사용)
         self._bm25_indexed = False
         self._bm25_original_docs: list[str] = []
         self._bm25_original_metas: list[dict] = []
+        self.corpus_dir = corpus_dir  # 세대 마커 위치 (보통 Chroma 저장소 경로)
+        self._generation: str | None = None
+        self._parent_cache = LRUCache(parent_cache_size)
+        self._collections = None  # (children, parents) 핸들, 세대가 바뀔 때만 다시 연다
+        self._state_lock = threading.RLock()  # 컬렉션/BM25 (재)로딩 보호
 
     def _log(self, msg: str):
         """verbose 모드일 때 디버그 로그를 stderr로 출력한다."""
@@ -181,160 +597,336 @@ class AdvancedRetriever:
         top_k: int = 5,
         use_reranking: bool = False,
     ) -> list[RetrievalResult]:
-        """Advanced Hybrid Search를 수행한다."""
-        try:
-            children_col = self.chroma.get_collection(
-                "children", embedding_function=_noop_ef,
-            )
-            parents_col = self.chroma.get_collection(
-                "parents", embedding_function=_noop_ef,
-            )
-        except Exception as e:
-            print(f"  [Retriever] 컬렉션 로딩 실패: {e}", file=sys.stderr)
+        """Advanced Hybrid Search를 수행한다.
+
+        여러 스레드에서 동시에 호출할 수 있다. 세대 확인, 컬렉션/BM25 로딩만
+        lock 안에서 수행하고, 검색 자체는 그 시점의 인덱스를 고정해 사용한다.
+        """
+        return self._search([query], top_k, use_reranking, batch=False)[0]
+
+    def search_batch(
+        self,
+        queries: list[str],
+        top_k: int = 5,
+        use_reranking: bool = False,
+    ) -> list[list[RetrievalResult]]:
+        """여러 쿼리를 한 번에 검색하여 쿼리별 결과를 반환한다.
+
+        임베딩 요청 1회, Chroma 벡터 검색 1회, Parent 조회 1회로 처리하고
+        BM25와 RRF는 쿼리마다 수행한다.
+        """
+        if not queries:
             return []
+        return self._search(list(queries), top_k, use_reranking, batch=True)
 
-        # BM25 인덱스 구축 (최초 1회)
-        if not self._bm25_indexed:
-            self._build_bm25_index(children_col)
+    def _search(
+        self, queries: list[str], top_k: int, use_reranking: bool, batch: bool,
+    ) -> list[list[RetrievalResult]]:
+        with self._state_lock:
+            self._sync_generation()
+
+            try:
+                children_col, parents_col = self._get_collections()
+            except Exception as e:
+                print(f"  [Retriever] 컬렉션 로딩 실패: {e}", file=sys.stderr)
+                return [[] for _ in queries]
+
+            # BM25 인덱스 구축 (세대마다 1회)
+            if not self._bm25_indexed:
+                with tracing.span("retriever.bm25_build"):
+                    self._build_bm25_index(children_col)
+
+            bm25 = self.bm25
+            originals = (self._bm25_original_docs, self._bm25_original_metas)
+            generation = self._generation
 
         # 검색 후보 수 (RRF 합산 전) — 더 넓은 후보군 확보
         candidate_k = min(top_k * 4, 20)
 
+        # 1. Vector Search (쿼리 전체를 한 번에 임베딩/조회)
+        with tracing.span("retriever.embedding", queries=len(queries)):
+            if batch:
+                query_embeddings = self.embedder.encode(queries).tolist()
+            else:
+                query_embeddings = [self.embedder.encode(queries[0]).tolist()]
+        with tracing.span("retriever.chroma_query", n_results=candidate_k):
+            vector_raw = children_col.query(
+                query_embeddings=query_embeddings,
+                n_results=candidate_k,
+            )
+
+        # 2~3. 쿼리별 BM25 + RRF 후 Parent 중복 제거
+        candidates = [
+            self._fuse(query, qi, vector_raw, bm25, originals, children_col, top_k, candidate_k)
+            for qi, query in enumerate(queries)
+        ]
+
+        # 4. Parent 원본 텍스트: 모든 쿼리의 Parent를 캐시 + 한 번의 일괄 조회로
+        parent_ids = list(dict.fromkeys(
+            parent_id for _, selected in candidates for _, _, parent_id in selected if parent_id
+        ))
+        with tracing.span("retriever.parent_lookup", parents=len(parent_ids)):
+            parent_texts = self._get_parents(parents_col, parent_ids, generation)
+
+        all_results = []
+        for query, (id_to_data, selected) in zip(queries, candidates):
+            results = []
+            for doc_id, rrf_score, parent_id in selected:
+                data = id_to_data[doc_id]
+                results.append(RetrievalResult(
+                    content=data["content"],
+                    parent_content=parent_texts.get(parent_id, data["content"]),  # fallback: Child
+                    metadata=data["metadata"],
+                    distance=data["distance"],
+                    rrf_score=rrf_score,
+                ))
+
+            self._log(f"--- 최종 반환: {len(results)}건 (Parent 중복 제거 후) ---")
+            for i, r in enumerate(results):
+                preview = r.parent_content[:60].replace("\n", " ")
+                self._log(f"  [{i+1}] parent_id={r.metadata.get('parent_id', '?')} rrf={r.rrf_score:.4f} dist={r.distance:.4f} | {preview}...")
+
+            # 5. Optional LLM Reranking
+            if use_reranking and self.llm and results:
+                results = self._llm_rerank(query, results)
+            all_results.append(results)
+
+        return all_results
+
+    def _fuse(self, query, qi, vector_raw, bm25, originals, children_col, top_k, candidate_k):
+        """쿼리 하나의 벡터/BM25 결과를 RRF로 합치고 Parent 기준 상위 top_k를 고른다.
+
+        Returns:
+            (id_to_data, [(doc_id, rrf_score, parent_id), ...])
+        """
+        original_docs, original_metas = originals
         self._log(f"쿼리: '{query}' (top_k={top_k}, candidate_k={candidate_k})")
 
-        # 1. Vector Search
-        query_embedding = self.embedder.encode(query).tolist()
-        vector_raw = children_col.query(
-            query_embeddings=[query_embedding],
-            n_results=candidate_k,
-        )
-        vector_ids = vector_raw["ids"][0] if vector_raw["ids"] else []
-        vector_distances = vector_raw["distances"][0] if vector_raw.get("distances") else []
+        vector_ids = vector_raw["ids"][qi] if vector_raw["ids"] else []
+        vector_distances = vector_raw["distances"][qi] if vector_raw.get("distances") else []
+        vector_docs = vector_raw["documents"][qi] if vector_raw.get("documents") else []
 
         self._log(f"--- Vector Search 결과: {len(vector_ids)}건 ---")
         for i, vid in enumerate(vector_ids):
             dist = vector_distances[i] if i < len(vector_distances) else "?"
-            preview = vector_raw["documents"][0][i][:60].replace("\n", " ") if vector_raw["documents"][0] else ""
+            preview = vector_docs[i][:60].replace("\n", " ") if vector_docs else ""
             self._log(f"  V[{i+1}] id={vid} distance={dist:.4f} | {preview}...")
 
         # ID → data 매핑
         id_to_data = {}
         for i, doc_id in enumerate(vector_ids):
             id_to_data[doc_id] = {
-                "content": vector_raw["documents"][0][i],
-                "metadata": vector_raw["metadatas"][0][i],
+                "content": vector_docs[i],
+                "metadata": vector_raw["metadatas"][qi][i],
                 "distance": vector_distances[i] if i < len(vector_distances) else 1.0,
             }
 
         # 2. BM25 Search
-        bm25_results = self.bm25.search(query, top_k=candidate_k)
+        with tracing.span("retriever.bm25"):
+            bm25_results = bm25.search(query, top_k=candidate_k)
 
         self._log(f"--- BM25 Search 결과: {len(bm25_results)}건 ---")
         for rank, (doc_idx, score) in enumerate(bm25_results[:10]):
-            doc_id = self.bm25.doc_ids[doc_idx] if doc_idx < len(self.bm25.doc_ids) else "?"
+            doc_id = bm25.doc_ids[doc_idx] if doc_idx < len(bm25.doc_ids) else "?"
             self._log(f"  B[{rank+1}] id={doc_id} score={score:.4f}")
 
         # BM25 결과의 ID를 저장된 인덱스에서 직접 매핑 (매 검색마다 전체 로드 제거)
         bm25_id_map = {}
+        bm25_only_ids = []
         for rank_idx, (doc_idx, score) in enumerate(bm25_results):
-            if doc_idx < len(self.bm25.doc_ids):
-                bm25_doc_id = self.bm25.doc_ids[doc_idx]
+            if doc_idx < len(bm25.doc_ids):
+                bm25_doc_id = bm25.doc_ids[doc_idx]
                 bm25_id_map[doc_idx] = bm25_doc_id
-                if bm25_doc_id not in id_to_data:
-                    # BM25에서만 나온 결과도 수집
+                if bm25_doc_id in id_to_data:
+                    continue
+                # BM25에서만 나온 결과도 수집
+                if doc_idx < len(original_docs):
                     id_to_data[bm25_doc_id] = {
-                        "content": self._bm25_original_docs[doc_idx],
-                        "metadata": self._bm25_original_metas[doc_idx],
+                        "content": original_docs[doc_idx],
+                        "metadata": original_metas[doc_idx],
                         "distance": 0.5,  # BM25 전용은 distance 없음
                     }
+                else:
+                    bm25_only_ids.append(bm25_doc_id)
+
+        # 디스크 인덱스는 원문을 들고 있지 않으므로 BM25 전용 결과만 한 번에 조회
+        if bm25_only_ids:
+            self._fetch_children(children_col, bm25_only_ids, id_to_data)
 
         # 3. RRF 합산 — 통합 인덱스 기반
-        unified_vector = []
-        for i, doc_id in enumerate(vector_ids):
-            unified_vector.append((doc_id, 1.0 - id_to_data[doc_id]["distance"]))
+        with tracing.span("retriever.rrf"):
+            unified_vector = []
+            for i, doc_id in enumerate(vector_ids):
+                unified_vector.append((doc_id, 1.0 - id_to_data[doc_id]["distance"]))
 
-        unified_bm25 = []
-        for doc_idx, score in bm25_results:
-            if doc_idx in bm25_id_map:
-                unified_bm25.append((bm25_id_map[doc_idx], score))
+            unified_bm25 = []
+            for doc_idx, score in bm25_results:
+                if doc_idx in bm25_id_map:
+                    unified_bm25.append((bm25_id_map[doc_idx], score))
 
-        rrf_scores: dict[str, float] = {}
-        k = 60
-        for rank, (doc_id, _) in enumerate(unified_vector):
-            rrf_scores[doc_id] = rrf_scores.get(doc_id, 0) + 1 / (k + rank + 1)
-        for rank, (doc_id, _) in enumerate(unified_bm25):
-            rrf_scores[doc_id] = rrf_scores.get(doc_id, 0) + 1 / (k + rank + 1)
+            rrf_scores: dict[str, float] = {}
+            k = 60
+            for rank, (doc_id, _) in enumerate(unified_vector):
+                rrf_scores[doc_id] = rrf_scores.get(doc_id, 0) + 1 / (k + rank + 1)
+            for rank, (doc_id, _) in enumerate(unified_bm25):
+                rrf_scores[doc_id] = rrf_scores.get(doc_id, 0) + 1 / (k + rank + 1)
 
-        sorted_rrf = sorted(rrf_scores.items(), key=lambda x: x[1], reverse=True)
+            sorted_rrf = sorted(rrf_scores.items(), key=lambda x: x[1], reverse=True)
 
         self._log(f"--- RRF 합산 결과 (상위 {min(top_k * 2, len(sorted_rrf))}건) ---")
         for doc_id, score in sorted_rrf[:top_k * 2]:
             self._log(f"  RRF id={doc_id} score={score:.4f}")
 
-        # 4. 상위 결과 수집 + Parent Lookup
-        results = []
+        # 4. 상위 결과 수집 (Parent Lookup은 호출한 쪽에서 일괄 수행)
+        selected = []
         seen_parents = set()
 
         for doc_id, rrf_score in sorted_rrf[:top_k * 2]:  # 중복 Parent 제거 후 top_k
             if doc_id not in id_to_data:
                 continue
 
-            data = id_to_data[doc_id]
-            parent_id = data["metadata"].get("parent_id", "")
+            parent_id = id_to_data[doc_id]["metadata"].get("parent_id", "")
 
             # 같은 Parent에서 나온 Child 중복 방지
             if parent_id in seen_parents:
                 continue
             seen_parents.add(parent_id)
+            selected.append((doc_id, rrf_score, parent_id))
 
-            # Parent 원본 텍스트 가져오기
-            parent_content = data["content"]  # fallback
-            if parent_id:
-                try:
-                    parent_data = parents_col.get(ids=[parent_id])
-                    if parent_data["documents"]:
-                        parent_content = parent_data["documents"][0]
-                except Exception as e:
-                    print(f"  [Retriever] Parent 조회 실패 (parent_id={parent_id}): {e}", file=sys.stderr)
-
-            results.append(RetrievalResult(
-                content=data["content"],
-                parent_content=parent_content,
-                metadata=data["metadata"],
-                distance=data["distance"],
-                rrf_score=rrf_score,
-            ))
-
-            if len(results) >= top_k:
+            if len(selected) >= top_k:
                 break
 
-        self._log(f"--- 최종 반환: {len(results)}건 (Parent 중복 제거 후) ---")
-        for i, r in enumerate(results):
-            preview = r.parent_content[:60].replace("\n", " ")
-            self._log(f"  [{i+1}] parent_id={r.metadata.get('parent_id', '?')} rrf={r.rrf_score:.4f} dist={r.distance:.4f} | {preview}...")
+        return id_to_data, selected
 
-        # 5. Optional LLM Reranking
-        if use_reranking and self.llm and results:
-            results = self._llm_rerank(query, results)
+    def _get_parents(
+        self, parents_col, parent_ids: list[str], generation: str | None = None,
+    ) -> dict[str, str]:
+        """Parent 원문을 LRU 캐시에서 찾고, 없는 것만 일괄 조회해 캐시에 넣는다.
 
-        return results
+        Parent ID는 재인제스트해도 같으므로 캐시 키에 검색 시작 시점의 세대를 넣는다.
+        조회 도중 세대가 바뀌어도 이전 세대 원문이 새 세대 검색에 쓰이지 않는다.
+        """
+        if not parent_ids:
+            return {}
+        cached = self._parent_cache.get_many([(generation, pid) for pid in parent_ids])
+        found = {pid: text for (_, pid), text in cached.items()}
+        missing = [pid for pid in parent_ids if pid not in found]
+        if missing:
+            try:
+                data = parents_col.get(ids=missing)
+            except Exception as e:
+                print(f"  [Retriever] Parent 조회 실패 ({len(missing)}건): {e}", file=sys.stderr)
+                return found
+            # get()은 요청 순서를 보장하지 않으므로 반환된 ids로 매핑
+            fetched = {
+                pid: doc
+                for pid, doc in zip(data["ids"], data["documents"] or [])
+                if doc is not None
+            }
+            self._parent_cache.put_many({(generation, pid): doc for pid, doc in fetched.items()})
+            found.update(fetched)
+        return found
+
+    def _get_collections(self):
+        """Children/Parents 컬렉션 핸들을 반환한다 (처음 한 번만 연다)."""
+        if self._collections is None:
+            children_col = self.chroma.get_collection(
+                "children", embedding_function=_noop_ef,
+            )
+            parents_col = self.chroma.get_collection(
+                "parents", embedding_function=_noop_ef,
+            )
+            self._collections = (children_col, parents_col)
+        return self._collections
+
+    def _sync_generation(self):
+        """코퍼스 세대가 바뀌었으면 (재인제스트) 컬렉션·BM25·Parent 캐시를 초기화한다."""
+        if not self.corpus_dir:
+            return
+        generation = read_corpus_generation(self.corpus_dir)
+        if generation != self._generation:
+            if self._generation is not None:
+                self._log(f"코퍼스 세대 변경 감지: {self._generation} → {generation}")
+            self.invalidate_caches()
+            self._generation = generation
+
+    def invalidate_caches(self):
+        """컬렉션 핸들, BM25 인덱스, Parent 캐시를 버린다.
+
+        다음 검색에서 컬렉션을 다시 열고 BM25를 디스크에서 재로딩(또는 재구축)한다.
+        """
+        with self._state_lock:
+            self._collections = None
+            self.bm25 = make_bm25(self.bm25_backend)
+            self._bm25_indexed = False
+            self._bm25_original_docs = []
+            self._bm25_original_metas = []
+            self._parent_cache.clear()
+
+    def _fetch_children(self, children_col, ids: list[str], id_to_data: dict):
+        """BM25 전용 결과의 Child 원문/메타데이터를 일괄 조회한다."""
+        try:
+            data = children_col.get(ids=ids)
+        except Exception as e:
+            print(f"  [Retriever] Child 조회 실패: {e}", file=sys.stderr)
+            return
+        for i, doc_id in enumerate(data["ids"]):
+            id_to_data[doc_id] = {
+                "content": data["documents"][i],
+                "metadata": data["metadatas"][i] if data["metadatas"] else {},
+                "distance": 0.5,  # BM25 전용은 distance 없음
+            }
+
+    def _load_bm25_index(self, count: int) -> bool:
+        """ingest가 저장한 디스크 인덱스를 memory-map으로 연다.
+
+        인덱스의 코퍼스 세대가 현재 세대 마커와 다르거나 문서 수가 컬렉션과
+        다르면 오래된 인덱스로 보고 사용하지 않는다.
+        """
+        if not self.bm25_index_dir or not os.path.isdir(self.bm25_index_dir):
+            return False
+        try:
+            bm25 = NumpyBM25.load(self.bm25_index_dir)
+        except Exception as e:
+            print(f"  [Retriever] BM25 디스크 인덱스 로딩 실패: {e}", file=sys.stderr)
+            return False
+        if self._generation is not None and bm25.generation != self._generation:
+            print(
+                f"  [Retriever] BM25 디스크 인덱스의 세대가 현재 코퍼스와 불일치 "
+                f"({bm25.generation} != {self._generation}), 재구축합니다.",
+                file=sys.stderr,
+            )
+            return False
+        if bm25.doc_count != count:
+            print(
+                f"  [Retriever] BM25 디스크 인덱스가 컬렉션과 불일치 "
+                f"({bm25.doc_count} != {count}), 재구축합니다.",
+                file=sys.stderr,
+            )
+            return False
+
+        self.bm25 = bm25
+        self._bm25_original_docs = []
+        self._bm25_original_metas = []
+        self._log(f"BM25 디스크 인덱스 로딩: {self.bm25_index_dir} ({count}건)")
+        return True
 
     def _build_bm25_index(self, children_col):
         """Children 컬렉션으로 BM25 인덱스를 구축한다.
 
-        헤더 노이즈를 제거하고, 문서 ID를 함께 저장하여
+        디스크 인덱스가 있으면 memory-map으로 열고, 없을 때만 전체 Child를
+        읽어 구축한다. 헤더 노이즈를 제거하고, 문서 ID를 함께 저장하여
         검색 시 안정적인 ID 매핑을 보장한다.
         """
         try:
             count = children_col.count()
             if count == 0:
                 return
+            if self._load_bm25_index(count):
+                self._bm25_indexed = True
+                return
             all_data = children_col.get(limit=count)
 
-            # 원본 데이터 보존 (검색 시 BM25 전용 결과 조회용)
-            self._bm25_original_docs = all_data["documents"]
-            self._bm25_original_metas = all_data["metadatas"]
-
             documents = []
             for i, doc in enumerate(all_data["documents"]):
                 meta = all_data["metadatas"][i] if all_data["metadatas"] else {}
@@ -345,7 +937,13 @@ class AdvancedRetriever:
                     "content": content,
                     "keywords": meta.get("keywords", ""),
                 })
-            self.bm25.index(documents)
+            # 새 객체에 구축한 뒤 교체 (진행 중인 검색은 이전 인덱스를 계속 사용)
+            bm25 = make_bm25(self.bm25_backend)
+            bm25.index(documents)
+            self.bm25 = bm25
+            # 원본 데이터 보존 (검색 시 BM25 전용 결과 조회용)
+            self._bm25_original_docs = all_data["documents"]
+            self._bm25_original_metas = all_data["metadatas"]
             self._bm25_indexed = True
         except Exception as e:
             print(f"  [Retriever] BM25 인덱스 구축 실패: {e}", file=sys.stderr)
@@ -1,25 +1,147 @@
 """Router - 사용자 질문 의도 분류기
 
 경량 LLM 호출로 질문을 3가지 카테고리로 분류한다.
+FastRouter가 주어지면 먼저 로컬 분류기로 분류하고, 신뢰도가 낮을 때만
+LLM을 호출한다.
 """
 
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+
 from src.llm_adapter import OllamaAdapter
-from src.prompts.router import ROUTER_PROMPT
+from src.prompts.router import ROUTER_EXAMPLES, ROUTER_PROMPT
+
+
+def load_router_examples(path: str) -> dict[str, list[str]]:
+    """라벨별 예시 문장을 파일에서 읽는다.
+
+    .jsonl: 줄마다 {"text": ..., "label": ...}
+    .json: {"CHITCHAT": [...], "INTERNAL_SEARCH": [...], ...}
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    if path.endswith(".jsonl"):
+        examples: dict[str, list[str]] = {}
+        for line in text.splitlines():
+            if line.strip():
+                item = json.loads(line)
+                examples.setdefault(item["label"], []).append(item["text"])
+        return examples
+    return json.loads(text)
+
+
+class FastRouter:
+    """라벨 예시 문장에 대한 최근접 이웃 분류기 (LLM 호출 없음).
+
+    질문과 예시를 토큰별 문자 유니그램/바이그램 TF-IDF 벡터로 바꾸고, 라벨마다
+    가장 비슷한 예시의 코사인 유사도를 점수로 쓴다. 신뢰도는 1위와 2위 라벨
+    점수의 차이다. 역색인으로 계산하므로 한 번 분류에 수십 µs 수준이다.
+
+    1위 유사도가 min_similarity 미만이거나, CHITCHAT인데 질문에 CHITCHAT 예시에
+    없는 단어가 있으면 ("고마워 연차") 신뢰도 0을 반환해 LLM이 판단하게 한다.
+    CHITCHAT은 검색을 건너뛰므로 인사에 붙은 질문을 놓치지 않기 위함이다.
+    """
+
+    def __init__(self, examples: dict[str, list[str]] | None = None, min_similarity: float = 0.5):
+        examples = examples or ROUTER_EXAMPLES
+        docs = [(label, self._features(text)) for label, texts in examples.items() for text in texts]
+
+        df = Counter(term for _, feats in docs for term in feats)
+        n = len(docs)
+        self.idf = {term: math.log((n + 1) / (count + 1)) + 1 for term, count in df.items()}
+        self.unknown_idf = math.log(n + 1) + 1  # 예시에 없는 n-gram (df=0)
+        self.min_similarity = min_similarity
+        self.chitchat_tokens = {
+            token for text in examples.get("CHITCHAT", []) for token in re.findall(r"\w+", text.lower())
+        }
+
+        self.labels = list(examples)
+        self.example_labels = [label for label, _ in docs]
+        self.postings: dict[str, list[tuple[int, float]]] = {}
+        for idx, (_, feats) in enumerate(docs):
+            for term, weight in self._vectorize(feats).items():
+                self.postings.setdefault(term, []).append((idx, weight))
+
+    @staticmethod
+    def _features(text: str) -> Counter:
+        feats = Counter()
+        for token in re.findall(r"\w+", text.lower()):
+            feats.update(token)
+            feats.update(token[i:i + 2] for i in range(len(token) - 1))
+        return feats
+
+    def _vectorize(self, feats: Counter) -> dict[str, float]:
+        # 예시에 없는 n-gram도 노름에는 포함한다 (예시와 무관한 내용이 많을수록 유사도가 낮아짐)
+        vec = {t: c * self.idf.get(t, self.unknown_idf) for t, c in feats.items()}
+        norm = math.sqrt(sum(w * w for w in vec.values()))
+        return {t: w / norm for t, w in vec.items() if t in self.idf} if norm else {}
+
+    def predict(self, query: str) -> tuple[str, float]:
+        """(라벨, 신뢰도)를 반환한다. 신뢰도 = 1위 라벨 점수 - 2위 라벨 점수 (0~1)."""
+        sims: dict[int, float] = {}
+        for term, weight in self._vectorize(self._features(query)).items():
+            for idx, ex_weight in self.postings[term]:
+                sims[idx] = sims.get(idx, 0.0) + weight * ex_weight
+
+        best = dict.fromkeys(self.labels, 0.0)
+        for idx, sim in sims.items():
+            label = self.example_labels[idx]
+            if sim > best[label]:
+                best[label] = sim
+
+        ranked = sorted(best.values(), reverse=True)
+        if not ranked or ranked[0] == 0.0:
+            return "", 0.0
+        label = max(best, key=best.get)
+        if ranked[0] < self.min_similarity:
+            return label, 0.0
+        if label == "CHITCHAT" and any(
+            token not in self.chitchat_tokens for token in re.findall(r"\w+", query.lower())
+        ):
+            return label, 0.0
+        second = ranked[1] if len(ranked) > 1 else 0.0
+        return label, ranked[0] - second
 
 
 class Router:
     VALID_ROUTES = {"INTERNAL_SEARCH", "WEB_SEARCH", "CHITCHAT"}
 
-    def __init__(self, llm: OllamaAdapter):
+    def __init__(
+        self, llm: OllamaAdapter,
+        fast_router: FastRouter | None = None, fast_threshold: float = 0.35,
+    ):
         self.llm = llm
+        self.fast_router = fast_router
+        self.fast_threshold = fast_threshold
+        self.fast_hits = 0  # 로컬 분류로 끝난 횟수
+        self.llm_calls = 0  # LLM까지 간 횟수
+
+    def fast_classify(self, query: str) -> str | None:
+        """로컬 분류기가 확신할 때만 라우트를 반환한다 (아니면 None)."""
+        if not self.fast_router:
+            return None
+        label, confidence = self.fast_router.predict(query)
+        if label in self.VALID_ROUTES and confidence >= self.fast_threshold:
+            self.fast_hits += 1
+            print(f"  [라우팅] 로컬 분류 {label} (신뢰도 {confidence:.2f})")
+            return label
+        return None
 
     def classify(self, query: str) -> str:
         """사용자 질문을 분류하여 라우팅 경로를 반환한다."""
+        route = self.fast_classify(query)
+        if route:
+            return route
+
+        self.llm_calls += 1
         response = self.llm.chat(
             messages=[
                 {"role": "system", "content": ROUTER_PROMPT},
                 {"role": "user", "content": query},
-            ]
+            ],
+            cache_stage="router",
         )
 
         route = response.content.strip().upper()
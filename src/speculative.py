@@ -0,0 +1,129 @@
+"""Speculative Retrieval - 라우팅/플래닝과 동시에 원문 쿼리로 미리 검색
+
+Router와 Planner가 LLM을 호출하는 동안 사용자 원문 쿼리로 사내 문서
+검색을 먼저 시작한다. Planner의 검색어가 원문과 충분히 비슷하면 그
+결과를 재사용하고 (검색어가 여러 개면 가장 비슷한 하나에만), 아니면 버린다.
+적중/실패 통계를 기록한다.
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+from src.tracing import propagate, span
+
+
+def _bigrams(text: str) -> set[str]:
+    """토큰별 문자 바이그램 집합 (한 글자 토큰은 그대로)."""
+    grams = set()
+    for token in re.findall(r"\w+", text.lower()):
+        if len(token) == 1:
+            grams.add(token)
+        grams.update(token[i:i + 2] for i in range(len(token) - 1))
+    return grams
+
+
+def query_similarity(a: str, b: str) -> float:
+    """두 쿼리의 문자 바이그램 Dice 계수 (2|A∩B| / (|A| + |B|), 0~1).
+
+    대칭 척도라서 MULTI 분해로 나온 원문의 일부("연차 휴가")는 원문 전체와
+    낮은 점수를 받는다 (짧은 쪽 기준 겹침 비율이면 1.0이 된다).
+    """
+    ga, gb = _bigrams(a), _bigrams(b)
+    if not ga or not gb:
+        return 0.0
+    return 2 * len(ga & gb) / (len(ga) + len(gb))
+
+
+@dataclass
+class SpeculationStats:
+    hits: int = 0  # 추측 결과 재사용
+    misses: int = 0  # 검색어가 달라 버림 (또는 추측 검색 실패)
+    discarded: int = 0  # 사내 검색이 필요 없는 라우트라 버림
+    saved_sec: float = 0.0  # 재사용 시 이미 끝나 있던 검색 시간의 합
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"적중 {self.hits}, 실패 {self.misses}, 폐기 {self.discarded} "
+            f"(적중률 {self.hit_rate:.0%}, 절감 {self.saved_sec:.2f}s)"
+        )
+
+
+@dataclass
+class Speculation:
+    query: str
+    future: Future
+
+
+class SpeculativeSearch:
+    """원문 쿼리 검색을 백그라운드에서 미리 실행하고 재사용 여부를 판정한다.
+
+    search_fn(query) -> list[dict]는 _direct_search의 쿼리 하나 검색과 같은
+    결과를 반환해야 한다.
+    """
+
+    def __init__(self, search_fn: Callable[[str], list[dict]], threshold: float = 0.5):
+        self.search_fn = search_fn
+        self.threshold = threshold
+        self.stats = SpeculationStats()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="speculative")
+
+    def start(self, query: str) -> Speculation:
+        """원문 쿼리 검색을 시작한다."""
+        return Speculation(query=query, future=self._pool.submit(propagate(self._timed_search), query))
+
+    def _timed_search(self, query: str) -> tuple[list[dict], float]:
+        start = time.perf_counter()
+        with span("speculative_search"):
+            docs = self.search_fn(query)
+        return docs, time.perf_counter() - start
+
+    def resolve(self, spec: Speculation, planned_queries: list[str]) -> dict[str, list[dict]]:
+        """원문과 가장 비슷한 Planner 검색어 하나에 추측 결과를 매핑해 반환한다 (없으면 빈 dict).
+
+        추측 결과는 원문 쿼리 하나의 검색이므로, 검색어가 여러 개여도 하나만 대체한다.
+        """
+        scored = [(query_similarity(spec.query, q), q) for q in planned_queries]
+        matched = [q for score, q in sorted(scored, key=lambda x: -x[0]) if score >= self.threshold][:1]
+        if not matched:
+            spec.future.cancel()
+            self._record(misses=1)
+            print("  [추측 검색] 실패 (검색어가 원문과 다름)")
+            return {}
+
+        wait_start = time.perf_counter()
+        try:
+            docs, duration = spec.future.result()
+        except Exception as e:
+            self._record(misses=1)
+            print(f"  [추측 검색] 실패 ({e})")
+            return {}
+        waited = time.perf_counter() - wait_start
+
+        self._record(hits=1, saved_sec=max(duration - waited, 0.0))
+        print(f"  [추측 검색] 적중 → {matched} 재사용")
+        return {q: docs for q in matched}
+
+    def discard(self, spec: Speculation):
+        """사내 검색을 하지 않는 라우트면 추측 결과를 버린다."""
+        spec.future.cancel()
+        self._record(discarded=1)
+
+    def _record(self, hits=0, misses=0, discarded=0, saved_sec=0.0):
+        with self._lock:
+            self.stats.hits += hits
+            self.stats.misses += misses
+            self.stats.discarded += discarded
+            self.stats.saved_sec += saved_sec
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
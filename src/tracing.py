@@ -0,0 +1,224 @@
+"""Tracing - 질의 단위 단계별 지연 시간 추적
+
+process_query 한 번을 하나의 trace로 보고, 라우터·플래너·MCP 호출·답변 생성 등
+각 단계를 span으로 기록한다. 끝나면 trace 하나를 JSONL 한 줄로 저장한다.
+
+    with start_trace(writer, query=query):
+        with span("router"):
+            ...
+
+trace가 없을 때 span()은 ContextVar 조회 한 번 후 공용 no-op 객체를 반환하므로
+추적을 꺼두면 오버헤드가 거의 없다. 스레드 풀로 넘기는 함수는 propagate()로 감싸야
+같은 trace에 기록된다.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+TRACE_PATH = os.getenv("TRACE_PATH", "./data/traces.jsonl")
+
+_current_trace: contextvars.ContextVar["Trace | None"] = contextvars.ContextVar("trace", default=None)
+_current_span: contextvars.ContextVar["_Span | None"] = contextvars.ContextVar("span", default=None)
+
+
+class Trace:
+    """span 기록을 모으는 trace 하나. 여러 스레드에서 동시에 span을 추가할 수 있다."""
+
+    def __init__(self, **attrs):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.started_at = datetime.now().isoformat()
+        self.attrs = attrs
+        self.spans: list[dict] = []
+        self.total_ms = 0.0
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def elapsed_ms(self, since: float | None = None) -> float:
+        return (time.perf_counter() - (self._t0 if since is None else since)) * 1000
+
+    def add_span(self, record: dict):
+        with self._lock:
+            self.spans.append(record)
+
+    def set(self, **attrs):
+        """trace 전체 속성을 추가한다 (route 등)."""
+        self.attrs.update(attrs)
+
+    def to_record(self) -> dict:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start_ms"])
+        return {
+            "trace_id": self.trace_id,
+            "started_at": self.started_at,
+            "total_ms": round(self.total_ms, 3),
+            **self.attrs,
+            "spans": spans,
+        }
+
+
+class _Span:
+    __slots__ = ("trace", "name", "attrs", "parent", "_start", "_token")
+
+    def __init__(self, trace: Trace, name: str, attrs: dict):
+        self.trace = trace
+        self.name = name
+        self.attrs = attrs
+        self.parent = None
+        self._start = 0.0
+        self._token = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.parent = parent.name if parent is not None else None
+        self._token = _current_span.set(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = (time.perf_counter() - self._start) * 1000
+        _current_span.reset(self._token)
+        record = {
+            "name": self.name,
+            "parent": self.parent,
+            "start_ms": round((self._start - self.trace._t0) * 1000, 3),
+            "duration_ms": round(duration, 3),
+        }
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        record.update(self.attrs)
+        self.trace.add_span(record)
+        return False
+
+
+class _NoopSpan:
+    """추적이 꺼져 있을 때 쓰는 공용 span."""
+
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def active() -> bool:
+    return _current_trace.get() is not None
+
+
+def span(name: str, **attrs):
+    """현재 trace에 span을 연다. trace가 없으면 no-op."""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP
+    return _Span(trace, name, attrs)
+
+
+def annotate(**attrs):
+    """현재 span에 속성을 추가한다 (Ollama 토큰 수 등)."""
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attrs)
+
+
+def annotate_trace(**attrs):
+    """현재 trace 전체에 속성을 추가한다."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.set(**attrs)
+
+
+def add_remote_spans(spans: list[dict], prefix: str = ""):
+    """다른 프로세스(MCP 서버)에서 받은 span을 현재 span 아래에 붙인다.
+
+    원격 span의 start_ms는 원격 trace 기준이므로 현재 span 시작 시각을 더한다.
+    """
+    trace = _current_trace.get()
+    current = _current_span.get()
+    if trace is None or not spans:
+        return
+    offset = (current._start - trace._t0) * 1000 if current is not None else 0.0
+    for remote in spans:
+        record = dict(remote)
+        record["name"] = f"{prefix}{remote.get('name', '')}"
+        record["parent"] = f"{prefix}{remote['parent']}" if remote.get("parent") else (
+            current.name if current is not None else None
+        )
+        record["start_ms"] = round(offset + float(remote.get("start_ms", 0.0)), 3)
+        trace.add_span(record)
+
+
+def propagate(fn):
+    """현재 trace/span 문맥에서 fn이 실행되도록 감싼다 (스레드 풀 제출용)."""
+    if _current_trace.get() is None:
+        return fn
+    ctx = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # 같은 Context를 여러 스레드에서 동시에 run할 수 없으므로 호출마다 복사
+        return ctx.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+class TraceWriter:
+    """trace를 JSONL 파일에 한 줄씩 추가한다."""
+
+    def __init__(self, path: str = TRACE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def write(self, trace: Trace):
+        line = json.dumps(trace.to_record(), ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class start_trace:
+    """trace 하나를 시작한다. writer가 None이고 record=False면 아무것도 하지 않는다.
+
+    with 블록이 끝나면 writer에 기록하고, as로 받은 Trace(또는 None)를 돌려준다.
+    """
+
+    def __init__(self, writer: TraceWriter | None = None, record: bool = False, **attrs):
+        self.writer = writer
+        self.enabled = writer is not None or record
+        self.attrs = attrs
+        self.trace: Trace | None = None
+        self._tokens = None
+
+    def __enter__(self) -> Trace | None:
+        if not self.enabled:
+            return None
+        self.trace = Trace(**self.attrs)
+        self._tokens = (_current_trace.set(self.trace), _current_span.set(None))
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.trace is None:
+            return False
+        self.trace.total_ms = self.trace.elapsed_ms()
+        if exc_type is not None:
+            self.trace.set(error=exc_type.__name__)
+        _current_trace.reset(self._tokens[0])
+        _current_span.reset(self._tokens[1])
+        if self.writer is not None:
+            self.writer.write(self.trace)
+        return False
@@ -5,16 +5,40 @@ Parent-Child Chunking + Contextual Headers를 적용한다.
 - Child 청크 (400자): 벡터 검색 정밀도 최적화
 - Contextual Header: 각 Child에 문서명/섹션 정보 삽입
 - 임베딩은 헤더 없는 원본 텍스트로, 저장은 헤더 포함 텍스트로 분리
+- 증분 모드(--incremental): 내용 해시가 바뀐 파일만 재청크/재임베딩
+- 읽기/청크 → 임베딩 → 저장을 bounded queue로 연결한 스트리밍 파이프라인
 """
 
 import glob
+import hashlib
+import json
 import math
 import os
+import queue
 import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 
 import chromadb
 
-from src.embedding import OllamaEmbedder
+from src.embedding import (
+    EMBED_BATCH_SIZE,
+    EMBED_CONCURRENCY,
+    OllamaEmbedder,
+    iter_embedded,
+)
+from src.embedding_cache import EMBED_CACHE_PATH, with_cache
+from src.retriever import (
+    AdvancedRetriever,
+    BM25Builder,
+    NumpyBM25,
+    bm25_index_path,
+    new_corpus_generation,
+    write_corpus_generation,
+)
 
 os.environ["ANONYMIZED_TELEMETRY"] = "False"
 
@@ -45,6 +69,12 @@ PARENT_OVERLAP = 100
 CHILD_CHUNK_SIZE = 400
 CHILD_OVERLAP = 50
 
+# 증분 인제스트용 파일별 해시/청크 ID 기록 (chroma_dir 안에 저장)
+MANIFEST_FILENAME = "ingest_manifest.json"
+
+# 스트리밍 인제스트 단계 사이 큐 크기 (파일/배치 단위)
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "8"))
+
 
 def extract_title(text: str, filename: str) -> str:
     """문서에서 제목을 추출한다. Markdown 헤더 또는 첫 줄 사용."""
@@ -123,118 +153,523 @@ def extract_keywords(text: str) -> list[str]:
     return list(dict.fromkeys(filtered))[:20]  # 중복 제거, 최대 20개
 
 
+def _bm25_document(child_id: str, document: str, metadata: dict) -> dict:
+    """Child 청크를 BM25 인덱싱용 문서로 변환한다.
+
+    검색 시 구축과 동일하게 헤더 노이즈를 제거한 텍스트로 인덱싱한다.
+    """
+    return {
+        "id": child_id,
+        "content": AdvancedRetriever._strip_contextual_header(document),
+        "keywords": metadata.get("keywords", ""),
+    }
+
+
+def write_bm25_index(
+    chroma_dir: str,
+    child_ids: list[str],
+    child_documents: list[str],
+    child_metadatas: list[dict],
+    generation: str | None = None,
+) -> str:
+    """Child 청크로 BM25 인덱스를 구축하여 디스크에 저장한다.
+
+    검색 서버는 이 인덱스를 memory-map으로 열어 Chroma 전체 조회와
+    재토큰화 없이 BM25를 사용한다. generation은 인덱스에 기록할 코퍼스 세대.
+    저장된 경로를 반환한다.
+    """
+    bm25 = NumpyBM25()
+    bm25.index([
+        _bm25_document(child_id, doc, meta)
+        for child_id, doc, meta in zip(child_ids, child_documents, child_metadatas)
+    ])
+    index_dir = bm25_index_path(chroma_dir)
+    bm25.save(index_dir, generation=generation)
+    return index_dir
+
+
+@dataclass
+class FileChunks:
+    """원본 파일 하나에서 생성된 Parent/Child 청크."""
+
+    parent_ids: list[str] = field(default_factory=list)
+    parent_texts: list[str] = field(default_factory=list)
+    parent_metadatas: list[dict] = field(default_factory=list)
+    child_ids: list[str] = field(default_factory=list)
+    child_texts: list[str] = field(default_factory=list)      # 임베딩용 (헤더 없는 원본)
+    child_documents: list[str] = field(default_factory=list)  # 저장용 (헤더 포함)
+    child_metadatas: list[dict] = field(default_factory=list)
+
+
+def chunk_document(text: str, filename: str) -> FileChunks:
+    """문서 하나를 Parent-Child 청크로 분할한다."""
+    chunks = FileChunks()
+    title = extract_title(text, filename)
+
+    # 1단계: Parent 청크 생성
+    parents = split_into_chunks(text, PARENT_CHUNK_SIZE, PARENT_OVERLAP)
+    total_parents = len(parents)
+
+    for p_idx, parent_text in enumerate(parents):
+        parent_id = f"{filename}_p{p_idx}"
+        parent_keywords = extract_keywords(parent_text)
+
+        chunks.parent_texts.append(parent_text)
+        chunks.parent_metadatas.append({
+            "source": filename,
+            "title": title,
+            "parent_index": p_idx,
+            "keywords": " ".join(parent_keywords),
+        })
+        chunks.parent_ids.append(parent_id)
+
+        # 2단계: 각 Parent에서 Child 청크 생성
+        children = split_into_chunks(parent_text, CHILD_CHUNK_SIZE, CHILD_OVERLAP)
+
+        for c_idx, child_text in enumerate(children):
+            header = make_contextual_header(filename, title, p_idx, total_parents)
+            enriched_child = header + child_text
+
+            child_id = f"{filename}_p{p_idx}_c{c_idx}"
+            child_keywords = extract_keywords(child_text)
+
+            chunks.child_texts.append(child_text)
+            chunks.child_documents.append(enriched_child)
+            chunks.child_metadatas.append({
+                "source": filename,
+                "title": title,
+                "parent_id": parent_id,
+                "parent_index": p_idx,
+                "child_index": c_idx,
+                "keywords": " ".join(child_keywords),
+            })
+            chunks.child_ids.append(child_id)
+
+    return chunks
+
+
+def find_documents(docs_dir: str) -> list[str]:
+    """인제스트 대상 문서(.txt, .md) 경로 목록을 반환한다."""
+    paths = []
+    for ext in ["*.txt", "*.md"]:
+        paths.extend(glob.glob(os.path.join(docs_dir, "**", ext), recursive=True))
+    return paths
+
+
+def content_hash(text: str) -> str:
+    """문서 내용의 SHA-256 해시."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _manifest_settings(embedding_model: str) -> dict:
+    """이 값이 바뀌면 모든 청크/임베딩이 무효가 된다."""
+    return {
+        "embedding_model": embedding_model,
+        "chunking": [PARENT_CHUNK_SIZE, PARENT_OVERLAP, CHILD_CHUNK_SIZE, CHILD_OVERLAP],
+    }
+
+
+def load_manifest(chroma_dir: str, embedding_model: str) -> dict | None:
+    """증분 인제스트 매니페스트를 읽는다. 사용할 수 없으면 None."""
+    path = os.path.join(chroma_dir, MANIFEST_FILENAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if manifest.get("settings") != _manifest_settings(embedding_model):
+        print("임베딩 모델 또는 청크 설정이 바뀌어 전체 재인제스트합니다.")
+        return None
+    return manifest
+
+
+def save_manifest(chroma_dir: str, manifest: dict):
+    path = os.path.join(chroma_dir, MANIFEST_FILENAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class IngestStats:
+    """스트리밍 인제스트의 단계별 처리량.
+
+    *_seconds는 각 단계가 실제로 일한 시간이다 (큐 대기 제외). 그래서
+    처리량이 전체 파이프라인 속도가 아니라 그 단계 자체의 속도를 보여준다.
+    """
+
+    files: int = 0
+    parents: int = 0
+    chunks: int = 0
+    embeds: int = 0
+    chunk_seconds: float = 0.0
+    embed_seconds: float = 0.0
+    write_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    def summary(self) -> str:
+        def rate(count: int, seconds: float) -> str:
+            return f"{count / seconds:.1f}" if seconds > 0 else "-"
+
+        return (
+            f"  [읽기/청크] 파일 {self.files}개 ({rate(self.files, self.chunk_seconds)} files/s), "
+            f"Child {self.chunks}개 ({rate(self.chunks, self.chunk_seconds)} chunks/s)\n"
+            f"  [임베딩]    {self.embeds}건 ({rate(self.embeds, self.embed_seconds)} embeds/s)\n"
+            f"  [저장]      Child {self.chunks}개 + Parent {self.parents}개 ({self.write_seconds:.2f}s)\n"
+            f"  [전체]      {self.total_seconds:.2f}s"
+        )
+
+
+class _PipelineAborted(Exception):
+    """다른 단계의 실패로 파이프라인이 중단되었음을 알린다."""
+
+
+_DONE = object()
+
+
+class _BusyTimer:
+    """여러 스레드의 작업 구간을 합쳐, 하나라도 진행 중이던 시간을 잰다."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self._active = 0
+        self._since = 0.0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self):
+        with self._lock:
+            if self._active == 0:
+                self._since = time.perf_counter()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+                if self._active == 0:
+                    self.seconds += time.perf_counter() - self._since
+
+
+class _TimedEmbedder:
+    """encode() 호출 시간만 _BusyTimer로 재는 임베더 래퍼 (병렬 요청은 겹친 구간을 한 번만 셈)."""
+
+    def __init__(self, embedder, timer: _BusyTimer):
+        self.embedder = embedder
+        self.timer = timer
+
+    def encode(self, texts, **kwargs):
+        with self.timer.measure():
+            return self.embedder.encode(texts, **kwargs)
+
+
+def _put(q: queue.Queue, item, stop: threading.Event):
+    while True:
+        if stop.is_set():
+            raise _PipelineAborted()
+        try:
+            q.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    while True:
+        if stop.is_set():
+            raise _PipelineAborted()
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+
+
+def run_ingest_pipeline(
+    files: list[tuple[str, str]],
+    embedder,
+    children_col,
+    parents_col,
+    manifest_files: dict,
+    bm25_builder: BM25Builder | None = None,
+    embed_batch_size: int = EMBED_BATCH_SIZE,
+    embed_workers: int = EMBED_CONCURRENCY,
+    queue_size: int = INGEST_QUEUE_SIZE,
+) -> IngestStats:
+    """읽기/청크 → 임베딩 → 저장을 겹쳐 실행하는 스트리밍 인제스트.
+
+    세 단계는 각자 스레드에서 돌고 크기가 queue_size로 제한된 큐로 연결된다.
+    따라서 코퍼스 크기와 무관하게 메모리에는 큐와 진행 중인 임베딩 배치만 남고,
+    CPU 작업(청크)과 네트워크 대기(임베딩)가 겹쳐 진행된다.
+
+    Args:
+        files: (docs_dir 기준 상대경로, 실제 경로) 목록
+        manifest_files: 파일별 해시/청크 ID를 기록할 매니페스트 dict (갱신됨)
+        bm25_builder: 저장된 Child를 BM25 인덱스에 추가할 빌더 (없으면 생략)
+    """
+    stats = IngestStats()
+    busy = {"chunk": _BusyTimer(), "embed": _BusyTimer(), "write": _BusyTimer()}
+    stop = threading.Event()
+    chunk_q: queue.Queue = queue.Queue(maxsize=queue_size)
+    write_q: queue.Queue = queue.Queue(maxsize=queue_size)
+
+    def chunk_stage():
+        for rel, filepath in files:
+            with busy["chunk"].measure():
+                with open(filepath, "r", encoding="utf-8") as f:
+                    text = f.read()
+                chunks = chunk_document(text, os.path.basename(filepath))
+                manifest_files[rel] = {
+                    "hash": content_hash(text),
+                    "parent_ids": chunks.parent_ids,
+                    "child_ids": chunks.child_ids,
+                }
+            stats.files += 1
+            stats.parents += len(chunks.parent_ids)
+            stats.chunks += len(chunks.child_ids)
+            _put(chunk_q, chunks, stop)
+        _put(chunk_q, _DONE, stop)
+
+    def embed_batches():
+        """파일 경계와 무관하게 Child를 embed_batch_size로 묶는다."""
+        pending = FileChunks()
+        while True:
+            chunks = _get(chunk_q, stop)
+            if chunks is _DONE:
+                break
+            if chunks.parent_ids:
+                _put(write_q, ("parents", chunks), stop)
+            for name in ("child_ids", "child_texts", "child_documents", "child_metadatas"):
+                getattr(pending, name).extend(getattr(chunks, name))
+            while len(pending.child_ids) >= embed_batch_size:
+                yield _take_children(pending, embed_batch_size)
+        if pending.child_ids:
+            yield _take_children(pending, len(pending.child_ids))
+
+    def embed_stage():
+        for children, embeddings in iter_embedded(
+            _TimedEmbedder(embedder, busy["embed"]), embed_batches(), max_workers=embed_workers,
+        ):
+            stats.embeds += len(embeddings)
+            _put(write_q, ("children", children, embeddings), stop)
+        _put(write_q, _DONE, stop)
+
+    def write_stage():
+        while True:
+            item = _get(write_q, stop)
+            if item is _DONE:
+                break
+            with busy["write"].measure():
+                write_item(item)
+
+    def write_item(item):
+        if item[0] == "parents":
+            chunks = item[1]
+            # Parent 청크 저장 (임베딩 불필요 — 텍스트 저장용)
+            parents_col.upsert(
+                documents=chunks.parent_texts,
+                metadatas=chunks.parent_metadatas,
+                ids=chunks.parent_ids,
+            )
+        else:
+            _, children, embeddings = item
+            children_col.upsert(
+                documents=children.child_documents,
+                embeddings=embeddings.tolist(),
+                metadatas=children.child_metadatas,
+                ids=children.child_ids,
+            )
+            if bm25_builder is not None:
+                bm25_builder.add([
+                    _bm25_document(child_id, doc, meta)
+                    for child_id, doc, meta in zip(
+                        children.child_ids, children.child_documents, children.child_metadatas,
+                    )
+                ])
+
+    errors = []
+
+    def run(fn):
+        try:
+            fn()
+        except _PipelineAborted:
+            pass
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(target=run, args=(fn,), name=f"ingest-{name}", daemon=True)
+        for name, fn in (("chunk", chunk_stage), ("embed", embed_stage), ("write", write_stage))
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise errors[0]
+
+    stats.chunk_seconds = busy["chunk"].seconds
+    stats.embed_seconds = busy["embed"].seconds
+    stats.write_seconds = busy["write"].seconds
+    stats.total_seconds = time.perf_counter() - started
+    return stats
+
+
+def _take_children(pending: FileChunks, n: int) -> tuple[FileChunks, list[str]]:
+    """pending 앞쪽 n개의 Child를 떼어 (청크 묶음, 임베딩용 텍스트)로 반환한다."""
+    taken = FileChunks()
+    for name in ("child_ids", "child_texts", "child_documents", "child_metadatas"):
+        values = getattr(pending, name)
+        setattr(taken, name, values[:n])
+        del values[:n]
+    return taken, taken.child_texts
+
+
+def _open_bm25_builder(chroma_dir: str, full_rebuild: bool, removed_ids: list[str]) -> BM25Builder | None:
+    """이번 인제스트에서 BM25 인덱스를 이어 쌓을 빌더를 연다."""
+    if full_rebuild:
+        return BM25Builder()
+    try:
+        bm25 = NumpyBM25.load(bm25_index_path(chroma_dir), mmap=False)
+    except Exception as e:
+        print(f"BM25 인덱스를 열 수 없어 인제스트 후 재구축합니다: {e}")
+        return None
+    return BM25Builder.from_index(bm25, remove_ids=removed_ids)
+
+
 def ingest_documents(
     docs_dir: str = "./data/documents",
     chroma_dir: str = "./data/chroma",
     embedding_model: str = "bona/bge-m3-korean:latest",
+    incremental: bool = False,
+    embed_batch_size: int = EMBED_BATCH_SIZE,
+    embed_workers: int = EMBED_CONCURRENCY,
+    embedding_cache: str | None = EMBED_CACHE_PATH,
 ):
     """Advanced RAG 방식으로 문서를 인제스트한다.
 
     Parent-Child 이중 청크 + Contextual Headers + BM25 키워드 메타데이터.
     임베딩은 헤더 없는 원본 텍스트로, 저장은 헤더 포함 텍스트로 분리한다.
+    Child 컬렉션의 BM25 인덱스는 chroma_dir/bm25에 함께 저장한다.
+
+    incremental=True면 파일별 내용 해시를 매니페스트와 비교하여 변경/추가된
+    파일만 다시 청크·임베딩하고, 삭제된 파일의 청크는 컬렉션에서 제거한다.
+    매니페스트가 없거나 컬렉션과 맞지 않으면 전체 재구축한다.
+
+    파일 읽기/청크, 임베딩, 저장은 run_ingest_pipeline으로 겹쳐 실행된다.
+    Child 임베딩은 embed_batch_size 단위로 최대 embed_workers개씩 병렬 요청하고,
+    완료된 배치부터 입력 순서대로 Children 컬렉션에 저장한다.
+    embedding_cache 경로가 주어지면 이미 임베딩한 텍스트는 캐시에서 재사용한다.
+
+    Returns:
+        이번 실행에서 저장한 Child 청크 수
     """
-    embedder = OllamaEmbedder(model=embedding_model)
+    embedder = with_cache(OllamaEmbedder(model=embedding_model), embedding_cache)
     client = chromadb.PersistentClient(path=chroma_dir)
+    _noop_ef = _NoOpEmbeddingFunction()
 
-    # 기존 컬렉션 삭제
-    for name in ["children", "parents", "documents"]:
+    manifest = load_manifest(chroma_dir, embedding_model) if incremental else None
+    if manifest is not None:
+        expected = sum(len(entry["child_ids"]) for entry in manifest["files"].values())
         try:
-            client.delete_collection(name)
+            actual = client.get_collection("children", embedding_function=_noop_ef).count()
         except Exception:
-            pass
-
-    _noop_ef = _NoOpEmbeddingFunction()
-    children_col = client.create_collection(
+            actual = -1
+        if actual != expected:
+            print(f"매니페스트({expected})와 컬렉션({actual})이 불일치하여 전체 재인제스트합니다.")
+            manifest = None
+
+    full_rebuild = manifest is None
+    if full_rebuild:
+        # 기존 컬렉션, 매니페스트 삭제 (BM25 인덱스는 새 버전 저장 시 교체)
+        for name in ["children", "parents", "documents"]:
+            try:
+                client.delete_collection(name)
+            except Exception:
+                pass
+        manifest = {"settings": _manifest_settings(embedding_model), "files": {}}
+
+    children_col = client.get_or_create_collection(
         name="children", metadata={"hnsw:space": "cosine"},
         embedding_function=_noop_ef,
     )
-    parents_col = client.create_collection(
+    parents_col = client.get_or_create_collection(
         name="parents", embedding_function=_noop_ef,
     )
 
-    parent_chunks = []
-    parent_metadatas = []
-    parent_ids = []
-
-    child_chunks_for_embedding = []  # 임베딩용 (헤더 없는 원본)
-    child_chunks_for_storage = []    # 저장용 (헤더 포함)
-    child_metadatas = []
-    child_ids = []
+    # 변경/추가/삭제된 파일 판별 (본문은 해시만 남기고 버린다)
+    known = manifest["files"]
+    current = {}
+    for filepath in find_documents(docs_dir):
+        with open(filepath, "r", encoding="utf-8") as f:
+            current[os.path.relpath(filepath, docs_dir)] = (filepath, content_hash(f.read()))
 
-    extensions = ["*.txt", "*.md"]
+    changed = [rel for rel, (_, h) in current.items() if known.get(rel, {}).get("hash") != h]
+    removed = [rel for rel in known if rel not in current]
 
-    for ext in extensions:
-        for filepath in glob.glob(
-            os.path.join(docs_dir, "**", ext), recursive=True
-        ):
-            with open(filepath, "r", encoding="utf-8") as f:
-                text = f.read()
-
-            filename = os.path.basename(filepath)
-            title = extract_title(text, filename)
-
-            # 1단계: Parent 청크 생성
-            parents = split_into_chunks(text, PARENT_CHUNK_SIZE, PARENT_OVERLAP)
-            total_parents = len(parents)
-
-            for p_idx, parent_text in enumerate(parents):
-                parent_id = f"{filename}_p{p_idx}"
-                parent_keywords = extract_keywords(parent_text)
-
-                parent_chunks.append(parent_text)
-                parent_metadatas.append({
-                    "source": filename,
-                    "title": title,
-                    "parent_index": p_idx,
-                    "keywords": " ".join(parent_keywords),
-                })
-                parent_ids.append(parent_id)
-
-                # 2단계: 각 Parent에서 Child 청크 생성
-                children = split_into_chunks(parent_text, CHILD_CHUNK_SIZE, CHILD_OVERLAP)
-
-                for c_idx, child_text in enumerate(children):
-                    header = make_contextual_header(filename, title, p_idx, total_parents)
-                    enriched_child = header + child_text
-
-                    child_id = f"{filename}_p{p_idx}_c{c_idx}"
-                    child_keywords = extract_keywords(child_text)
-
-                    child_chunks_for_embedding.append(child_text)
-                    child_chunks_for_storage.append(enriched_child)
-                    child_metadatas.append({
-                        "source": filename,
-                        "title": title,
-                        "parent_id": parent_id,
-                        "parent_index": p_idx,
-                        "child_index": c_idx,
-                        "keywords": " ".join(child_keywords),
-                    })
-                    child_ids.append(child_id)
-
-    if not child_chunks_for_storage:
-        print("인제스트할 문서가 없습니다.")
+    if not full_rebuild and not changed and not removed:
+        print(f"변경된 문서가 없습니다. (유지 {len(current)}개 파일)")
         return 0
 
-    # 임베딩은 헤더 없는 원본 텍스트로 생성
-    child_embeddings = embedder.encode(child_chunks_for_embedding).tolist()
-    children_col.add(
-        documents=child_chunks_for_storage,
-        embeddings=child_embeddings,
-        metadatas=child_metadatas,
-        ids=child_ids,
+    # 변경/삭제된 파일의 기존 청크 제거
+    stale_child_ids, stale_parent_ids = [], []
+    for rel in changed + removed:
+        if rel in known:
+            stale_child_ids.extend(known[rel]["child_ids"])
+            stale_parent_ids.extend(known[rel]["parent_ids"])
+    if stale_child_ids:
+        children_col.delete(ids=stale_child_ids)
+    if stale_parent_ids:
+        parents_col.delete(ids=stale_parent_ids)
+    for rel in removed:
+        del known[rel]
+
+    bm25_builder = _open_bm25_builder(chroma_dir, full_rebuild, stale_child_ids)
+
+    # 임베딩은 헤더 없는 원본 텍스트로 생성, 배치 단위로 바로 저장
+    stats = run_ingest_pipeline(
+        [(rel, current[rel][0]) for rel in changed],
+        embedder, children_col, parents_col, known,
+        bm25_builder=bm25_builder,
+        embed_batch_size=embed_batch_size, embed_workers=embed_workers,
     )
 
-    # Parent 청크 저장 (임베딩 불필요 — 텍스트 저장용)
-    parents_col.add(
-        documents=parent_chunks,
-        metadatas=parent_metadatas,
-        ids=parent_ids,
-    )
+    if full_rebuild and stats.chunks == 0:
+        print("인제스트할 문서가 없습니다.")
+        write_corpus_generation(chroma_dir)
+        return 0
 
-    print(f"인제스트 완료: Parent {len(parent_chunks)}개, Child {len(child_chunks_for_storage)}개")
-    return len(child_chunks_for_storage)
+    # BM25 인덱스에 이번 세대를 기록해 두고, 마커는 마지막에 같은 값으로 갱신
+    generation = new_corpus_generation()
+    bm25 = bm25_builder.build() if bm25_builder is not None else None
+    if bm25 is not None and bm25.doc_count == children_col.count():
+        bm25.save(bm25_index_path(chroma_dir), generation=generation)
+    else:
+        print("BM25 인덱스를 Children 컬렉션 전체로 재구축합니다.")
+        all_data = children_col.get(limit=max(children_col.count(), 1))
+        write_bm25_index(
+            chroma_dir, all_data["ids"], all_data["documents"], all_data["metadatas"] or [],
+            generation=generation,
+        )
+
+    if full_rebuild:
+        print(f"인제스트 완료: Parent {stats.parents}개, Child {stats.chunks}개")
+    else:
+        print(
+            f"증분 인제스트 완료: 변경 {len(changed)}개, 삭제 {len(removed)}개, "
+            f"유지 {len(current) - len(changed)}개 파일 "
+            f"(Parent {stats.parents}개, Child {stats.chunks}개 갱신)"
+        )
+    print(stats.summary())
+
+    save_manifest(chroma_dir, manifest)
+    # 실행 중인 검색 서버가 캐시를 비우도록 세대 마커 갱신
+    write_corpus_generation(chroma_dir, generation)
+    return stats.chunks
 
 
 if __name__ == "__main__":
-    ingest_documents()
+    ingest_documents(incremental="--incremental" in sys.argv)
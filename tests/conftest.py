@@ -74,7 +74,7 @@ def make_mock_mcp(tools: list[dict] | None = None, call_results: dict | None = N
 
     default_results = call_results or {}
 
-    def mock_call_tool(name, args):
+    def mock_call_tool(name, args, timeout=None):
         if name in default_results:
             return default_results[name]
         # 계산기 도구
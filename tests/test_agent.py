@@ -1,6 +1,10 @@
 """Agent Core 단위 테스트"""
 
 import json
+import threading
+import time
+
+from src.llm_adapter import LLMResponse, ToolCall
 from tests.conftest import (
     make_mock_llm,
     make_mock_mcp,
@@ -8,6 +12,7 @@ from tests.conftest import (
     make_tool_response,
 )
 from src.agent import AgentCore
+from src.context_packer import ContextPacker
 
 
 class TestAgentCore:
@@ -76,3 +81,112 @@ class TestAgentCore:
         if tools:
             for tool in tools:
                 assert "search_vector_db" in tool["name"]
+
+    def test_answer_with_context_streams_tokens(self):
+        """on_token은 LLM 스트리밍 호출로 전달된다."""
+        llm = make_mock_llm([make_text_response("휴가는 15일입니다.")])
+        mcp = make_mock_mcp()
+        agent = AgentCore(llm=llm, mcp=mcp, system_prompt="test")
+        tokens = []
+
+        agent.answer_with_context("휴가", [{"content": "doc"}], [], on_token=tokens.append)
+
+        assert llm.chat.call_args.kwargs["on_token"] == tokens.append
+
+
+def _multi_tool_response(*names: str) -> LLMResponse:
+    return LLMResponse(content="", tool_calls=[
+        ToolCall(id=f"call_{i}", name=name, arguments={"tag": name}) for i, name in enumerate(names)
+    ])
+
+
+class TestContextPacking:
+    def test_answer_with_context_uses_trimmed_parent(self):
+        child = "연차는 입사 1년 후 15일이 부여됩니다."
+        parent = "회사 소개 문단입니다. " * 40 + child + " 복리후생 안내입니다." * 40
+        llm = make_mock_llm([make_text_response("15일입니다.")])
+        agent = AgentCore(
+            llm=llm, mcp=make_mock_mcp(), system_prompt="test",
+            context_packer=ContextPacker(budget_tokens=500, max_doc_tokens=60),
+        )
+
+        agent.answer_with_context("연차 며칠?", [{"content": parent, "child_content": child}], [])
+
+        prompt = llm.chat.call_args[0][0][-1]["content"]
+        assert child in prompt
+        assert len(prompt) < len(parent) // 3
+
+
+class TestParallelToolCalls:
+    def _agent(self, call_tool, names, **kwargs):
+        llm = make_mock_llm([_multi_tool_response(*names), make_text_response("완료")])
+        mcp = make_mock_mcp()
+        mcp.call_tool.side_effect = call_tool
+        return AgentCore(llm=llm, mcp=mcp, system_prompt="test", **kwargs), llm
+
+    def test_calls_run_concurrently_and_keep_order(self):
+        """늦게 끝나는 호출이 있어도 결과는 tool_calls 순서대로 추가된다."""
+        delays = {"a": 0.3, "b": 0.1, "c": 0.0}
+
+        def call_tool(name, args, timeout=None):
+            time.sleep(delays[name])
+            return json.dumps({"tag": name})
+
+        agent, llm = self._agent(call_tool, ["a", "b", "c"])
+
+        start = time.monotonic()
+        agent.run([{"role": "user", "content": "q"}])
+        elapsed = time.monotonic() - start
+
+        # 직렬이면 0.4초 이상
+        assert elapsed < 0.38
+        messages = llm.chat.call_args_list[1][0][0]
+        tool_msgs = [m for m in messages if m["role"] == "tool"]
+        assert [m["tool_call_id"] for m in tool_msgs] == ["call_0", "call_1", "call_2"]
+        assert [json.loads(m["content"])["tag"] for m in tool_msgs] == ["a", "b", "c"]
+
+    def test_concurrency_limit(self):
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def call_tool(name, args, timeout=None):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+            return "{}"
+
+        agent, _ = self._agent(call_tool, ["a", "b", "c", "d", "e"], tool_concurrency=2)
+        agent.run([{"role": "user", "content": "q"}])
+
+        assert peak == 2
+
+    def test_per_call_timeout_is_passed(self):
+        timeouts = []
+
+        def call_tool(name, args, timeout=None):
+            timeouts.append(timeout)
+            return "{}"
+
+        agent, _ = self._agent(call_tool, ["a", "b"], tool_timeout=7.5)
+        agent.run([{"role": "user", "content": "q"}])
+
+        assert timeouts == [7.5, 7.5]
+
+    def test_failed_call_becomes_error_result(self):
+        def call_tool(name, args, timeout=None):
+            if name == "a":
+                raise RuntimeError("boom")
+            return json.dumps({"tag": name})
+
+        agent, llm = self._agent(call_tool, ["a", "b"])
+        answer, _ = agent.run([{"role": "user", "content": "q"}])
+
+        assert answer == "완료"
+        tool_msgs = [m for m in llm.chat.call_args_list[1][0][0] if m["role"] == "tool"]
+        assert "boom" in json.loads(tool_msgs[0]["content"])["error"]
+        assert json.loads(tool_msgs[1]["content"])["tag"] == "b"
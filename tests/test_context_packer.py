@@ -0,0 +1,103 @@
+"""Context Packer 단위 테스트"""
+
+from src.context_packer import ContextPacker, estimate_tokens, trim_around
+
+FILLER = "연차 휴가는 입사 1년 후 15일이 부여됩니다. " * 10
+CHILD = "출장비 정산은 ERP 시스템에서 출장 종료 후 7일 이내에 신청해야 합니다."
+PARENT = FILLER + CHILD + " 기타 규정은 인사팀에 문의하세요." * 10
+
+
+class TestEstimateTokens:
+    def test_korean_counts_per_syllable(self):
+        assert estimate_tokens("휴가 신청") == 4
+
+    def test_english_counts_per_four_chars(self):
+        assert estimate_tokens("vacation policy") == 2 + 2
+
+    def test_mixed_and_symbols(self):
+        assert estimate_tokens("ERP 시스템.") == 1 + 3 + 1
+        assert estimate_tokens("") == 0
+
+
+class TestTrimAround:
+    def test_short_text_unchanged(self):
+        assert trim_around("짧은 문서", "", 100) == "짧은 문서"
+
+    def test_keeps_matched_child(self):
+        trimmed = trim_around(PARENT, CHILD, 80)
+        assert CHILD in trimmed
+        assert estimate_tokens(trimmed) <= 80
+        assert trimmed.startswith("…") and trimmed.endswith("…")
+
+    def test_missing_child_keeps_head(self):
+        trimmed = trim_around(PARENT, "없는 문장", 40)
+        assert trimmed.startswith("연차 휴가는")
+        assert estimate_tokens(trimmed) <= 40
+
+
+class TestContextPacker:
+    def test_fills_budget_in_relevance_order(self):
+        docs = [
+            {"content": "낮은 관련도 문서", "rrf_score": 0.01},
+            {"content": "높은 관련도 문서", "rrf_score": 0.05},
+        ]
+        packed = ContextPacker(budget_tokens=100, max_doc_tokens=50).pack(docs)
+
+        assert [d["content"] for d in packed.documents] == ["높은 관련도 문서", "낮은 관련도 문서"]
+        assert packed.dropped_tokens == 0
+
+    def test_keeps_input_order_without_scores(self):
+        docs = [{"content": "첫째"}, {"content": "둘째"}]
+        packed = ContextPacker(budget_tokens=100).pack(docs)
+        assert [d["content"] for d in packed.documents] == ["첫째", "둘째"]
+
+    def test_trims_parent_around_child(self):
+        docs = [{"content": PARENT, "child_content": CHILD, "metadata": {"source": "a.md"}}]
+        packed = ContextPacker(budget_tokens=1000, max_doc_tokens=80).pack(docs)
+
+        doc = packed.documents[0]
+        assert CHILD in doc["content"]
+        assert doc["metadata"] == {"source": "a.md"}
+        assert packed.trimmed_docs == 1
+        assert packed.dropped_tokens == estimate_tokens(PARENT) - packed.used_tokens
+
+    def test_drops_documents_over_budget(self):
+        docs = [{"content": PARENT}, {"content": PARENT}, {"content": PARENT}]
+        packed = ContextPacker(budget_tokens=250, max_doc_tokens=100).pack(docs)
+
+        assert packed.used_tokens <= 250
+        assert packed.dropped_docs == 1
+        assert len(packed.documents) == 2
+        assert packed.dropped_tokens == 3 * estimate_tokens(PARENT) - packed.used_tokens
+
+    def test_does_not_modify_input(self):
+        docs = [{"content": PARENT, "child_content": CHILD}]
+        ContextPacker(budget_tokens=50, max_doc_tokens=50).pack(docs)
+        assert docs[0]["content"] == PARENT
+
+
+class TestPackerWithIngestChunks:
+    def test_trims_around_real_child_from_search_server(self):
+        """인제스트 청크(Child 문서에 [출처] 헤더 포함)도 매칭된 Child 주변을 남긴다."""
+        from pathlib import Path
+
+        from src.mcp_servers.vector_search_server import _to_docs
+        from src.retriever import RetrievalResult
+        from src.vectorstore.ingest import chunk_document
+
+        text = Path(__file__).resolve().parent.parent.joinpath("docs", "strategy.md").read_text(encoding="utf-8")
+        chunks = chunk_document(text, "strategy.md")
+        child_idx = next(i for i, m in enumerate(chunks.child_metadatas) if m["child_index"] >= 2)
+        meta = chunks.child_metadatas[child_idx]
+        child_doc = chunks.child_documents[child_idx]
+        parent = chunks.parent_texts[meta["parent_index"]]
+        assert child_doc.startswith("[출처:")
+
+        docs = _to_docs([RetrievalResult(content=child_doc, parent_content=parent, metadata=meta)])
+        child = chunks.child_texts[child_idx]
+        assert docs[0]["child_content"] == child
+
+        max_tokens = estimate_tokens(child) + 20
+        packed = ContextPacker(budget_tokens=1000, max_doc_tokens=max_tokens).pack(docs)
+        assert estimate_tokens(parent) > max_tokens
+        assert child[:40] in packed.documents[0]["content"]
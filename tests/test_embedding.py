@@ -1,8 +1,13 @@
 """OllamaEmbedder 단위 테스트"""
 
+import random
+import threading
+import time
+
 import numpy as np
+import pytest
 from unittest.mock import patch, MagicMock
-from src.embedding import OllamaEmbedder
+from src.embedding import OllamaEmbedder, iter_embeddings
 
 
 class TestOllamaEmbedder:
@@ -12,7 +17,7 @@ class TestOllamaEmbedder:
         mock_resp.raise_for_status = MagicMock()
         return mock_resp
 
-    @patch("src.embedding.requests.post")
+    @patch("src.http_session.requests.Session.post")
     def test_encode_single_string(self, mock_post):
         """단일 문자열 → (dim,) 형태 반환."""
         mock_post.return_value = self._mock_response([[0.1, 0.2, 0.3]])
@@ -27,7 +32,7 @@ class TestOllamaEmbedder:
         assert call_json["model"] == "bona/bge-m3-korean:latest"
         assert call_json["input"] == ["테스트 문장"]
 
-    @patch("src.embedding.requests.post")
+    @patch("src.http_session.requests.Session.post")
     def test_encode_list(self, mock_post):
         """문자열 리스트 → (N, dim) 형태 반환."""
         mock_post.return_value = self._mock_response([
@@ -41,7 +46,7 @@ class TestOllamaEmbedder:
         assert isinstance(result, np.ndarray)
         assert result.shape == (2, 3)
 
-    @patch("src.embedding.requests.post")
+    @patch("src.http_session.requests.Session.post")
     def test_encode_uses_correct_url(self, mock_post):
         """올바른 Ollama API URL 호출."""
         mock_post.return_value = self._mock_response([[0.1]])
@@ -55,7 +60,7 @@ class TestOllamaEmbedder:
         call_url = mock_post.call_args[0][0]
         assert call_url == "http://custom:1234/api/embed"
 
-    @patch("src.embedding.requests.post")
+    @patch("src.http_session.requests.Session.post")
     def test_encode_returns_float32(self, mock_post):
         """반환 타입이 float32."""
         mock_post.return_value = self._mock_response([[0.1, 0.2]])
@@ -63,3 +68,78 @@ class TestOllamaEmbedder:
         embedder = OllamaEmbedder()
         result = embedder.encode("테스트")
         assert result.dtype == np.float32
+
+
+class _SlowEmbedder:
+    """배치마다 임의 지연 후 텍스트 번호를 벡터로 돌려주는 가짜 임베더."""
+
+    def __init__(self, fail_times: int = 0):
+        self.fail_times = fail_times
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def encode(self, texts):
+        with self._lock:
+            self.calls.append(list(texts))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            fail = self.fail_times > 0
+            if fail:
+                self.fail_times -= 1
+        try:
+            time.sleep(random.uniform(0, 0.01))
+            if fail:
+                raise ConnectionError("일시적 오류")
+            return np.array([[float(t)] for t in texts])
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestIterEmbeddings:
+    def test_results_keep_input_order(self):
+        """병렬 배치여도 입력 순서대로 반환된다."""
+        embedder = _SlowEmbedder()
+        texts = [str(i) for i in range(23)]
+
+        batches = list(iter_embeddings(embedder, texts, batch_size=5, max_workers=4))
+
+        assert [start for start, _ in batches] == [0, 5, 10, 15, 20]
+        merged = np.concatenate([emb for _, emb in batches])
+        assert merged[:, 0].tolist() == list(range(23))
+        assert merged.dtype == np.float32
+
+    def test_batch_size_and_concurrency_bounded(self):
+        """요청 크기와 동시 요청 수가 설정값을 넘지 않는다."""
+        embedder = _SlowEmbedder()
+        texts = [str(i) for i in range(50)]
+
+        list(iter_embeddings(embedder, texts, batch_size=4, max_workers=3))
+
+        assert max(len(c) for c in embedder.calls) <= 4
+        assert embedder.max_in_flight <= 3
+
+    def test_failed_batch_is_retried(self):
+        """실패한 배치만 재시도하여 전체 결과를 얻는다."""
+        embedder = _SlowEmbedder(fail_times=2)
+        texts = [str(i) for i in range(6)]
+
+        batches = list(iter_embeddings(
+            embedder, texts, batch_size=3, max_workers=1, retry_delay=0,
+        ))
+
+        merged = np.concatenate([emb for _, emb in batches])
+        assert merged[:, 0].tolist() == list(range(6))
+        assert len(embedder.calls) == 4  # 첫 배치 3회 시도 + 두 번째 배치 1회
+
+    def test_gives_up_after_max_retries(self):
+        embedder = _SlowEmbedder(fail_times=10)
+        with pytest.raises(ConnectionError):
+            list(iter_embeddings(
+                embedder, ["a", "b"], batch_size=1, max_retries=2, retry_delay=0,
+            ))
+
+    def test_empty_input(self):
+        assert list(iter_embeddings(_SlowEmbedder(), [])) == []
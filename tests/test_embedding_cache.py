@@ -0,0 +1,123 @@
+"""Embedding Cache 단위 테스트"""
+
+import sqlite3
+import time
+
+import numpy as np
+from unittest.mock import MagicMock
+from src.embedding_cache import CachedEmbedder, EmbeddingCache, cache_key, with_cache
+
+
+def _make_embedder(model: str = "test-model"):
+    """텍스트 길이를 값으로 갖는 벡터를 반환하는 Mock 임베더."""
+    mock = MagicMock()
+    mock.model = model
+    mock.encode.side_effect = lambda texts: np.array([[float(len(t)), 1.0] for t in texts])
+    return mock
+
+
+class TestEmbeddingCache:
+    def test_put_and_get(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path / "cache.db"))
+        cache.put_many({"k1": np.array([0.5, 1.5], dtype=np.float32)})
+
+        found = cache.get_many(["k1", "k2"])
+        assert list(found) == ["k1"]
+        assert found["k1"].dtype == np.float32
+        assert found["k1"].tolist() == [0.5, 1.5]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        EmbeddingCache(path).put_many({"k": np.ones(4)})
+        assert EmbeddingCache(path).get_many(["k"])["k"].tolist() == [1.0] * 4
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """용량 초과 시 가장 오래 사용되지 않은 항목부터 삭제된다."""
+        # 벡터 1개 = 16바이트, 최대 3개 분량
+        cache = EmbeddingCache(str(tmp_path / "cache.db"), max_bytes=48)
+        cache.put_many({"a": np.zeros(4)})
+        cache.put_many({"b": np.zeros(4)})
+        cache.put_many({"c": np.zeros(4)})
+        cache.get_many(["a"])  # a를 최근 사용으로 갱신
+
+        cache.put_many({"d": np.zeros(4)})
+
+        remaining = cache.get_many(["a", "b", "c", "d"])
+        assert "b" not in remaining
+        assert {"a", "d"} <= set(remaining)
+        assert len(cache) <= 3
+
+
+    def test_tracks_size_without_rescanning(self, tmp_path):
+        """저장 용량은 누적 추정하고, 다시 열면 실제 합계로 시작한다."""
+        path = str(tmp_path / "cache.db")
+        cache = EmbeddingCache(path)
+        cache.put_many({"a": np.zeros(4), "b": np.zeros(8)})
+        cache.put_many({"c": np.zeros(4)})
+        assert cache._bytes == 64
+        cache.close()
+        assert EmbeddingCache(path)._bytes == 64
+
+    def test_hit_updates_are_batched(self, tmp_path):
+        """적중 시 사용 시각은 바로 기록하지 않고, 저장이나 close 때 한 번에 기록한다."""
+        path = str(tmp_path / "cache.db")
+        cache = EmbeddingCache(path)
+        cache.put_many({"a": np.zeros(4)})
+
+        def last_used():
+            conn = sqlite3.connect(path)
+            try:
+                return conn.execute("SELECT last_used FROM embeddings WHERE key = 'a'").fetchone()[0]
+            finally:
+                conn.close()
+
+        before = last_used()
+        time.sleep(0.02)
+        cache.get_many(["a"])
+        assert last_used() == before
+        cache.close()
+        assert last_used() > before
+
+
+class TestCachedEmbedder:
+    def test_second_call_hits_cache(self, tmp_path):
+        inner = _make_embedder()
+        embedder = CachedEmbedder(inner, EmbeddingCache(str(tmp_path / "cache.db")))
+
+        first = embedder.encode(["연차", "출장비 정산"])
+        second = embedder.encode(["연차", "출장비 정산"])
+
+        assert inner.encode.call_count == 1
+        np.testing.assert_array_equal(first, second)
+        assert second.shape == (2, 2)
+
+    def test_only_misses_are_requested(self, tmp_path):
+        """캐시에 없는 텍스트만 중복 제거 후 요청한다."""
+        inner = _make_embedder()
+        embedder = CachedEmbedder(inner, EmbeddingCache(str(tmp_path / "cache.db")))
+        embedder.encode(["연차"])
+
+        result = embedder.encode(["온보딩", "연차", "온보딩"])
+
+        assert inner.encode.call_args[0][0] == ["온보딩"]
+        assert result[:, 0].tolist() == [3.0, 2.0, 3.0]
+
+    def test_single_string(self, tmp_path):
+        embedder = CachedEmbedder(_make_embedder(), EmbeddingCache(str(tmp_path / "cache.db")))
+        result = embedder.encode("휴가")
+        assert result.shape == (2,)
+        assert result.dtype == np.float32
+
+    def test_key_includes_model(self, tmp_path):
+        """모델이 다르면 같은 텍스트도 다시 임베딩한다."""
+        cache = EmbeddingCache(str(tmp_path / "cache.db"))
+        a, b = _make_embedder("model-a"), _make_embedder("model-b")
+        CachedEmbedder(a, cache).encode(["휴가"])
+        CachedEmbedder(b, cache).encode(["휴가"])
+        assert b.encode.call_count == 1
+        assert cache_key("model-a", "휴가") != cache_key("model-b", "휴가")
+
+    def test_with_cache_disabled(self):
+        inner = _make_embedder()
+        assert with_cache(inner, cache_path="") is inner
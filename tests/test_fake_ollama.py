@@ -0,0 +1,81 @@
+"""Fake Ollama 단위 테스트
+
+실제 OllamaAdapter/OllamaEmbedder로 HTTP 요청을 보내 응답 형식을 검증한다.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from benchmarks.fake_ollama import FakeOllamaConfig, FakeOllamaServer, fake_embedding
+from src.embedding import OllamaEmbedder
+from src.grader import Grader, QueryRewriter
+from src.http_session import create_session
+from src.llm_adapter import OllamaAdapter
+from src.planner import QueryPlanner, RoutePlanner
+from src.router import Router
+
+
+@pytest.fixture
+def server():
+    srv = FakeOllamaServer(config=FakeOllamaConfig(answer_tokens=8)).start()
+    yield srv
+    srv.stop()
+
+
+@pytest.fixture
+def llm(server):
+    return OllamaAdapter(model="fake", base_url=server.url, session=create_session())
+
+
+class TestFakeChat:
+    def test_pipeline_stages_get_parseable_replies(self, server, llm):
+        assert Router(llm).classify("연차 신청 방법") == "INTERNAL_SEARCH"
+
+        plan = QueryPlanner(llm).plan("연차 신청 방법", "INTERNAL_SEARCH")
+        assert plan.search_queries == ["연차 신청 방법"]
+        assert plan.keywords == ["연차", "신청", "방법"]
+
+        route, fused = RoutePlanner(llm).route_and_plan("연차 신청 방법")
+        assert route == "INTERNAL_SEARCH"
+        assert fused.search_queries == ["연차 신청 방법"]
+
+        assert Grader(llm).evaluate("연차", [{"content": "연차 15일"}]) == "PASS"
+        assert QueryRewriter(llm).rewrite("연차") == "연차 규정 절차"
+        assert server.requests == {"router": 1, "planner": 1, "route_planner": 1, "grader": 1, "rewriter": 1}
+
+    def test_answer_has_configured_token_count(self, llm):
+        resp = llm.chat([{"role": "system", "content": "시스템"}, {"role": "user", "content": "질문"}])
+        assert len(resp.content.split()) == 8
+
+    def test_stream_yields_tokens_and_metrics(self, llm):
+        stream = llm.chat_stream([{"role": "user", "content": "질문"}])
+        deltas = list(stream)
+
+        assert len(deltas) == 8
+        assert "".join(deltas) == stream.response.content
+
+    def test_latency_and_token_rate(self, server, llm):
+        server.config.latency_ms = 50
+        server.config.token_rate = 100  # 8토큰 → 80ms
+        start = time.perf_counter()
+        llm.chat([{"role": "user", "content": "질문"}])
+        assert time.perf_counter() - start >= 0.12
+
+
+class TestFakeEmbed:
+    def test_embed_is_deterministic_and_normalized(self, server):
+        embedder = OllamaEmbedder(model="fake", base_url=server.url, session=create_session())
+        a = embedder.encode(["연차 휴가 신청", "출장비 정산"])
+        b = embedder.encode("연차 휴가 신청")
+
+        assert a.shape == (2, 256)
+        np.testing.assert_allclose(a[0], b, rtol=1e-6)
+        np.testing.assert_allclose(np.linalg.norm(a, axis=1), [1.0, 1.0], rtol=1e-5)
+
+    def test_similar_texts_are_closer(self):
+        q = np.array(fake_embedding("연차 휴가 신청 방법"))
+        near = np.array(fake_embedding("연차 휴가는 HR 포털에서 신청한다"))
+        far = np.array(fake_embedding("법인카드 사용 한도"))
+        assert q @ near > q @ far
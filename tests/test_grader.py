@@ -1,7 +1,10 @@
 """Grader 및 QueryRewriter 단위 테스트"""
 
 from tests.conftest import make_mock_llm, make_text_response
-from src.grader import Grader, QueryRewriter
+from src.context_packer import ContextPacker
+import json
+
+from src.grader import Grader, GraderThresholds, QueryRewriter, RetrievalSignals
 
 
 class TestGrader:
@@ -21,6 +24,17 @@ class TestGrader:
         result = grader.evaluate("출장비 정산", docs)
         assert result == "FAIL"
 
+    def test_evaluate_packs_documents_to_budget(self):
+        llm = make_mock_llm([make_text_response("PASS")])
+        grader = Grader(llm=llm, context_packer=ContextPacker(budget_tokens=200, max_doc_tokens=100))
+
+        docs = [{"content": "연차 규정 " * 200}, {"content": "출장비 규정 " * 200}]
+        grader.evaluate("연차", docs)
+
+        user_msg = llm.chat.call_args.kwargs["messages"][1]["content"]
+        assert len(user_msg) < 600
+        assert "[문서 2]" in user_msg
+
     def test_evaluate_empty_documents(self):
         llm = make_mock_llm()
         grader = Grader(llm=llm)
@@ -63,3 +77,84 @@ class TestQueryRewriter:
 
         result = rewriter.rewrite("원본 질문")
         assert result == "원본 질문"
+
+
+def _doc(content: str, distance: float, rrf: float = 0.03) -> dict:
+    return {"content": content, "distance": distance, "rrf_score": rrf}
+
+
+class TestRetrievalSignals:
+    def test_signals_from_documents(self):
+        docs = [_doc("연차 휴가 신청은 HR 포털", 0.42, 0.032), _doc("출장 규정", 0.2, 0.030)]
+        signals = RetrievalSignals.from_documents("연차 신청", docs, keywords=["연차", "신청", "결재"])
+
+        assert signals.best_distance == 0.2
+        assert abs(signals.rrf_margin - 0.002) < 1e-9
+        assert abs(signals.keyword_overlap - 2 / 3) < 1e-9
+
+    def test_query_words_used_without_keywords(self):
+        signals = RetrievalSignals.from_documents("휴가 신청 방법", [_doc("휴가 안내", 0.3)])
+        assert abs(signals.keyword_overlap - 1 / 3) < 1e-9
+
+    def test_no_distance(self):
+        signals = RetrievalSignals.from_documents("날씨", [{"content": "맑음"}])
+        assert signals.best_distance is None
+        assert GraderThresholds().decide(signals) is None
+
+
+class TestTieredGrader:
+    THRESHOLDS = GraderThresholds(pass_max_distance=0.3, pass_min_overlap=0.5, fail_min_distance=0.7)
+
+    def test_clear_pass_skips_llm(self):
+        llm = make_mock_llm()
+        grader = Grader(llm=llm, thresholds=self.THRESHOLDS)
+
+        result = grader.evaluate("연차 신청", [_doc("연차 신청 절차", 0.1)], keywords=["연차", "신청"])
+
+        assert result == "PASS"
+        llm.chat.assert_not_called()
+        assert (grader.fast_decisions, grader.llm_calls) == (1, 0)
+
+    def test_clear_fail_skips_llm(self):
+        llm = make_mock_llm()
+        grader = Grader(llm=llm, thresholds=self.THRESHOLDS)
+
+        result = grader.evaluate("연차 신청", [_doc("회사 연혁", 0.9)], keywords=["연차"])
+
+        assert result == "FAIL"
+        llm.chat.assert_not_called()
+
+    def test_ambiguous_goes_to_llm(self):
+        llm = make_mock_llm([make_text_response("FAIL")])
+        grader = Grader(llm=llm, thresholds=self.THRESHOLDS)
+
+        result = grader.evaluate("연차 신청", [_doc("연차 안내", 0.5)], keywords=["연차"])
+
+        assert result == "FAIL"
+        assert (grader.fast_decisions, grader.llm_calls) == (0, 1)
+
+    def test_without_thresholds_always_llm(self):
+        llm = make_mock_llm([make_text_response("PASS")])
+        grader = Grader(llm=llm)
+
+        grader.evaluate("연차", [_doc("연차", 0.01)], keywords=["연차"])
+
+        llm.chat.assert_called_once()
+
+    def test_decisions_are_logged(self, tmp_path):
+        log = tmp_path / "grader_log.jsonl"
+        llm = make_mock_llm([make_text_response("PASS")])
+        grader = Grader(llm=llm, thresholds=self.THRESHOLDS, decision_log=str(log))
+
+        grader.evaluate("연차", [_doc("연차", 0.1)], keywords=["연차"])
+        grader.evaluate("출장", [_doc("출장비", 0.5)], keywords=["출장"])
+
+        entries = [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+        assert [(e["decision"], e["source"]) for e in entries] == [("PASS", "fast"), ("PASS", "llm")]
+        assert entries[0]["signals"]["best_distance"] == 0.1
+
+    def test_thresholds_save_and_load(self, tmp_path):
+        path = str(tmp_path / "thresholds.json")
+        self.THRESHOLDS.save(path)
+        assert GraderThresholds.load(path) == self.THRESHOLDS
+        assert GraderThresholds.load(str(tmp_path / "missing.json")) is None
@@ -0,0 +1,89 @@
+"""Grader 임계값 보정 테스트"""
+
+import json
+import random
+
+from src.grader import GraderThresholds, RetrievalSignals
+from src.grader_calibration import calibrate, fit_thresholds, load_samples
+
+
+def _write_jsonl(path, entries):
+    path.write_text("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries), encoding="utf-8")
+
+
+def _log_entry(query, distance, overlap, decision, source="llm"):
+    return {
+        "query": query,
+        "signals": {"best_distance": distance, "rrf_margin": 0.001, "keyword_overlap": overlap},
+        "decision": decision,
+        "source": source,
+    }
+
+
+class TestLoadSamples:
+    def test_feedback_overrides_llm_label(self, tmp_path):
+        log, feedback = tmp_path / "log.jsonl", tmp_path / "feedback.jsonl"
+        _write_jsonl(log, [
+            _log_entry("q1", 0.2, 1.0, "PASS"),
+            _log_entry("q2", 0.3, 1.0, "PASS"),
+            _log_entry("q3", 0.1, 1.0, "PASS", source="fast"),  # 피드백 없는 빠른 판단은 제외
+            _log_entry("q4", 0.9, 0.0, "FAIL", source="fast"),
+        ])
+        _write_jsonl(feedback, [
+            {"query": "q2", "answer": "a", "rating": "down"},
+            {"query": "q4", "answer": "a", "rating": "down"},
+        ])
+
+        samples = load_samples(str(log), str(feedback))
+
+        assert [label for _, label in samples] == ["PASS", "FAIL", "FAIL"]
+
+    def test_missing_files(self, tmp_path):
+        assert load_samples(str(tmp_path / "a"), str(tmp_path / "b")) == []
+
+
+class TestFitThresholds:
+    def _samples(self):
+        rng = random.Random(0)
+        samples = []
+        for _ in range(60):  # 관련 문서: 가깝고 핵심어 포함
+            samples.append((RetrievalSignals(rng.uniform(0.05, 0.4), 0.002, rng.choice([0.5, 1.0])), "PASS"))
+        for _ in range(60):  # 무관 문서: 멀고 핵심어 없음
+            samples.append((RetrievalSignals(rng.uniform(0.7, 1.0), 0.001, 0.0), "FAIL"))
+        for _ in range(30):  # 중간: 섞여 있음
+            samples.append((RetrievalSignals(rng.uniform(0.45, 0.65), 0.001, 0.5), rng.choice(["PASS", "FAIL"])))
+        return samples
+
+    def test_fitted_thresholds_meet_precision(self):
+        samples = self._samples()
+        thresholds, report = fit_thresholds(samples, precision=0.95)
+
+        assert report["pass_covered"] >= 50
+        assert report["fail_covered"] >= 50
+        for signals, label in samples:
+            decision = thresholds.decide(signals)
+            if decision and signals.best_distance < 0.42:
+                assert decision == label == "PASS"
+            if decision and signals.best_distance > 0.68:
+                assert decision == label == "FAIL"
+
+    def test_no_reliable_threshold_disables_fast_path(self):
+        rng = random.Random(1)
+        noise = [(RetrievalSignals(rng.uniform(0, 1), 0.0, 0.5), rng.choice(["PASS", "FAIL"])) for _ in range(40)]
+
+        thresholds, _ = fit_thresholds(noise, precision=0.99)
+
+        assert all(thresholds.decide(s) is None for s, _ in noise)
+
+    def test_calibrate_writes_thresholds(self, tmp_path):
+        log, out = tmp_path / "log.jsonl", tmp_path / "thresholds.json"
+        _write_jsonl(log, [
+            _log_entry(f"q{i}", s.best_distance, s.keyword_overlap, label)
+            for i, (s, label) in enumerate(self._samples())
+        ])
+
+        calibrate(str(log), str(tmp_path / "none.jsonl"), str(out))
+
+        loaded = GraderThresholds.load(str(out))
+        assert loaded.pass_max_distance > 0
+        assert loaded.fail_min_distance < 1.0
@@ -0,0 +1,46 @@
+"""HTTP Session (커넥션 풀) 단위 테스트"""
+
+from unittest.mock import MagicMock
+from src.embedding import OllamaEmbedder
+from src.http_session import create_session, get_shared_session, set_shared_session
+from src.llm_adapter import OllamaAdapter
+
+
+class TestHttpSession:
+    def test_pool_size_applied(self):
+        session = create_session(pool_size=7)
+        adapter = session.get_adapter("http://localhost:11434")
+        assert adapter._pool_maxsize == 7
+        assert session.headers["Connection"] == "keep-alive"
+
+    def test_keep_alive_disabled(self):
+        session = create_session(keep_alive=False)
+        assert session.headers["Connection"] == "close"
+
+    def test_shared_session_is_singleton(self):
+        assert get_shared_session() is get_shared_session()
+
+    def test_adapters_share_pool_by_default(self):
+        """별도 지정이 없으면 LLM/임베딩 어댑터가 같은 세션을 쓴다."""
+        llm = OllamaAdapter()
+        embedder = OllamaEmbedder()
+        assert llm.session is embedder.session is get_shared_session()
+
+    def test_set_shared_session(self):
+        original = get_shared_session()
+        custom = create_session(pool_size=2)
+        try:
+            set_shared_session(custom)
+            assert OllamaAdapter().session is custom
+        finally:
+            set_shared_session(original)
+
+    def test_custom_session_and_timeout_used(self):
+        """주입한 세션과 타임아웃으로 요청한다."""
+        session = MagicMock()
+        session.post.return_value.json.return_value = {"message": {"content": "ok"}}
+
+        adapter = OllamaAdapter(session=session, timeout=(1, 30))
+        adapter.chat([{"role": "user", "content": "hi"}])
+
+        assert session.post.call_args.kwargs["timeout"] == (1, 30)
@@ -4,8 +4,10 @@ Parent-Child Chunking + Contextual Headers를 검증한다.
 """
 
 import tempfile
+import time
 import os
 import numpy as np
+import pytest
 from unittest.mock import patch, MagicMock
 from src.vectorstore.ingest import (
     chunk_text,
@@ -15,10 +17,13 @@ from src.vectorstore.ingest import (
     extract_keywords,
     make_contextual_header,
     ingest_documents,
+    run_ingest_pipeline,
+    IngestStats,
     PARENT_CHUNK_SIZE,
     PARENT_OVERLAP,
     CHILD_CHUNK_SIZE,
     CHILD_OVERLAP,
+    MANIFEST_FILENAME,
 )
 
 
@@ -269,6 +274,34 @@ class TestIngestDocuments:
             for text in call_args:
                 assert "[출처:" not in text
 
+    @patch("src.vectorstore.ingest.OllamaEmbedder")
+    def test_embeddings_are_requested_in_batches(self, mock_st_class):
+        """Child 임베딩을 배치 크기 이하로 나눠 요청하고 모두 저장한다."""
+        mock_embedder = _make_dynamic_embedder()
+        mock_st_class.return_value = mock_embedder
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            docs_dir = os.path.join(tmpdir, "documents")
+            chroma_dir = os.path.join(tmpdir, "chroma")
+            os.makedirs(docs_dir)
+
+            with open(os.path.join(docs_dir, "policy.txt"), "w") as f:
+                f.write("연차 휴가 정책 안내: 모든 직원에게 연 15일의 연차가 부여됩니다. " * 60)
+
+            count = ingest_documents(
+                docs_dir=docs_dir, chroma_dir=chroma_dir,
+                embed_batch_size=3, embed_workers=2,
+            )
+
+            batch_sizes = [len(call[0][0]) for call in mock_embedder.encode.call_args_list]
+            assert len(batch_sizes) > 1
+            assert max(batch_sizes) <= 3
+            assert sum(batch_sizes) == count
+
+            import chromadb
+            client = chromadb.PersistentClient(path=chroma_dir)
+            assert client.get_collection("children").count() == count
+
     @patch("src.vectorstore.ingest.OllamaEmbedder")
     def test_child_has_keywords_metadata(self, mock_st_class):
         """Child 메타데이터에 keywords가 포함."""
@@ -289,3 +322,254 @@ class TestIngestDocuments:
             children = client.get_collection("children")
             data = children.get(limit=1)
             assert "keywords" in data["metadatas"][0]
+
+    @patch("src.vectorstore.ingest.OllamaEmbedder")
+    def test_ingest_writes_bm25_index(self, mock_st_class):
+        """인제스트 시 Child 컬렉션과 일치하는 BM25 디스크 인덱스가 저장된다."""
+        from src.retriever import NumpyBM25, bm25_index_path, read_corpus_generation
+
+        mock_st_class.return_value = _make_dynamic_embedder()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            docs_dir = os.path.join(tmpdir, "documents")
+            chroma_dir = os.path.join(tmpdir, "chroma")
+            os.makedirs(docs_dir)
+
+            with open(os.path.join(docs_dir, "policy.txt"), "w") as f:
+                f.write("연차 휴가 정책 안내: 모든 직원에게 연 15일의 연차가 부여됩니다." * 10)
+
+            count = ingest_documents(docs_dir=docs_dir, chroma_dir=chroma_dir)
+
+            bm25 = NumpyBM25.load(bm25_index_path(chroma_dir))
+            assert bm25.doc_count == count
+            assert bm25.generation == read_corpus_generation(chroma_dir)
+            assert all(doc_id.startswith("policy.txt_p") for doc_id in bm25.doc_ids)
+            # 헤더 토큰("출처")은 인덱싱되지 않음
+            assert "출처" not in bm25.vocab
+            assert bm25.search("연차", top_k=1)[0][1] > 0
+
+
+class TestIncrementalIngest:
+    def _write(self, docs_dir, name, text):
+        with open(os.path.join(docs_dir, name), "w") as f:
+            f.write(text)
+
+    def _encoded_texts(self, mock_embedder):
+        return [t for call in mock_embedder.encode.call_args_list for t in call[0][0]]
+
+    @patch("src.vectorstore.ingest.OllamaEmbedder")
+    def test_unchanged_files_are_not_reembedded(self, mock_st_class):
+        """변경 없는 재실행은 임베딩을 호출하지 않는다."""
+        mock_embedder = _make_dynamic_embedder()
+        mock_st_class.return_value = mock_embedder
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            docs_dir = os.path.join(tmpdir, "documents")
+            chroma_dir = os.path.join(tmpdir, "chroma")
+            os.makedirs(docs_dir)
+            self._write(docs_dir, "a.txt", "연차 휴가 정책 안내입니다. " * 20)
+            self._write(docs_dir, "b.txt", "출장비 정산 절차 안내입니다. " * 20)
+
+            first = ingest_documents(docs_dir=docs_dir, chroma_dir=chroma_dir, incremental=True)
+            assert first > 0
+            mock_embedder.encode.reset_mock()
+
+            second = ingest_documents(docs_dir=docs_dir, chroma_dir=chroma_dir, incremental=True)
+            assert second == 0
+            mock_embedder.encode.assert_not_called()
+
+    @patch("src.vectorstore.ingest.OllamaEmbedder")
+    def test_ingest_bumps_corpus_generation(self, mock_st_class):
+        """데이터가 바뀐 인제스트만 세대 마커를 갱신한다."""
+        from src.retriever import read_corpus_generation
+
+        mock_st_class.return_value = _make_dynamic_embedder()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            docs_dir = os.path.join(tmpdir, "documents")
+            chroma_dir = os.path.join(tmpdir, "chroma")
+            os.makedirs(docs_dir)
+            self._write(docs_dir, "a.txt", "연차 휴가 정책 안내입니다. " * 20)
+
+            ingest_documents(docs_dir=docs_dir, chroma_dir=chroma_dir, incremental=True)
+            first = read_corpus_generation(chroma_dir)
+            assert first
+
+            ingest_documents(docs_dir=docs_dir, chroma_dir=chroma_dir, incremental=True)
+            assert read_corpus_generation(chroma_dir) == first
+
+            self._write(docs_dir, "a.txt", "재택근무 신청 방법입니다.")
+            ingest_documents(docs_dir=docs_dir, chroma_dir=chroma_dir, incremental=True)
+            assert read_corpus_generation(chroma_dir) != first
+
+    @patch("src.vectorstore.ingest.OllamaEmbedder")
+    def test_only_changed_file_is_reembedded(self, mock_st_class):
+        """변경된 파일만 다시 임베딩하고, 줄어든 청크는 제거된다."""
+        mock_embedder = _make_dynamic_embedder()
+        mock_st_class.return_value = mock_embedder
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            docs_dir = os.path.join(tmpdir, "documents")
+            chroma_dir = os.path.join(tmpdir, "chroma")
+            os.makedirs(docs_dir)
+            self._write(docs_dir, "a.txt", "연차 휴가 정책 안내입니다. " * 100)
+            self._write(docs_dir, "b.txt", "출장비 정산 절차 안내입니다. " * 20)
+            ingest_documents(docs_dir=docs_dir, chroma_dir=chroma_dir, incremental=True)
+            mock_embedder.encode.reset_mock()
+
+            self._write(docs_dir, "a.txt", "재택근무 신청 방법입니다.")
+            count = ingest_documents(docs_dir=docs_dir, chroma_dir=chroma_dir, incremental=True)
+
+            assert count == 1
+            assert self._encoded_texts(mock_embedder) == ["재택근무 신청 방법입니다."]
+
+            import chromadb
+            client = chromadb.PersistentClient(path=chroma_dir)
+            children = client.get_collection("children")
+            data = children.get(where={"source": "a.txt"})
+            assert data["ids"] == ["a.txt_p0_c0"]
+            assert client.get_collection("parents").get(where={"source": "a.txt"})["ids"] == ["a.txt_p0"]
+
+    @patch("src.vectorstore.ingest.OllamaEmbedder")
+    def test_removed_file_chunks_are_deleted(self, mock_st_class):
+        """삭제된 파일의 청크와 BM25 항목이 제거된다."""
+        from src.retriever import NumpyBM25, bm25_index_path
+
+        mock_st_class.return_value = _make_dynamic_embedder()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            docs_dir = os.path.join(tmpdir, "documents")
+            chroma_dir = os.path.join(tmpdir, "chroma")
+            os.makedirs(docs_dir)
+            self._write(docs_dir, "a.txt", "연차 휴가 정책 안내입니다. " * 20)
+            self._write(docs_dir, "b.txt", "출장비 정산 절차 안내입니다. " * 20)
+            ingest_documents(docs_dir=docs_dir, chroma_dir=chroma_dir, incremental=True)
+
+            os.remove(os.path.join(docs_dir, "b.txt"))
+            ingest_documents(docs_dir=docs_dir, chroma_dir=chroma_dir, incremental=True)
+
+            import chromadb
+            client = chromadb.PersistentClient(path=chroma_dir)
+            children = client.get_collection("children")
+            assert children.get(where={"source": "b.txt"})["ids"] == []
+
+            bm25 = NumpyBM25.load(bm25_index_path(chroma_dir))
+            assert bm25.doc_count == children.count()
+            assert not any(doc_id.startswith("b.txt") for doc_id in bm25.doc_ids)
+            assert "출장비" not in bm25.vocab
+
+    @patch("src.vectorstore.ingest.OllamaEmbedder")
+    def test_embedding_cache_reused_on_full_rebuild(self, mock_st_class):
+        """임베딩 캐시를 쓰면 전체 재인제스트에서도 같은 청크를 다시 임베딩하지 않는다."""
+        mock_embedder = _make_dynamic_embedder()
+        mock_embedder.model = "test-model"
+        mock_st_class.return_value = mock_embedder
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            docs_dir = os.path.join(tmpdir, "documents")
+            chroma_dir = os.path.join(tmpdir, "chroma")
+            cache_path = os.path.join(tmpdir, "embedding_cache.db")
+            os.makedirs(docs_dir)
+            self._write(docs_dir, "a.txt", "연차 휴가 정책 안내입니다. " * 20)
+
+            ingest_documents(docs_dir=docs_dir, chroma_dir=chroma_dir, embedding_cache=cache_path)
+            mock_embedder.encode.reset_mock()
+            count = ingest_documents(docs_dir=docs_dir, chroma_dir=chroma_dir, embedding_cache=cache_path)
+
+            assert count > 0
+            mock_embedder.encode.assert_not_called()
+
+    @patch("src.vectorstore.ingest.OllamaEmbedder")
+    def test_missing_manifest_triggers_full_rebuild(self, mock_st_class):
+        """매니페스트 없이 incremental로 실행하면 전체 인제스트한다."""
+        mock_st_class.return_value = _make_dynamic_embedder()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            docs_dir = os.path.join(tmpdir, "documents")
+            chroma_dir = os.path.join(tmpdir, "chroma")
+            os.makedirs(docs_dir)
+            self._write(docs_dir, "a.txt", "연차 휴가 정책 안내입니다. " * 20)
+
+            full = ingest_documents(docs_dir=docs_dir, chroma_dir=chroma_dir)
+            os.remove(os.path.join(chroma_dir, MANIFEST_FILENAME))
+
+            count = ingest_documents(docs_dir=docs_dir, chroma_dir=chroma_dir, incremental=True)
+            assert count == full
+
+
+class TestIngestPipeline:
+    def _make_files(self, tmpdir, n):
+        files = []
+        for i in range(n):
+            path = os.path.join(tmpdir, f"doc{i}.txt")
+            with open(path, "w") as f:
+                f.write(f"문서 {i}번 내용입니다. 연차 휴가 정책 안내. " * 30)
+            files.append((f"doc{i}.txt", path))
+        return files
+
+    def test_pipeline_writes_all_chunks_and_reports_stats(self):
+        """모든 Child/Parent가 저장되고 단계별 처리량이 집계된다."""
+        from src.retriever import BM25Builder
+
+        embedder = _make_dynamic_embedder()
+        children_col, parents_col = MagicMock(), MagicMock()
+        manifest_files = {}
+        builder = BM25Builder()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            files = self._make_files(tmpdir, 5)
+            stats = run_ingest_pipeline(
+                files, embedder, children_col, parents_col, manifest_files,
+                bm25_builder=builder, embed_batch_size=4, embed_workers=2, queue_size=2,
+            )
+
+        written_children = [i for c in children_col.upsert.call_args_list for i in c.kwargs["ids"]]
+        written_parents = [i for c in parents_col.upsert.call_args_list for i in c.kwargs["ids"]]
+        expected_children = [i for rel in sorted(manifest_files) for i in manifest_files[rel]["child_ids"]]
+
+        assert stats.files == 5
+        assert stats.chunks == stats.embeds == len(written_children)
+        assert written_children == expected_children  # 입력 순서 유지
+        assert len(written_parents) == stats.parents
+        assert max(len(c.kwargs["ids"]) for c in children_col.upsert.call_args_list) <= 4
+        assert builder.build().doc_ids == written_children
+        assert "files/s" in stats.summary() and "embeds/s" in stats.summary()
+
+    def test_stage_times_exclude_queue_waits(self):
+        """느린 임베딩을 기다리는 동안의 큐 대기는 읽기/청크 시간에 들어가지 않는다."""
+        embedder = _make_dynamic_embedder()
+        encode = embedder.encode.side_effect
+
+        def slow_encode(texts):
+            time.sleep(0.03)
+            return encode(texts)
+
+        embedder.encode.side_effect = slow_encode
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            files = self._make_files(tmpdir, 10)
+            stats = run_ingest_pipeline(
+                files, embedder, MagicMock(), MagicMock(), {},
+                embed_batch_size=2, embed_workers=1, queue_size=1,
+            )
+
+        assert stats.embed_seconds >= 0.03 * embedder.encode.call_count * 0.9
+        assert stats.chunk_seconds < stats.total_seconds / 4
+        assert stats.write_seconds < stats.total_seconds / 4
+
+    def test_embedding_failure_stops_pipeline(self):
+        """임베딩 단계가 실패하면 예외가 전파되고 파이프라인이 멈춘다."""
+        embedder = MagicMock()
+        embedder.encode.side_effect = RuntimeError("Ollama 다운")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            files = self._make_files(tmpdir, 20)
+            with patch("src.embedding.time.sleep"):
+                with pytest.raises(RuntimeError):
+                    run_ingest_pipeline(
+                        files, embedder, MagicMock(), MagicMock(), {},
+                        embed_batch_size=2, queue_size=1,
+                    )
+
+    def test_stats_summary_without_elapsed_time(self):
+        assert "-" in IngestStats().summary()
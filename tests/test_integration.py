@@ -17,10 +17,10 @@ from tests.conftest import (
 from src.llm_adapter import LLMResponse, ToolCall
 from src.agent import AgentCore
 from src.router import Router
-from src.planner import QueryPlanner
+from src.planner import QueryPlanner, RoutePlanner
 from src.grader import Grader, QueryRewriter
 from src.hitl import HITLManager, HITLContext
-from src.main import process_query
+from src.main import StreamPrinter, process_query
 
 
 def _make_pipeline(llm_responses: list[LLMResponse], hitl_mode: str = "off"):
@@ -58,6 +58,42 @@ class TestIntegrationChitchat:
         assert "안녕" in answer or "도와" in answer
 
 
+class TestIntegrationStreaming:
+    """답변 스트리밍 출력"""
+
+    def test_answer_tokens_are_printed_as_generated(self, capsys):
+        plan_json = json.dumps({"search_queries": ["휴가 신청 절차"], "strategy": "SINGLE"})
+        responses = iter([
+            make_text_response("INTERNAL_SEARCH"),
+            make_text_response(plan_json),
+            None,  # answer_with_context: 스트리밍
+            make_text_response("PASS"),
+        ])
+
+        def chat(messages, tools=None, on_token=None, **kwargs):
+            response = next(responses)
+            if response is None:
+                for delta in ["휴가는 ", "HR 포털에서 ", "신청합니다."]:
+                    on_token(delta)
+                response = make_text_response("휴가는 HR 포털에서 신청합니다.")
+            return response
+
+        components = _make_pipeline([])
+        components["agent"].llm.chat.side_effect = chat
+        stream = StreamPrinter()
+
+        answer = process_query(
+            query="휴가 신청 방법 알려줘",
+            conversation_history=[],
+            stream=stream,
+            **components,
+        )
+
+        out = capsys.readouterr().out
+        assert "[봇] 휴가는 HR 포털에서 신청합니다." in out
+        assert stream.shown(answer)
+
+
 class TestIntegrationInternalSearch:
     """INTERNAL_SEARCH 경로 통합 테스트
 
@@ -120,6 +156,85 @@ class TestIntegrationInternalSearch:
 
         assert "출장" in answer or "정산" in answer
 
+    def test_fused_routing_mode(self):
+        """fused 모드: 라우팅+플래닝 1회 + 답변 1회 + Grader 1회 = 3회."""
+        fused_json = json.dumps({
+            "route": "INTERNAL_SEARCH",
+            "intent": "휴가 신청 방법",
+            "search_queries": ["휴가 신청 절차"],
+            "strategy": "SINGLE",
+        })
+        llm_responses = [
+            make_text_response(fused_json),            # RoutePlanner
+            make_text_response("휴가 신청은 HR 포털에서 가능합니다."),  # answer_with_context
+            make_text_response("PASS"),                # Grader
+        ]
+        components = _make_pipeline(llm_responses)
+        llm = components["agent"].llm
+
+        answer = process_query(
+            query="휴가 신청 방법 알려줘",
+            conversation_history=[],
+            route_planner=RoutePlanner(llm=llm),
+            **components,
+        )
+
+        assert "휴가" in answer
+        assert llm.chat.call_count == 3
+        search_args = components["agent"].mcp.call_tool.call_args_list[0][0][1]
+        assert search_args.get("query", search_args.get("queries")) in ("휴가 신청 절차", ["휴가 신청 절차"])
+
+
+    def test_speculative_hit_skips_planned_search(self):
+        """추측 검색이 적중하면 Planner 검색어로 다시 검색하지 않는다."""
+        from src.main import _parse_mcp_results
+        from src.speculative import SpeculativeSearch
+
+        plan_json = json.dumps({
+            "intent": "휴가 신청 방법",
+            "keywords": ["휴가", "신청"],
+            "search_queries": ["휴가 신청 방법"],
+            "strategy": "SINGLE",
+        })
+        llm_responses = [
+            make_text_response("INTERNAL_SEARCH"),
+            make_text_response(plan_json),
+            make_text_response("휴가 신청은 HR 포털에서 가능합니다."),
+            make_text_response("PASS"),
+        ]
+        components = _make_pipeline(llm_responses)
+        mcp = components["agent"].mcp
+        speculative = SpeculativeSearch(
+            lambda q: _parse_mcp_results(mcp.call_tool("vector-search__search_vector_db", {"query": q, "top_k": 5})),
+        )
+
+        answer = process_query(
+            query="휴가 신청 방법 알려줘",
+            conversation_history=[],
+            speculative=speculative,
+            **components,
+        )
+        speculative.close()
+
+        assert "휴가" in answer
+        searched = [c.args[1]["query"] for c in mcp.call_tool.call_args_list]
+        assert searched == ["휴가 신청 방법 알려줘"]
+        assert speculative.stats.hits == 1
+
+    def test_speculative_discarded_for_chitchat(self):
+        from src.speculative import SpeculativeSearch
+
+        components = _make_pipeline([
+            make_text_response("CHITCHAT"),
+            make_text_response("안녕하세요!"),
+        ])
+        speculative = SpeculativeSearch(lambda q: [])
+
+        process_query(query="안녕", conversation_history=[], speculative=speculative, **components)
+        speculative.close()
+
+        assert speculative.stats.discarded == 1
+
 
 class TestIntegrationWebSearch:
     """WEB_SEARCH 경로 통합 테스트"""
@@ -312,3 +427,62 @@ class TestDirectSearchHelpers:
         ]
         result = _dedup_documents(docs)
         assert len(result) == 2
+
+    def test_direct_search_runs_queries_in_parallel(self):
+        """여러 검색어를 동시에 요청하고, 결과는 쿼리 순서대로 합쳐 중복 제거한다."""
+        import threading
+        import time
+        from src.main import _direct_search
+
+        delays = {"느린 쿼리": 0.3, "빠른 쿼리": 0.1}
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def call_tool(name, args):
+            with lock:
+                in_flight.append(args["query"])
+                peak.append(len(in_flight))
+            time.sleep(delays[args["query"]])
+            with lock:
+                in_flight.remove(args["query"])
+            docs = [{"content": f"{args['query']} 문서"}, {"content": "공통 문서"}]
+            return json.dumps({"content": [{"type": "text", "text": json.dumps(docs, ensure_ascii=False)}]})
+
+        mcp = make_mock_mcp()
+        mcp.call_tool.side_effect = call_tool
+
+        docs = _direct_search(mcp, "vector-search__search_vector_db", ["느린 쿼리", "빠른 쿼리"])
+
+        assert max(peak) == 2
+        assert [d["content"] for d in docs] == ["느린 쿼리 문서", "공통 문서", "빠른 쿼리 문서"]
+
+    def test_direct_search_uses_batch_tool(self):
+        """배치 도구가 있으면 모든 검색어를 한 번의 호출로 보낸다."""
+        from src.main import _direct_search
+
+        mcp = make_mock_mcp()
+        mcp.get_tools_for_llm.return_value = mcp.get_tools_for_llm.return_value + [
+            {"name": "vector-search__search_vector_db_batch", "description": "", "parameters": {}},
+        ]
+        batch = [[{"content": "연차 문서"}, {"content": "공통 문서"}], [{"content": "공통 문서"}]]
+        mcp.call_tool.side_effect = lambda name, args: json.dumps({
+            "content": [{"type": "text", "text": json.dumps(docs, ensure_ascii=False)} for docs in batch]
+        })
+
+        docs = _direct_search(mcp, "vector-search__search_vector_db", ["연차", "휴가"], top_k=3)
+
+        mcp.call_tool.assert_called_once_with(
+            "vector-search__search_vector_db_batch", {"queries": ["연차", "휴가"], "top_k": 3},
+        )
+        assert [d["content"] for d in docs] == ["연차 문서", "공통 문서"]
+
+    def test_find_search_tool_ignores_batch_tool(self):
+        from src.main import _find_search_tool
+
+        mcp = make_mock_mcp()
+        mcp.get_tools_for_llm.return_value = [
+            {"name": "vector-search__search_vector_db_batch", "description": "", "parameters": {}},
+            {"name": "vector-search__search_vector_db", "description": "", "parameters": {}},
+        ]
+        assert _find_search_tool(mcp, "INTERNAL_SEARCH") == "vector-search__search_vector_db"
@@ -3,7 +3,7 @@
 import json
 import pytest
 from unittest.mock import patch, MagicMock
-from src.llm_adapter import OllamaAdapter, LLMResponse, ToolCall
+from src.llm_adapter import OllamaAdapter, LLMResponse, ThinkFilter, ToolCall
 
 
 class TestLLMResponse:
@@ -20,7 +20,7 @@ class TestLLMResponse:
 
 
 class TestOllamaAdapter:
-    @patch("src.llm_adapter.requests.post")
+    @patch("src.http_session.requests.Session.post")
     def test_chat_text_only(self, mock_post):
         """도구 없이 텍스트만 반환하는 경우."""
         mock_response = MagicMock()
@@ -36,7 +36,7 @@ class TestOllamaAdapter:
         assert result.content == "안녕하세요!"
         assert result.has_tool_calls() is False
 
-    @patch("src.llm_adapter.requests.post")
+    @patch("src.http_session.requests.Session.post")
     def test_chat_with_tool_calls(self, mock_post):
         """도구 호출을 포함하는 응답."""
         mock_response = MagicMock()
@@ -67,7 +67,7 @@ class TestOllamaAdapter:
         assert result.tool_calls[0].name == "search_vector_db"
         assert result.tool_calls[0].arguments == {"query": "휴가 신청", "top_k": 3}
 
-    @patch("src.llm_adapter.requests.post")
+    @patch("src.http_session.requests.Session.post")
     def test_chat_with_string_arguments(self, mock_post):
         """arguments가 문자열로 오는 경우 JSON 파싱."""
         mock_response = MagicMock()
@@ -92,7 +92,7 @@ class TestOllamaAdapter:
 
         assert result.tool_calls[0].arguments == {"query": "test"}
 
-    @patch("src.llm_adapter.requests.post")
+    @patch("src.http_session.requests.Session.post")
     def test_chat_sends_correct_payload(self, mock_post):
         """올바른 페이로드를 전송하는지 확인."""
         mock_response = MagicMock()
@@ -112,3 +112,97 @@ class TestOllamaAdapter:
         assert payload["stream"] is False
         assert len(payload["tools"]) == 1
         assert payload["tools"][0]["function"]["name"] == "t1"
+
+
+def _stream_response(chunks: list[dict]) -> MagicMock:
+    """NDJSON 스트리밍 응답 Mock."""
+    mock_response = MagicMock()
+    mock_response.iter_lines.return_value = [json.dumps(c).encode() for c in chunks]
+    mock_response.raise_for_status = MagicMock()
+    return mock_response
+
+
+def _content_chunks(pieces: list[str]) -> list[dict]:
+    chunks = [{"message": {"role": "assistant", "content": p}, "done": False} for p in pieces]
+    chunks.append({"message": {"role": "assistant", "content": ""}, "done": True})
+    return chunks
+
+
+class TestThinkFilter:
+    TEXT = "<think>\n질문을 분석하면...</think>\n\n휴가는 <b>15일</b>입니다. <think>x</think> 끝"
+
+    def _run(self, pieces: list[str]) -> str:
+        f = ThinkFilter()
+        return "".join(f.feed(p) for p in pieces) + f.flush()
+
+    def test_tags_split_at_every_position(self):
+        """태그가 어느 위치에서 잘려 와도 비스트리밍 결과와 같다."""
+        expected = "휴가는 <b>15일</b>입니다. 끝"
+        for i in range(1, len(self.TEXT)):
+            for j in range(i, len(self.TEXT)):
+                pieces = [self.TEXT[:i], self.TEXT[i:j], self.TEXT[j:]]
+                assert self._run(pieces).strip() == expected
+
+    def test_single_characters(self):
+        assert self._run(list(self.TEXT)).strip() == "휴가는 <b>15일</b>입니다. 끝"
+
+    def test_partial_tag_prefix_is_held_then_released(self):
+        f = ThinkFilter()
+        assert f.feed("a <thi") == "a "
+        assert f.feed("s is text") == "<this is text"
+
+    def test_unclosed_think_is_dropped(self):
+        assert self._run(["답변", "<think>끝나지 않은 생각"]) == "답변"
+
+
+class TestOllamaAdapterStream:
+    @patch("src.http_session.requests.Session.post")
+    def test_chat_stream_yields_deltas_and_builds_response(self, mock_post):
+        mock_post.return_value = _stream_response(
+            _content_chunks(["<thi", "nk>생각</th", "ink>\n안녕", "하세요", "!"])
+        )
+
+        adapter = OllamaAdapter()
+        stream = adapter.chat_stream([{"role": "user", "content": "안녕"}])
+        deltas = list(stream)
+
+        assert deltas == ["안녕", "하세요", "!"]
+        assert stream.response.content == "안녕하세요!"
+        payload = mock_post.call_args.kwargs["json"]
+        assert payload["stream"] is True
+        assert mock_post.call_args.kwargs["stream"] is True
+        mock_post.return_value.close.assert_called_once()
+
+    @patch("src.http_session.requests.Session.post")
+    def test_chat_stream_collects_tool_calls(self, mock_post):
+        mock_post.return_value = _stream_response([
+            {"message": {"content": "", "tool_calls": [
+                {"function": {"name": "search_vector_db", "arguments": '{"query": "휴가"}'}},
+            ]}, "done": False},
+            {"message": {"content": ""}, "done": True},
+        ])
+
+        stream = OllamaAdapter().chat_stream(
+            [{"role": "user", "content": "test"}],
+            tools=[{"name": "search", "description": "desc", "parameters": {}}],
+        )
+        assert list(stream) == []
+        assert stream.response.tool_calls[0].name == "search_vector_db"
+        assert stream.response.tool_calls[0].arguments == {"query": "휴가"}
+
+    @patch("src.http_session.requests.Session.post")
+    def test_chat_with_on_token_streams(self, mock_post):
+        mock_post.return_value = _stream_response(_content_chunks(["휴가는 ", "15일", "입니다."]))
+        tokens = []
+
+        result = OllamaAdapter().chat([{"role": "user", "content": "q"}], on_token=tokens.append)
+
+        assert tokens == ["휴가는 ", "15일", "입니다."]
+        assert result.content == "휴가는 15일입니다."
+
+    @patch("src.http_session.requests.Session.post")
+    def test_stream_error_chunk_raises(self, mock_post):
+        mock_post.return_value = _stream_response([{"error": "model not found"}])
+
+        with pytest.raises(RuntimeError):
+            list(OllamaAdapter().chat_stream([{"role": "user", "content": "q"}]))
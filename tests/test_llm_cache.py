@@ -0,0 +1,139 @@
+"""LLM Cache 단위 테스트"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.llm_adapter import OllamaAdapter
+from src.llm_cache import LLMCache, SQLiteLLMCache, create_llm_cache, llm_cache_key
+
+
+def _payload(content="연차 신청 방법", model="qwen3:14b", **extra):
+    return {"model": model, "messages": [{"role": "user", "content": content}], "stream": False, **extra}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        c = LLMCache(max_entries=3, ttl=60)
+    else:
+        c = SQLiteLLMCache(str(tmp_path / "llm_cache.db"), max_entries=3, ttl=60)
+    yield c
+    c.close()
+
+
+class TestLLMCacheKey:
+    def test_ignores_stream_flag(self):
+        assert llm_cache_key(_payload(stream=True)) == llm_cache_key(_payload())
+
+    def test_depends_on_model_messages_tools_options(self):
+        base = llm_cache_key(_payload())
+        assert llm_cache_key(_payload(model="other")) != base
+        assert llm_cache_key(_payload(content="다른 질문")) != base
+        assert llm_cache_key(_payload(tools=[{"type": "function"}])) != base
+        assert llm_cache_key(_payload(options={"num_ctx": 8192})) != base
+
+
+class TestLLMCacheBackends:
+    def test_put_and_get(self, cache):
+        cache.put("k", {"content": "INTERNAL_SEARCH", "tool_calls": []})
+        assert cache.get("k") == {"content": "INTERNAL_SEARCH", "tool_calls": []}
+        assert cache.get("missing") is None
+
+    def test_ttl_expiry(self, cache):
+        cache.put("k", {"content": "x"})
+        with patch("src.llm_cache.time.time", return_value=10**12):
+            assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_size_bounded_eviction(self, cache):
+        for key in ["a", "b", "c"]:
+            cache.put(key, {"content": key})
+        cache.get("a")  # a를 최근 사용으로
+        cache.put("d", {"content": "d"})
+
+        assert len(cache) <= 3
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("d") is not None
+
+    def test_stage_stats(self, cache):
+        cache.record("router", hit=False)
+        cache.record("router", hit=True)
+        cache.record("grader", hit=False)
+
+        assert cache.hit_rate("router") == 0.5
+        assert cache.hit_rate("grader") == 0.0
+        assert "router 1/2 (50%)" in cache.summary()
+
+
+class TestSQLiteLLMCache:
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "llm_cache.db")
+        first = SQLiteLLMCache(path)
+        first.put("k", {"content": "PASS"})
+        first.close()
+
+        second = SQLiteLLMCache(path)
+        assert second.get("k") == {"content": "PASS"}
+        second.close()
+
+    def test_create_llm_cache_backend(self, tmp_path):
+        assert isinstance(create_llm_cache(path=""), LLMCache)
+        disk = create_llm_cache(path=str(tmp_path / "c.db"))
+        assert isinstance(disk, SQLiteLLMCache)
+        disk.close()
+
+
+def _mock_post(content: str) -> MagicMock:
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"message": {"content": content}}
+    mock_response.raise_for_status = MagicMock()
+    return mock_response
+
+
+class TestAdapterCache:
+    @patch("src.http_session.requests.Session.post")
+    def test_same_request_is_served_from_cache(self, mock_post):
+        mock_post.return_value = _mock_post("INTERNAL_SEARCH")
+        cache = LLMCache(stages=["router"])
+        adapter = OllamaAdapter(cache=cache)
+        messages = [{"role": "user", "content": "연차 신청 방법"}]
+
+        first = adapter.chat(messages, cache_stage="router")
+        second = adapter.chat(messages, cache_stage="router")
+
+        assert first.content == second.content == "INTERNAL_SEARCH"
+        assert mock_post.call_count == 1
+        assert cache.stats["router"] == {"hits": 1, "misses": 1}
+
+    @patch("src.http_session.requests.Session.post")
+    def test_call_without_stage_bypasses_cache(self, mock_post):
+        mock_post.return_value = _mock_post("답변")
+        cache = LLMCache(stages=["router"])
+        adapter = OllamaAdapter(cache=cache)
+        messages = [{"role": "user", "content": "q"}]
+
+        adapter.chat(messages)
+        adapter.chat(messages)
+        adapter.chat(messages, cache_stage="grader")  # 꺼진 단계
+
+        assert mock_post.call_count == 3
+        assert len(cache) == 0
+        assert cache.stats == {}
+
+    @patch("src.http_session.requests.Session.post")
+    def test_tool_calls_are_cached(self, mock_post):
+        mock_post.return_value = MagicMock(json=MagicMock(return_value={"message": {
+            "content": "",
+            "tool_calls": [{"function": {"name": "search", "arguments": {"query": "휴가"}}}],
+        }}))
+        adapter = OllamaAdapter(cache=LLMCache(stages=["planner"]))
+        tools = [{"name": "search", "description": "d", "parameters": {}}]
+
+        adapter.chat([{"role": "user", "content": "q"}], tools=tools, cache_stage="planner")
+        cached = adapter.chat([{"role": "user", "content": "q"}], tools=tools, cache_stage="planner")
+
+        assert mock_post.call_count == 1
+        assert cached.tool_calls[0].name == "search"
+        assert cached.tool_calls[0].arguments == {"query": "휴가"}
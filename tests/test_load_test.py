@@ -0,0 +1,55 @@
+"""Load Test 단위 테스트"""
+
+import json
+
+from benchmarks.load_test import format_report, parse_args, run_load_test, summarize
+
+
+def _record(total_ms, spans):
+    return {"total_ms": total_ms, "spans": spans}
+
+
+class TestSummarize:
+    def test_percentiles_and_rate_per_stage(self):
+        records = [
+            _record(100.0 + i, [
+                {"name": "router", "parent": None, "duration_ms": float(i)},
+                {"name": "llm", "parent": "router", "stage": "router", "duration_ms": 1.0},
+                {"name": "llm", "parent": "answer", "stage": None, "duration_ms": 5.0},
+            ])
+            for i in range(1, 101)
+        ]
+        stats = {s.stage: s for s in summarize(records, wall_sec=10.0)}
+
+        assert list(stats)[0] == "query"
+        assert stats["query"].count == 100
+        assert stats["router"].p50_ms == 50.5
+        assert stats["router"].p99_ms == 99.01
+        assert stats["router"].per_sec == 10.0
+        assert stats["llm.router"].count == 100
+        assert stats["llm.answer"].mean_ms == 5.0
+
+    def test_report_has_row_per_stage(self):
+        stats = summarize([_record(10.0, [{"name": "search", "parent": None, "duration_ms": 3.0}])], 1.0)
+        lines = format_report(stats).splitlines()
+        assert lines[0].split()[:2] == ["stage", "count"]
+        assert [line.split()[0] for line in lines[2:]] == ["query", "search"]
+
+
+class TestRunLoadTest:
+    def test_end_to_end_with_fake_ollama(self, tmp_path):
+        """Fake Ollama + 실제 인제스트·MCP 서버·Chroma로 질의를 돌려 단계별 통계를 낸다."""
+        out = tmp_path / "result.json"
+        args = parse_args([
+            "--queries", "4", "--concurrency", "2", "--warmup", "1", "--stream",
+            "--answer-tokens", "5", "--workdir", str(tmp_path / "work"), "--out", str(out),
+        ])
+        stats = {s.stage: s for s in run_load_test(args)}
+
+        assert stats["query"].count == 4
+        assert stats["search"].count == 4
+        assert stats["vector-search:retriever.chroma_query"].count == 4
+        assert stats["llm.answer"].count == 4
+        report = json.loads(out.read_text(encoding="utf-8"))
+        assert report["queries"] == 4
+        assert report["qps"] > 0
@@ -0,0 +1,259 @@
+"""MCP Client 단위 테스트
+
+가짜 MCP 서버 프로세스로 요청 id 다중화, 타임아웃, 연결 종료 처리,
+워커 풀 분산/재시작을 검증한다.
+"""
+
+import json
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.mcp_client import MCPClient
+
+# 요청마다 스레드로 처리해 delay만큼 늦게, 도착 순서와 다르게 응답하는 서버
+FAKE_SERVER = r'''
+import json, os, sys, threading, time
+
+lock = threading.Lock()
+
+def write(msg):
+    with lock:
+        sys.stdout.write(msg + "\n")
+        sys.stdout.flush()
+
+def handle(req):
+    method = req.get("method")
+    if method == "initialize":
+        result = {"protocolVersion": "2024-11-05", "capabilities": {"tools": {}}}
+    elif method == "tools/list":
+        result = {"tools": [{"name": "echo", "description": "echo", "inputSchema": {}}]}
+    elif method == "tools/call":
+        args = req["params"]["arguments"]
+        if args.get("noise"):
+            write("not json")
+            write(json.dumps({"jsonrpc": "2.0", "id": 99999, "result": {}}))
+        if args.get("exit"):
+            sys.stdout.flush()
+            os._exit(0)
+        time.sleep(args.get("delay", 0))
+        text = str(os.getpid()) if args.get("pid") else args.get("tag", "")
+        result = {"content": [{"type": "text", "text": text}]}
+        if req["params"].get("_meta", {}).get("trace"):
+            result["_meta"] = {"spans": [{"name": "work", "parent": None, "start_ms": 0.5, "duration_ms": 1.0}]}
+    else:
+        result = {}
+    write(json.dumps({"jsonrpc": "2.0", "id": req.get("id"), "result": result}))
+
+for line in sys.stdin:
+    if line.strip():
+        threading.Thread(target=handle, args=(json.loads(line),), daemon=True).start()
+'''
+
+
+def _connect(tmp_path, **server_cfg) -> MCPClient:
+    server = tmp_path / "fake_server.py"
+    server.write_text(FAKE_SERVER, encoding="utf-8")
+    config = tmp_path / "mcp_config.json"
+    config.write_text(json.dumps({
+        "mcpServers": {"fake": {"command": sys.executable, "args": [str(server)], **server_cfg}},
+    }), encoding="utf-8")
+
+    mcp = MCPClient(config_path=str(config), call_timeout=5)
+    mcp.connect_all()
+    return mcp
+
+
+@pytest.fixture
+def client(tmp_path):
+    mcp = _connect(tmp_path)
+    yield mcp
+    mcp.disconnect_all()
+
+
+@pytest.fixture
+def pooled_client(tmp_path):
+    mcp = _connect(tmp_path, workers=3)
+    yield mcp
+    mcp.disconnect_all()
+
+
+def _text(result_json: str) -> str:
+    return json.loads(result_json)["content"][0]["text"]
+
+
+class TestMCPClient:
+    def test_connect_collects_tools(self, client):
+        assert "fake__echo" in client.tools
+
+    def test_requests_use_unique_ids(self, client):
+        conn = client.servers["fake"].workers[0]
+        ids = [conn.submit("tools/list", {})[0] for _ in range(3)]
+        assert len(set(ids)) == 3
+
+    def test_pipelined_calls_are_routed_by_id(self, client):
+        """동시에 보낸 호출이 늦게 끝나는 순서와 무관하게 자기 응답을 받는다."""
+        delays = {"a": 0.6, "b": 0.3, "c": 0.0}
+        results = {}
+
+        def call(tag):
+            results[tag] = _text(client.call_tool("fake__echo", {"tag": tag, "delay": delays[tag]}))
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=call, args=(tag,)) for tag in delays]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - start
+
+        assert results == {"a": "a", "b": "b", "c": "c"}
+        # 직렬 처리였다면 0.9초 이상
+        assert elapsed < 0.85
+
+    def test_timeout_returns_error_and_ignores_late_reply(self, client):
+        client.call_timeout = 0.2
+        result = json.loads(client.call_tool("fake__echo", {"tag": "late", "delay": 0.5}))
+        assert "시간 초과" in result["error"]
+
+        # 늦게 도착한 응답이 다음 호출의 응답으로 잘못 매칭되지 않는다
+        client.call_timeout = 5
+        time.sleep(0.5)
+        assert _text(client.call_tool("fake__echo", {"tag": "next"})) == "next"
+        assert client.servers["fake"].workers[0].pending == 0
+
+    def test_call_timeout_override(self, client):
+        result = json.loads(client.call_tool("fake__echo", {"tag": "late", "delay": 0.5}, timeout=0.1))
+        assert "시간 초과" in result["error"]
+
+    def test_unsolicited_lines_are_ignored(self, client):
+        assert _text(client.call_tool("fake__echo", {"tag": "ok", "noise": True})) == "ok"
+
+    def test_server_exit_fails_call_and_restarts_worker(self, client):
+        """요청 도중 서버가 죽으면 에러를 돌려주고, 다음 호출은 새 프로세스가 처리한다."""
+        pool = client.servers["fake"]
+        old_pid = pool.workers[0].proc.pid
+
+        result = json.loads(client.call_tool("fake__echo", {"exit": True}))
+        assert "error" in result
+
+        assert _text(client.call_tool("fake__echo", {"tag": "after"})) == "after"
+        assert pool.workers[0].alive
+        assert pool.workers[0].proc.pid != old_pid
+        assert pool.restarts >= 1
+
+    def test_unknown_tool(self, client):
+        result = json.loads(client.call_tool("fake__missing", {}))
+        assert "찾을 수 없습니다" in result["error"]
+
+    def test_respawn_failure_returns_error(self, client):
+        """죽은 워커를 다시 띄우지 못하면 예외 대신 에러 JSON을 돌려준다."""
+        pool = client.servers["fake"]
+        pool.workers[0].proc.kill()
+        pool.workers[0].proc.wait(timeout=5)
+
+        spawn = pool._spawn
+        pool._spawn = MagicMock(side_effect=FileNotFoundError("python 없음"))
+        result = json.loads(client.call_tool("fake__echo", {"tag": "a"}))
+        assert "재시작 실패" in result["error"]
+
+        pool._spawn = spawn
+        assert _text(client.call_tool("fake__echo", {"tag": "b"})) == "b"
+
+    def test_trace_collects_server_spans(self, client):
+        from src.tracing import start_trace
+
+        with start_trace(record=True) as trace:
+            out = json.loads(client.call_tool("fake__echo", {"tag": "a"}))
+
+        assert "_meta" not in out
+        spans = {s["name"]: s for s in trace.to_record()["spans"]}
+        assert spans["mcp"]["tool"] == "fake__echo"
+        assert spans["fake:work"]["parent"] == "mcp"
+
+    def test_no_trace_meta_without_active_trace(self, client):
+        assert "_meta" not in json.loads(client.call_tool("fake__echo", {"tag": "a"}))
+
+
+class TestMCPServerPool:
+    def test_starts_configured_workers(self, pooled_client):
+        pool = pooled_client.servers["fake"]
+        assert pool.size == 3
+        assert len({conn.proc.pid for conn in pool.workers}) == 3
+        # 도구 목록은 한 번만 등록
+        assert list(pooled_client.tools) == ["fake__echo"]
+
+    def test_concurrent_calls_spread_across_workers(self, pooled_client):
+        """대기 요청이 가장 적은 워커로 보내므로 동시 호출이 서로 다른 프로세스로 간다."""
+        pids = []
+        lock = threading.Lock()
+
+        def call():
+            pid = _text(pooled_client.call_tool("fake__echo", {"pid": True, "delay": 0.3}))
+            with lock:
+                pids.append(pid)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for t in threads:
+            t.start()
+            time.sleep(0.05)  # 앞 요청이 대기 중인 상태에서 다음 요청 선택
+        for t in threads:
+            t.join()
+
+        assert len(set(pids)) == 3
+
+    def test_dead_worker_is_replaced(self, pooled_client):
+        pool = pooled_client.servers["fake"]
+        victim = pool.workers[1]
+        victim.proc.kill()
+        victim.proc.wait(timeout=5)
+
+        for _ in range(3):
+            assert _text(pooled_client.call_tool("fake__echo", {"tag": "ok"})) == "ok"
+
+        assert pool.restarts == 1
+        assert all(conn.alive for conn in pool.workers)
+        assert victim not in pool.workers
+
+    def test_respawn_does_not_block_other_calls(self, pooled_client):
+        """재시작 핸드셰이크 중에도 다른 호출은 살아 있는 워커로 바로 처리된다."""
+        pool = pooled_client.servers["fake"]
+        victim = pool.workers[0]
+        victim.proc.kill()
+        victim.proc.wait(timeout=5)
+
+        spawn = pool._spawn
+        spawning = threading.Event()
+
+        def slow_spawn():
+            spawning.set()
+            time.sleep(1.0)
+            return spawn()
+
+        pool._spawn = slow_spawn
+        restarter = threading.Thread(target=pooled_client.call_tool, args=("fake__echo", {"tag": "a"}))
+        restarter.start()
+        assert spawning.wait(timeout=5)
+
+        start = time.perf_counter()
+        assert _text(pooled_client.call_tool("fake__echo", {"tag": "b"})) == "b"
+        assert time.perf_counter() - start < 0.5
+        restarter.join()
+        assert pool.restarts == 1
+
+    def test_failed_start_closes_spawned_workers(self, tmp_path):
+        from src.mcp_client import MCPServerPool
+
+        pool = MCPServerPool("fake", {"command": "x", "workers": 3}, cwd=str(tmp_path))
+        spawned = [MagicMock(), MagicMock()]
+        pool._spawn = MagicMock(side_effect=[*spawned, TimeoutError("handshake")])
+
+        with pytest.raises(TimeoutError):
+            pool.start()
+
+        for conn in spawned:
+            conn.close.assert_called_once()
+        assert pool.workers == []
@@ -4,6 +4,13 @@ handle_request 함수를 직접 임포트하여 JSON-RPC 프로토콜을 검증
 vector_search_server는 lazy init이므로 import 시 모델을 로딩하지 않는다.
 """
 
+import io
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from src.mcp_servers import vector_search_server
 from src.mcp_servers.vector_search_server import handle_request as vs_handle
 from src.mcp_servers.web_search_server import handle_request as ws_handle
 
@@ -16,8 +23,8 @@ class TestVectorSearchServer:
 
     def test_tools_list(self):
         result = vs_handle({"method": "tools/list", "params": {}})
-        assert len(result["tools"]) == 1
-        assert result["tools"][0]["name"] == "search_vector_db"
+        names = [t["name"] for t in result["tools"]]
+        assert names == ["search_vector_db", "search_vector_db_batch"]
 
     def test_unknown_method(self):
         result = vs_handle({"method": "unknown/method", "params": {}})
@@ -27,6 +34,113 @@ class TestVectorSearchServer:
         result = vs_handle({"method": "notifications/initialized", "params": {}})
         assert result == {}
 
+    def test_batch_tool_returns_one_content_item_per_query(self):
+        from src.retriever import RetrievalResult
+
+        def result(text):
+            return RetrievalResult(content=text, parent_content=text, metadata={}, distance=0.1, rrf_score=0.1)
+
+        retriever = MagicMock()
+        retriever.search_batch.return_value = [[result("연차")], []]
+        with patch.object(vector_search_server, "_get_retriever", return_value=retriever):
+            out = vs_handle({
+                "method": "tools/call",
+                "params": {"name": "search_vector_db_batch", "arguments": {"queries": ["연차", "없음"], "top_k": 3}},
+            })
+
+        retriever.search_batch.assert_called_once_with(queries=["연차", "없음"], top_k=3)
+        batch = [json.loads(item["text"]) for item in out["content"]]
+        assert [[d["content"] for d in docs] for docs in batch] == [["연차"], []]
+
+    def test_docs_include_matched_child_and_score(self):
+        from src.retriever import RetrievalResult
+
+        retriever = MagicMock()
+        retriever.search.return_value = [RetrievalResult(
+            content="연차 15일", parent_content="연차 규정 전문... 연차 15일 ...",
+            metadata={"source": "hr.md"}, distance=0.2, rrf_score=0.03,
+        )]
+        with patch.object(vector_search_server, "_get_retriever", return_value=retriever):
+            out = vs_handle({
+                "method": "tools/call",
+                "params": {"name": "search_vector_db", "arguments": {"query": "연차"}},
+            })
+
+        doc = json.loads(out["content"][0]["text"])[0]
+        assert doc["content"] == "연차 규정 전문... 연차 15일 ..."
+        assert doc["child_content"] == "연차 15일"
+        assert doc["rrf_score"] == 0.03
+
+
+    def test_traced_call_returns_server_spans(self):
+        from src.tracing import span
+
+        def fake_search(query, top_k=5):
+            with span("retriever.embedding"):
+                pass
+            return {"content": [{"type": "text", "text": "[]"}]}
+
+        req = {
+            "id": 3, "method": "tools/call",
+            "params": {"name": "search_vector_db", "arguments": {"query": "연차"}, "_meta": {"trace": True}},
+        }
+        with patch.object(vector_search_server, "search", side_effect=fake_search):
+            traced = vector_search_server.respond(req)
+            req["params"].pop("_meta")
+            plain = vector_search_server.respond(req)
+
+        assert [s["name"] for s in traced["result"]["_meta"]["spans"]] == ["retriever.embedding"]
+        assert "_meta" not in plain["result"]
+
+
+class TestVectorSearchServe:
+    def _call(self, req_id, query):
+        return json.dumps({
+            "jsonrpc": "2.0", "id": req_id, "method": "tools/call",
+            "params": {"name": "search_vector_db", "arguments": {"query": query}},
+        }) + "\n"
+
+    def _serve(self, lines, workers=4):
+        out = io.StringIO()
+        vector_search_server.serve(stdin=io.StringIO("".join(lines)), stdout=out, workers=workers)
+        return [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_tool_calls_run_concurrently(self):
+        """느린 검색이 뒤 요청을 막지 않고, 끝난 순서대로 id와 함께 응답한다."""
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def fake_search(query, top_k=5):
+            with lock:
+                running.append(query)
+                peak.append(len(running))
+            time.sleep(0.3 if query == "slow" else 0.05)
+            with lock:
+                running.remove(query)
+            return {"content": [{"type": "text", "text": query}]}
+
+        with patch.object(vector_search_server, "search", side_effect=fake_search):
+            responses = self._serve([self._call(1, "slow"), self._call(2, "fast")])
+
+        assert [r["id"] for r in responses] == [2, 1]
+        assert {r["id"]: r["result"]["content"][0]["text"] for r in responses} == {1: "slow", 2: "fast"}
+        assert max(peak) == 2
+
+    def test_tool_call_error_keeps_id(self):
+        with patch.object(vector_search_server, "search", side_effect=RuntimeError("boom")):
+            responses = self._serve([self._call(7, "q")])
+
+        assert responses == [{"jsonrpc": "2.0", "id": 7, "error": {"code": -32603, "message": "boom"}}]
+
+    def test_non_tool_requests_answered_inline(self):
+        init = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}}) + "\n"
+        responses = self._serve([init, "not json\n"])
+
+        assert responses[0]["id"] == 1
+        assert responses[0]["result"]["serverInfo"]["name"] == "vector-search"
+        assert responses[1]["error"]["code"] == -32700
+
 
 class TestWebSearchServer:
     def test_initialize(self):
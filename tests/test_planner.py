@@ -2,7 +2,8 @@
 
 import json
 from tests.conftest import make_mock_llm, make_text_response
-from src.planner import QueryPlanner, QueryPlan
+from src.planner import QueryPlanner, QueryPlan, RoutePlanner
+from src.router import FastRouter, Router
 
 
 class TestQueryPlan:
@@ -94,3 +95,85 @@ class TestQueryPlanner:
         call_args = llm.chat.call_args
         user_msg = call_args.kwargs.get("messages", call_args[0][0] if call_args[0] else [])[-1]["content"]
         assert "휴가 규정" in user_msg
+
+
+class TestRoutePlanner:
+    def test_fused_single_call(self):
+        """라우트와 검색 계획을 LLM 호출 한 번으로 받는다."""
+        response_json = json.dumps({
+            "route": "INTERNAL_SEARCH",
+            "intent": "휴가 신청 방법 확인",
+            "keywords": ["휴가", "신청"],
+            "search_queries": ["휴가 신청 절차"],
+            "strategy": "SINGLE",
+        })
+        llm = make_mock_llm([make_text_response(f"```json\n{response_json}\n```")])
+
+        route, plan = RoutePlanner(llm=llm).route_and_plan("휴가 신청 어떻게 해?")
+
+        assert route == "INTERNAL_SEARCH"
+        assert plan.search_queries == ["휴가 신청 절차"]
+        assert llm.chat.call_count == 1
+
+    def test_fused_chitchat_skips_plan(self):
+        llm = make_mock_llm([make_text_response('{"route": "CHITCHAT"}')])
+
+        route, plan = RoutePlanner(llm=llm).route_and_plan("안녕")
+
+        assert route == "CHITCHAT"
+        assert plan is None
+
+    def test_invalid_route_falls_back(self):
+        llm = make_mock_llm([make_text_response(json.dumps({
+            "route": "UNKNOWN", "search_queries": ["q"],
+        }))])
+
+        route, plan = RoutePlanner(llm=llm).route_and_plan("질문")
+
+        assert route == "INTERNAL_SEARCH"
+        assert plan.search_queries == ["q"]
+
+    def test_parse_error_uses_route_word_and_original_query(self):
+        llm = make_mock_llm([make_text_response("WEB_SEARCH 입니다")])
+
+        route, plan = RoutePlanner(llm=llm).route_and_plan("오늘 날씨")
+
+        assert route == "WEB_SEARCH"
+        assert plan.search_queries == ["오늘 날씨"]
+
+    def test_confident_fast_chitchat_needs_no_llm(self):
+        llm = make_mock_llm([])
+        router = Router(llm=llm, fast_router=FastRouter(), fast_threshold=0.35)
+
+        route, plan = RoutePlanner(llm=llm, router=router).route_and_plan("안녕하세요")
+
+        assert route == "CHITCHAT"
+        assert plan is None
+        assert llm.chat.call_count == 0
+
+    def test_confident_fast_route_uses_planner_only(self):
+        """로컬 분류가 확신하면 통합 프롬프트 대신 Planner만 호출한다."""
+        plan_json = json.dumps({"search_queries": ["연차 규정"], "strategy": "SINGLE"})
+        llm = make_mock_llm([make_text_response(plan_json)])
+        fast = FastRouter({"INTERNAL_SEARCH": ["연차 규정 알려줘"], "CHITCHAT": ["안녕"]})
+        router = Router(llm=llm, fast_router=fast, fast_threshold=0.35)
+
+        route, plan = RoutePlanner(llm=llm, router=router).route_and_plan("연차 규정 알려줘")
+
+        assert route == "INTERNAL_SEARCH"
+        assert plan.search_queries == ["연차 규정"]
+        assert llm.chat.call_count == 1
+        system_prompt = llm.chat.call_args.kwargs["messages"][0]["content"]
+        assert "route" not in system_prompt
+
+    def test_fused_call_counts_as_llm_classification(self):
+        """로컬 분류가 애매해 통합 프롬프트로 가면 Router의 LLM 분류 횟수에 포함된다."""
+        fused_json = json.dumps({"route": "WEB_SEARCH", "search_queries": ["오늘 날씨"]})
+        llm = make_mock_llm([make_text_response(fused_json)])
+        fast = FastRouter({"INTERNAL_SEARCH": ["연차 규정 알려줘"], "CHITCHAT": ["안녕"]})
+        router = Router(llm=llm, fast_router=fast, fast_threshold=0.35)
+
+        route, _ = RoutePlanner(llm=llm, router=router).route_and_plan("오늘 날씨 어때")
+
+        assert route == "WEB_SEARCH"
+        assert (router.fast_hits, router.llm_calls) == (0, 1)
@@ -3,8 +3,19 @@
 BM25, RRF, AdvancedRetriever를 검증한다.
 """
 
+import numpy as np
+import pytest
 from unittest.mock import MagicMock, patch
-from src.retriever import BM25, reciprocal_rank_fusion, AdvancedRetriever, RetrievalResult
+from src.retriever import (
+    BM25,
+    NumpyBM25,
+    make_bm25,
+    reciprocal_rank_fusion,
+    AdvancedRetriever,
+    LRUCache,
+    RetrievalResult,
+    write_corpus_generation,
+)
 
 
 class TestBM25:
@@ -107,6 +118,59 @@ class TestBM25:
         bm25.index(docs)
         assert bm25.doc_ids == ["0", "1"]
 
+    def test_postings_only_contain_matching_docs(self):
+        """역색인 postings에는 토큰을 포함한 문서만 들어간다."""
+        bm25 = BM25()
+        docs = [
+            {"content": "연차 휴가 신청", "keywords": ""},
+            {"content": "출장비 정산", "keywords": ""},
+            {"content": "휴가 휴가 복귀", "keywords": ""},
+        ]
+        bm25.index(docs)
+        assert bm25.postings["휴가"] == [(0, 1), (2, 2)]
+        assert bm25.doc_freq["휴가"] == 2
+        assert bm25.postings["출장비"] == [(1, 1)]
+
+    def test_matches_full_scan_scores(self):
+        """역색인 스코어가 전체 문서 스캔 공식과 동일하다."""
+        import math
+
+        bm25 = BM25()
+        docs = [
+            {"content": "연차휴가신청 절차 안내", "keywords": "연차 휴가"},
+            {"content": "출장비 정산은 ERP에서 처리", "keywords": "출장비 ERP"},
+            {"content": "휴가 복귀 후 출장 보고", "keywords": "휴가 출장"},
+            {"content": "신입사원 온보딩", "keywords": ""},
+        ]
+        bm25.index(docs)
+
+        query = "휴가 출장비 신청"
+        expected = []
+        for i, doc in enumerate(docs):
+            tokens = bm25._tokenize(doc["keywords"] + " " + doc["content"])
+            score = 0.0
+            for token in bm25._tokenize(query):
+                tf = tokens.count(token)
+                if not tf:
+                    continue
+                df = bm25.doc_freq[token]
+                idf = math.log((len(docs) - df + 0.5) / (df + 0.5) + 1)
+                norm = 1 - bm25.b + bm25.b * len(tokens) / max(bm25.avg_dl, 1)
+                score += idf * tf * (bm25.k1 + 1) / (tf + bm25.k1 * norm)
+            expected.append((i, score))
+        expected.sort(key=lambda x: x[1], reverse=True)
+
+        assert bm25.search(query, top_k=4) == expected
+
+    def test_reindex_resets_state(self):
+        """index()를 다시 호출하면 이전 인덱스가 남지 않는다."""
+        bm25 = BM25()
+        bm25.index([{"content": "연차 휴가"}, {"content": "출장비 정산"}])
+        bm25.index([{"content": "온보딩 가이드"}])
+        assert len(bm25.doc_lengths) == 1
+        assert "휴가" not in bm25.postings
+        assert bm25.search("휴가", top_k=3) == [(0, 0.0)]
+
 
 class TestRRF:
     def test_single_source(self):
@@ -186,7 +250,7 @@ class TestAdvancedRetriever:
                 return parents_col
             raise Exception(f"Collection {name} not found")
 
-        mock_client.get_collection = get_collection
+        mock_client.get_collection = MagicMock(side_effect=get_collection)
         return mock_client, children_col, parents_col
 
     def test_search_returns_results(self):
@@ -262,6 +326,264 @@ class TestAdvancedRetriever:
         for r in results:
             assert r.rrf_score > 0
 
+    def test_parents_fetched_in_one_batch(self):
+        """결과의 Parent들을 한 번의 get으로 조회한다."""
+        mock_client, _, parents_col = self._make_mock_chroma()
+        mock_embedder = MagicMock()
+        mock_embedder.encode.return_value = MagicMock(tolist=lambda: [0.1] * 384)
+
+        retriever = AdvancedRetriever(chroma_client=mock_client, embedder=mock_embedder)
+        results = retriever.search("휴가 신청", top_k=2)
+
+        assert len(results) == 2
+        parents_col.get.assert_called_once()
+        assert sorted(parents_col.get.call_args.kwargs["ids"]) == ["doc_p0", "doc_p1"]
+        # 조회되지 않은 Parent는 Child 본문으로 대체
+        by_parent = {r.metadata["parent_id"]: r for r in results}
+        assert "연간 15일" in by_parent["doc_p0"].parent_content
+        assert by_parent["doc_p1"].parent_content == by_parent["doc_p1"].content
+
+    def test_parent_cache_reused_across_queries(self):
+        """캐시에 있는 Parent는 다시 조회하지 않는다."""
+        mock_client, _, parents_col = self._make_mock_chroma()
+        mock_embedder = MagicMock()
+        mock_embedder.encode.return_value = MagicMock(tolist=lambda: [0.1] * 384)
+
+        retriever = AdvancedRetriever(chroma_client=mock_client, embedder=mock_embedder)
+        retriever.search("휴가 신청", top_k=2)
+        parents_col.get.reset_mock()
+        results = retriever.search("휴가 신청", top_k=2)
+
+        # doc_p0만 캐시에 있으므로 doc_p1만 다시 조회
+        assert parents_col.get.call_args.kwargs["ids"] == ["doc_p1"]
+        assert any("연간 15일" in r.parent_content for r in results)
+
+    def test_parent_cache_cleared_on_new_generation(self, tmp_path):
+        """재인제스트로 세대 마커가 바뀌면 Parent 캐시를 비운다."""
+        mock_client, _, parents_col = self._make_mock_chroma()
+        mock_embedder = MagicMock()
+        mock_embedder.encode.return_value = MagicMock(tolist=lambda: [0.1] * 384)
+        corpus_dir = str(tmp_path)
+        write_corpus_generation(corpus_dir)
+
+        retriever = AdvancedRetriever(
+            chroma_client=mock_client, embedder=mock_embedder, corpus_dir=corpus_dir,
+        )
+        retriever.search("휴가", top_k=1)
+        retriever.search("휴가", top_k=1)
+        assert parents_col.get.call_count == 1
+
+        parents_col.get.return_value = {
+            "ids": ["doc_p0"], "documents": ["갱신된 휴가 규정"], "metadatas": [{}],
+        }
+        write_corpus_generation(corpus_dir)
+        results = retriever.search("휴가", top_k=1)
+
+        assert parents_col.get.call_count == 2
+        assert results[0].parent_content == "갱신된 휴가 규정"
+
+    def test_parent_fetched_during_generation_change_is_not_reused(self, tmp_path):
+        """Parent 조회 중 세대가 바뀌면, 그 조회 결과는 새 세대 검색에 쓰이지 않는다."""
+        mock_client, _, parents_col = self._make_mock_chroma()
+        mock_embedder = MagicMock()
+        mock_embedder.encode.return_value = MagicMock(tolist=lambda: [0.1] * 384)
+        corpus_dir = str(tmp_path)
+        write_corpus_generation(corpus_dir, "g1")
+        retriever = AdvancedRetriever(
+            chroma_client=mock_client, embedder=mock_embedder, corpus_dir=corpus_dir,
+        )
+
+        def fetch_during_reingest(ids):
+            # 다른 검색이 새 세대를 감지해 캐시를 비우는 동안 이전 세대 원문이 도착
+            write_corpus_generation(corpus_dir, "g2")
+            with retriever._state_lock:
+                retriever._sync_generation()
+            parents_col.get.side_effect = None
+            return {"ids": ["doc_p0"], "documents": ["OLD parent"], "metadatas": [{}]}
+
+        parents_col.get.side_effect = fetch_during_reingest
+        retriever.search("휴가", top_k=1)
+
+        parents_col.get.return_value = {"ids": ["doc_p0"], "documents": ["NEW parent"], "metadatas": [{}]}
+        results = retriever.search("휴가", top_k=1)
+
+        assert results[0].parent_content == "NEW parent"
+
+    def test_collections_opened_once(self):
+        """컬렉션 핸들과 BM25 인덱스는 검색마다 다시 만들지 않는다."""
+        mock_client, children_col, _ = self._make_mock_chroma()
+        mock_embedder = MagicMock()
+        mock_embedder.encode.return_value = MagicMock(tolist=lambda: [0.1] * 384)
+
+        retriever = AdvancedRetriever(chroma_client=mock_client, embedder=mock_embedder)
+        for _ in range(3):
+            retriever.search("휴가", top_k=2)
+
+        assert mock_client.get_collection.call_count == 2  # children + parents
+        children_col.get.assert_called_once_with(limit=3)
+
+    def test_new_generation_reloads_collections_and_bm25(self, tmp_path):
+        """세대 마커가 바뀌면 컬렉션을 다시 열고 BM25를 새 데이터로 재구축한다."""
+        mock_client, children_col, _ = self._make_mock_chroma()
+        mock_embedder = MagicMock()
+        mock_embedder.encode.return_value = MagicMock(tolist=lambda: [0.1] * 384)
+        corpus_dir = str(tmp_path)
+        write_corpus_generation(corpus_dir)
+
+        retriever = AdvancedRetriever(
+            chroma_client=mock_client, embedder=mock_embedder, corpus_dir=corpus_dir,
+        )
+        retriever.search("휴가", top_k=2)
+        retriever.search("휴가", top_k=2)
+        assert mock_client.get_collection.call_count == 2
+        assert retriever.bm25.doc_ids == ["doc_p0_c0", "doc_p0_c1", "doc_p1_c0"]
+
+        children_col.count.return_value = 1
+        children_col.get.return_value = {
+            "ids": ["doc_p2_c0"],
+            "documents": ["[출처: new.txt] 재택근무 신청 방법"],
+            "metadatas": [{"parent_id": "doc_p2", "keywords": "재택근무"}],
+        }
+        write_corpus_generation(corpus_dir)
+        retriever.search("재택근무", top_k=2)
+
+        assert mock_client.get_collection.call_count == 4
+        assert retriever.bm25.doc_ids == ["doc_p2_c0"]
+
+    def test_concurrent_searches_build_bm25_once(self):
+        """여러 스레드가 동시에 첫 검색을 해도 BM25는 한 번만 구축된다."""
+        import threading
+
+        mock_client, children_col, _ = self._make_mock_chroma()
+        mock_embedder = MagicMock()
+        mock_embedder.encode.return_value = MagicMock(tolist=lambda: [0.1] * 384)
+        retriever = AdvancedRetriever(chroma_client=mock_client, embedder=mock_embedder)
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(retriever.search("휴가", top_k=2)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(results) == 8 and all(results)
+        children_col.get.assert_called_once_with(limit=3)
+        assert mock_client.get_collection.call_count == 2
+
+    def test_search_batch_shares_embedding_and_queries(self):
+        """배치 검색은 임베딩 1회, 벡터 검색 1회, Parent 조회 1회로 쿼리별 결과를 만든다."""
+        mock_client, children_col, parents_col = self._make_mock_chroma()
+        mock_embedder = MagicMock()
+        mock_embedder.encode.return_value = np.full((2, 384), 0.1)
+        children_col.query.return_value = {
+            "ids": [["doc_p0_c0"], ["doc_p1_c0"]],
+            "documents": [
+                ["[출처: doc.txt] 연차 휴가 신청은 HR 포털에서"],
+                ["[출처: doc.txt] 신입사원 온보딩 첫 주 OJT"],
+            ],
+            "metadatas": [
+                [{"parent_id": "doc_p0", "keywords": "연차 휴가 신청 HR"}],
+                [{"parent_id": "doc_p1", "keywords": "신입사원 온보딩 OJT"}],
+            ],
+            "distances": [[0.1], [0.2]],
+        }
+
+        retriever = AdvancedRetriever(chroma_client=mock_client, embedder=mock_embedder)
+        batch = retriever.search_batch(["연차 휴가", "온보딩 OJT"], top_k=1)
+
+        mock_embedder.encode.assert_called_once_with(["연차 휴가", "온보딩 OJT"])
+        children_col.query.assert_called_once()
+        assert len(children_col.query.call_args.kwargs["query_embeddings"]) == 2
+        parents_col.get.assert_called_once()
+        assert [r[0].metadata["parent_id"] for r in batch] == ["doc_p0", "doc_p1"]
+        assert "연간 15일" in batch[0][0].parent_content
+
+    def test_search_batch_matches_single_search(self):
+        """쿼리 하나짜리 배치 결과는 search()와 같다."""
+        mock_client, _, _ = self._make_mock_chroma()
+        mock_embedder = MagicMock()
+        mock_embedder.encode.side_effect = lambda texts: (
+            np.full((len(texts), 384), 0.1) if isinstance(texts, list) else np.full(384, 0.1)
+        )
+
+        retriever = AdvancedRetriever(chroma_client=mock_client, embedder=mock_embedder)
+        single = retriever.search("휴가 신청", top_k=2)
+        batch = retriever.search_batch(["휴가 신청"], top_k=2)
+
+        assert batch == [single]
+        assert retriever.search_batch([], top_k=2) == []
+
+    def test_loads_disk_bm25_index(self, tmp_path):
+        """디스크 인덱스가 있으면 Chroma 전체 조회 없이 BM25를 사용한다."""
+        mock_client, children_col, _ = self._make_mock_chroma()
+        mock_embedder = MagicMock()
+        mock_embedder.encode.return_value = MagicMock(tolist=lambda: [0.1] * 384)
+
+        all_data = children_col.get.return_value
+        disk = NumpyBM25()
+        disk.index([
+            {"id": doc_id, "content": AdvancedRetriever._strip_contextual_header(doc), "keywords": meta["keywords"]}
+            for doc_id, doc, meta in zip(all_data["ids"], all_data["documents"], all_data["metadatas"])
+        ])
+        index_dir = str(tmp_path / "bm25")
+        disk.save(index_dir)
+
+        retriever = AdvancedRetriever(
+            chroma_client=mock_client, embedder=mock_embedder, bm25_index_dir=index_dir,
+        )
+        results = retriever.search("출장비 정산", top_k=3)
+
+        assert isinstance(retriever.bm25, NumpyBM25)
+        # 전체 조회(limit=count)는 없고, BM25 전용 결과만 ids로 조회
+        for call in children_col.get.call_args_list:
+            assert "limit" not in call.kwargs
+        fetched_ids = children_col.get.call_args.kwargs["ids"]
+        assert fetched_ids == ["doc_p0_c1"]
+        assert results
+
+    def test_stale_disk_index_falls_back_to_rebuild(self, tmp_path):
+        """문서 수가 다른 디스크 인덱스는 무시하고 컬렉션으로 재구축한다."""
+        mock_client, children_col, _ = self._make_mock_chroma()
+        mock_embedder = MagicMock()
+        mock_embedder.encode.return_value = MagicMock(tolist=lambda: [0.1] * 384)
+
+        disk = NumpyBM25()
+        disk.index([{"id": "old", "content": "오래된 문서"}])
+        index_dir = str(tmp_path / "bm25")
+        disk.save(index_dir)
+
+        retriever = AdvancedRetriever(
+            chroma_client=mock_client, embedder=mock_embedder, bm25_index_dir=index_dir,
+        )
+        retriever.search("휴가", top_k=2)
+
+        assert retriever.bm25.doc_ids == ["doc_p0_c0", "doc_p0_c1", "doc_p1_c0"]
+        children_col.get.assert_called_with(limit=3)
+
+    def test_disk_index_from_other_generation_is_rebuilt(self, tmp_path):
+        """문서 수가 같아도 세대 마커와 다른 세대의 디스크 인덱스는 쓰지 않는다."""
+        mock_client, children_col, _ = self._make_mock_chroma()
+        mock_embedder = MagicMock()
+        mock_embedder.encode.return_value = MagicMock(tolist=lambda: [0.1] * 384)
+
+        disk = NumpyBM25()
+        disk.index([{"id": f"old{i}", "content": "오래된 문서"} for i in range(3)])
+        index_dir = str(tmp_path / "bm25")
+        disk.save(index_dir, generation="old")
+        write_corpus_generation(str(tmp_path), "new")
+
+        retriever = AdvancedRetriever(
+            chroma_client=mock_client, embedder=mock_embedder,
+            bm25_index_dir=index_dir, corpus_dir=str(tmp_path),
+        )
+        retriever.search("휴가", top_k=2)
+
+        assert retriever.bm25.doc_ids == ["doc_p0_c0", "doc_p0_c1", "doc_p1_c0"]
+        children_col.get.assert_called_with(limit=3)
+
     def test_strip_contextual_header(self):
         """BM25 인덱싱 시 [출처:] 헤더가 제거된다."""
         text_with_header = "[출처: doc.txt | 제목 | 섹션 1/3]\n실제 본문 내용입니다."
@@ -274,3 +596,133 @@ class TestAdvancedRetriever:
         text = "일반 텍스트입니다."
         stripped = AdvancedRetriever._strip_contextual_header(text)
         assert stripped == text
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put_many({"a": 1, "b": 2})
+        cache.get_many(["a"])  # a를 최근 사용으로
+        cache.put_many({"c": 3})
+
+        assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+        assert len(cache) == 2
+
+    def test_hit_miss_counters(self):
+        cache = LRUCache(maxsize=4)
+        cache.put_many({"a": 1})
+        cache.get_many(["a", "b"])
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_zero_size_disables_cache(self):
+        cache = LRUCache(maxsize=0)
+        cache.put_many({"a": 1})
+        assert len(cache) == 0
+
+
+class TestNumpyBM25:
+    DOCS = [
+        {"id": "a", "content": "연차휴가신청 절차 안내", "keywords": "연차 휴가"},
+        {"id": "b", "content": "출장비 정산은 ERP에서 처리", "keywords": "출장비 ERP"},
+        {"id": "c", "content": "휴가 복귀 후 출장 보고", "keywords": "휴가 출장"},
+        {"id": "d", "content": "신입사원 온보딩", "keywords": ""},
+        {"id": "e", "content": "휴가 휴가 휴가 규정", "keywords": ""},
+    ]
+
+    def test_matches_python_backend(self):
+        """NumPy 백엔드가 순수 Python BM25와 같은 순위/스코어를 반환한다."""
+        py, vec = BM25(), NumpyBM25()
+        py.index(self.DOCS)
+        vec.index(self.DOCS)
+
+        for query in ["휴가 신청", "출장비 ERP", "온보딩", "연차휴가", "블록체인"]:
+            expected = py.search(query, top_k=4)
+            actual = vec.search(query, top_k=4)
+            assert [i for i, _ in actual] == [i for i, _ in expected]
+            for (_, a), (_, e) in zip(actual, expected):
+                assert a == pytest.approx(e, rel=1e-5)
+
+    def test_array_layout(self):
+        """postings가 int32/float32 연속 배열로 저장된다."""
+        bm25 = NumpyBM25()
+        bm25.index(self.DOCS)
+        assert bm25.post_doc_ids.dtype == np.int32
+        assert bm25.post_tfs.dtype == np.float32
+        assert bm25.doc_norms.shape == (len(self.DOCS),)
+        assert bm25.term_offsets[-1] == len(bm25.post_doc_ids)
+        assert bm25.postings == {}
+
+        term_id = bm25.vocab["휴가"]
+        start, end = bm25.term_offsets[term_id], bm25.term_offsets[term_id + 1]
+        assert bm25.post_doc_ids[start:end].tolist() == [0, 2, 4]
+        assert bm25.post_tfs[start:end].tolist() == [2.0, 2.0, 3.0]
+
+    def test_top_k_smaller_than_matches(self):
+        """top_k가 매칭 수보다 작으면 상위 top_k만 반환한다."""
+        bm25 = NumpyBM25()
+        bm25.index(self.DOCS)
+        results = bm25.search("휴가", top_k=2)
+        assert len(results) == 2
+        assert results[0][1] >= results[1][1] > 0
+
+    def test_empty_corpus(self):
+        bm25 = NumpyBM25()
+        bm25.index([])
+        assert bm25.search("테스트", top_k=3) == []
+
+    def test_make_bm25(self):
+        assert isinstance(make_bm25("numpy"), NumpyBM25)
+        assert type(make_bm25("python")) is BM25
+        with pytest.raises(ValueError):
+            make_bm25("scipy")
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        """저장한 인덱스를 memory-map으로 읽어도 검색 결과가 같다."""
+        bm25 = NumpyBM25()
+        bm25.index(self.DOCS)
+        index_dir = str(tmp_path / "bm25")
+        bm25.save(index_dir)
+
+        loaded = NumpyBM25.load(index_dir)
+        assert isinstance(loaded.post_doc_ids, np.memmap)
+        assert loaded.doc_ids == ["a", "b", "c", "d", "e"]
+        for query in ["휴가 신청", "출장비", "블록체인"]:
+            assert loaded.search(query, top_k=3) == bm25.search(query, top_k=3)
+
+    def test_save_switches_to_new_version(self, tmp_path):
+        """다시 저장하면 새 버전 디렉토리를 쓰고 포인터만 바꾼다 (열려 있는 이전 버전은 그대로 읽힌다)."""
+        index_dir = str(tmp_path / "bm25")
+        first = NumpyBM25()
+        first.index(self.DOCS)
+        first.save(index_dir, generation="gen1")
+        mapped = NumpyBM25.load(index_dir)
+
+        second = NumpyBM25()
+        second.index([{"id": "z", "content": "온보딩 가이드"}])
+        second.save(index_dir, generation="gen2")
+
+        loaded = NumpyBM25.load(index_dir, mmap=False)
+        assert loaded.doc_ids == ["z"]
+        assert loaded.generation == "gen2"
+        assert (tmp_path / "bm25" / "CURRENT").read_text(encoding="utf-8") == "gen2"
+        assert sorted(p.name for p in (tmp_path / "bm25").iterdir()) == ["CURRENT", "gen2"]
+        assert mapped.search("휴가 신청", top_k=1) == first.search("휴가 신청", top_k=1)
+
+    def test_update_matches_fresh_index(self):
+        """update()로 제거/추가한 결과가 처음부터 index()한 것과 같다."""
+        updated = NumpyBM25()
+        updated.index(self.DOCS)
+        added = [
+            {"id": "f", "content": "재택근무 신청 절차", "keywords": "재택근무"},
+            {"id": "g", "content": "휴가 이월 규정", "keywords": "휴가"},
+        ]
+        updated.update(added, remove_ids={"b", "d"})
+
+        fresh = NumpyBM25()
+        fresh.index([d for d in self.DOCS if d["id"] not in {"b", "d"}] + added)
+
+        assert updated.doc_ids == fresh.doc_ids == ["a", "c", "e", "f", "g"]
+        assert updated.avg_dl == fresh.avg_dl
+        assert "출장비" not in updated.vocab  # postings가 사라진 토큰은 어휘에서 제외
+        for query in ["휴가 신청", "재택근무", "출장 보고", "온보딩"]:
+            assert updated.search(query, top_k=5) == fresh.search(query, top_k=5)
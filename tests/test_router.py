@@ -1,7 +1,10 @@
 """Router 단위 테스트"""
 
+import json
+import time
+
 from tests.conftest import make_mock_llm, make_text_response
-from src.router import Router
+from src.router import FastRouter, Router, load_router_examples
 
 
 class TestRouter:
@@ -37,3 +40,81 @@ class TestRouter:
         llm = make_mock_llm([make_text_response("chitchat")])
         router = Router(llm=llm)
         assert router.classify("ㅎㅇ") == "CHITCHAT"
+
+
+class TestFastRouter:
+    def test_obvious_queries(self):
+        router = FastRouter()
+        assert router.predict("안녕")[0] == "CHITCHAT"
+        assert router.predict("고마워")[0] == "CHITCHAT"
+        assert router.predict("오늘 부산 날씨 어때?")[0] == "WEB_SEARCH"
+        assert router.predict("출장비 정산 방법 알려줘")[0] == "INTERNAL_SEARCH"
+
+    def test_exact_example_has_high_confidence(self):
+        label, confidence = FastRouter().predict("ㅎㅇ")
+        assert label == "CHITCHAT"
+        assert confidence > 0.9
+
+    def test_unknown_text_has_no_confidence(self):
+        assert FastRouter().predict("xyz") == ("", 0.0)
+
+    def test_greeting_with_question_is_not_chitchat(self):
+        """인사 뒤에 질문이 붙으면 CHITCHAT으로 확신하지 않는다 (검색을 건너뛰지 않도록)."""
+        router = FastRouter()
+        for query in ["thanks! expense rules?", "hello vacation", "고마워 연차", "hi, leave policy"]:
+            label, confidence = router.predict(query)
+            assert not (label == "CHITCHAT" and confidence > 0), query
+
+    def test_greeting_with_question_goes_to_llm(self):
+        llm = make_mock_llm([make_text_response("INTERNAL_SEARCH")])
+        router = Router(llm=llm, fast_router=FastRouter())
+
+        assert router.classify("고마워 연차") == "INTERNAL_SEARCH"
+        assert (router.fast_hits, router.llm_calls) == (0, 1)
+
+    def test_low_similarity_has_no_confidence(self):
+        assert FastRouter(min_similarity=0.99).predict("휴가 신청 방법") == ("INTERNAL_SEARCH", 0.0)
+
+    def test_custom_examples(self):
+        router = FastRouter({"CHITCHAT": ["잘 자"], "WEB_SEARCH": ["환율 시세"]})
+        assert router.predict("잘 자요")[0] == "CHITCHAT"
+        assert set(router.labels) == {"CHITCHAT", "WEB_SEARCH"}
+
+    def test_predict_is_fast(self):
+        router = FastRouter()
+        router.predict("워밍업")
+        start = time.perf_counter()
+        for _ in range(200):
+            router.predict("연차 휴가 신청 방법 알려줘")
+        assert (time.perf_counter() - start) / 200 < 0.001
+
+    def test_load_examples_jsonl_and_json(self, tmp_path):
+        jsonl = tmp_path / "examples.jsonl"
+        jsonl.write_text(
+            '{"text": "안녕", "label": "CHITCHAT"}\n{"text": "날씨", "label": "WEB_SEARCH"}\n',
+            encoding="utf-8",
+        )
+        assert load_router_examples(str(jsonl)) == {"CHITCHAT": ["안녕"], "WEB_SEARCH": ["날씨"]}
+
+        as_json = tmp_path / "examples.json"
+        as_json.write_text(json.dumps({"CHITCHAT": ["안녕"]}, ensure_ascii=False), encoding="utf-8")
+        assert load_router_examples(str(as_json)) == {"CHITCHAT": ["안녕"]}
+
+
+class TestTieredRouter:
+    def test_confident_query_skips_llm(self):
+        llm = make_mock_llm([make_text_response("INTERNAL_SEARCH")])
+        router = Router(llm=llm, fast_router=FastRouter())
+
+        assert router.classify("안녕하세요") == "CHITCHAT"
+        llm.chat.assert_not_called()
+        assert (router.fast_hits, router.llm_calls) == (1, 0)
+
+    def test_ambiguous_query_falls_back_to_llm(self):
+        llm = make_mock_llm([make_text_response("INTERNAL_SEARCH")])
+        router = Router(llm=llm, fast_router=FastRouter(), fast_threshold=0.99)
+
+        assert router.classify("휴가 신청 방법") == "INTERNAL_SEARCH"
+        llm.chat.assert_called_once()
+        assert (router.fast_hits, router.llm_calls) == (0, 1)
+        assert llm.chat.call_args.kwargs["cache_stage"] == "router"
@@ -0,0 +1,108 @@
+"""Speculative Retrieval 단위 테스트"""
+
+import threading
+import time
+
+from src.speculative import SpeculativeSearch, query_similarity
+
+
+class TestQuerySimilarity:
+    def test_identical(self):
+        assert query_similarity("연차 휴가 신청", "연차 휴가 신청") == 1.0
+
+    def test_planner_style_rewrite_is_close(self):
+        """조사/어미만 다른 재작성은 기본 임계값(0.5) 이상."""
+        assert query_similarity("연차 휴가 며칠이야?", "연차 휴가 일수") >= 0.5
+
+    def test_multi_subquery_is_not_close_to_whole(self):
+        """MULTI 분해로 나온 원문의 일부는 원문 전체와 비슷하지 않다."""
+        raw = "연차 휴가랑 출장비 정산 둘 다 알려줘"
+        assert query_similarity(raw, "연차 휴가") < 0.5
+        assert query_similarity(raw, "출장비 정산") < 0.5
+        assert query_similarity("연차 휴가", raw) == query_similarity(raw, "연차 휴가")
+
+    def test_unrelated_queries(self):
+        assert query_similarity("연차 휴가 신청", "출장비 정산 방법") < 0.3
+
+    def test_empty(self):
+        assert query_similarity("", "연차") == 0.0
+
+
+class TestSpeculativeSearch:
+    def test_hit_reuses_result_for_similar_queries(self):
+        calls = []
+
+        def search_fn(query):
+            calls.append(query)
+            return [{"content": f"{query} 문서"}]
+
+        spec_search = SpeculativeSearch(search_fn, threshold=0.6)
+        spec = spec_search.start("연차 휴가 신청 방법 알려줘")
+        prefetched = spec_search.resolve(spec, ["연차 휴가 신청 방법", "출장비 정산"])
+
+        assert calls == ["연차 휴가 신청 방법 알려줘"]
+        assert list(prefetched) == ["연차 휴가 신청 방법"]
+        assert prefetched["연차 휴가 신청 방법"] == [{"content": "연차 휴가 신청 방법 알려줘 문서"}]
+        assert (spec_search.stats.hits, spec_search.stats.misses) == (1, 0)
+        spec_search.close()
+
+    def test_multi_plan_runs_real_searches(self):
+        """MULTI 검색어는 추측 결과로 대체하지 않는다."""
+        spec_search = SpeculativeSearch(lambda q: [{"content": q}])
+        spec = spec_search.start("연차 휴가랑 출장비 정산 둘 다 알려줘")
+        assert spec_search.resolve(spec, ["연차 휴가", "출장비 정산"]) == {}
+        assert spec_search.stats.misses == 1
+        spec_search.close()
+
+    def test_reuses_for_at_most_one_query(self):
+        """여러 검색어가 원문과 비슷해도 가장 비슷한 하나에만 재사용한다."""
+        spec_search = SpeculativeSearch(lambda q: [{"content": q}])
+        spec = spec_search.start("연차 휴가 신청 방법")
+        prefetched = spec_search.resolve(spec, ["연차 휴가 신청", "연차 휴가 신청 방법"])
+        assert list(prefetched) == ["연차 휴가 신청 방법"]
+        spec_search.close()
+
+    def test_miss_discards_result(self):
+        spec_search = SpeculativeSearch(lambda q: [{"content": q}])
+        spec = spec_search.start("회사 복지 제도")
+        assert spec_search.resolve(spec, ["출장비 정산 절차"]) == {}
+        assert (spec_search.stats.hits, spec_search.stats.misses) == (0, 1)
+        assert spec_search.stats.hit_rate == 0.0
+        spec_search.close()
+
+    def test_search_error_counts_as_miss(self):
+        def search_fn(query):
+            raise RuntimeError("검색 실패")
+
+        spec_search = SpeculativeSearch(search_fn)
+        spec = spec_search.start("연차 휴가")
+        assert spec_search.resolve(spec, ["연차 휴가"]) == {}
+        assert spec_search.stats.misses == 1
+        spec_search.close()
+
+    def test_search_runs_in_background(self):
+        """start()는 검색 완료를 기다리지 않고, 이미 끝난 시간만큼 절감으로 기록한다."""
+        release = threading.Event()
+
+        def search_fn(query):
+            release.wait(timeout=5)
+            time.sleep(0.1)
+            return []
+
+        spec_search = SpeculativeSearch(search_fn)
+        start = time.perf_counter()
+        spec = spec_search.start("연차 휴가")
+        assert time.perf_counter() - start < 0.05
+
+        release.set()
+        time.sleep(0.2)  # Router/Planner가 도는 동안 검색 완료
+        spec_search.resolve(spec, ["연차 휴가"])
+        assert spec_search.stats.saved_sec >= 0.09
+        spec_search.close()
+
+    def test_discard(self):
+        spec_search = SpeculativeSearch(lambda q: [])
+        spec_search.discard(spec_search.start("안녕"))
+        assert spec_search.stats.discarded == 1
+        assert "폐기 1" in spec_search.stats.summary()
+        spec_search.close()
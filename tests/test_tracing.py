@@ -0,0 +1,135 @@
+"""Tracing 단위 테스트"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src import tracing
+from src.llm_adapter import OllamaAdapter
+from src.tracing import (
+    TraceWriter, add_remote_spans, annotate, annotate_trace, propagate, span, start_trace,
+)
+
+
+class TestNoTrace:
+    def test_span_is_shared_noop(self):
+        assert span("router") is tracing._NOOP
+        with span("router") as s:
+            s.set(x=1)
+        annotate(x=1)
+        annotate_trace(x=1)
+        assert tracing.active() is False
+
+    def test_propagate_returns_function_unchanged(self):
+        fn = lambda: None  # noqa: E731
+        assert propagate(fn) is fn
+
+    def test_start_trace_without_writer_is_disabled(self):
+        with start_trace(None, query="q") as trace:
+            assert trace is None
+            assert tracing.active() is False
+
+
+class TestSpans:
+    def test_nested_spans_record_parent_and_attrs(self):
+        with start_trace(record=True, query="연차") as trace:
+            with span("search", queries=2):
+                with span("mcp", tool="vs__search"):
+                    annotate(cache_hit=False)
+            annotate_trace(route="INTERNAL_SEARCH")
+
+        record = trace.to_record()
+        spans = {s["name"]: s for s in record["spans"]}
+        assert record["query"] == "연차"
+        assert record["route"] == "INTERNAL_SEARCH"
+        assert spans["search"]["parent"] is None
+        assert spans["search"]["queries"] == 2
+        assert spans["mcp"]["parent"] == "search"
+        assert spans["mcp"]["cache_hit"] is False
+        assert spans["search"]["duration_ms"] >= spans["mcp"]["duration_ms"]
+        assert record["total_ms"] >= spans["search"]["duration_ms"]
+        assert tracing.active() is False
+
+    def test_exception_is_recorded_and_reraised(self):
+        with pytest.raises(ValueError):
+            with start_trace(record=True) as trace:
+                with span("grade"):
+                    raise ValueError("boom")
+
+        record = trace.to_record()
+        assert record["error"] == "ValueError"
+        assert record["spans"][0]["error"] == "ValueError"
+
+    def test_propagate_into_thread_pool(self):
+        with start_trace(record=True) as trace:
+            with span("search"):
+                def work(i):
+                    with span(f"mcp{i}"):
+                        return threading.current_thread().name
+
+                with ThreadPoolExecutor(max_workers=3) as pool:
+                    list(pool.map(propagate(work), range(3)))
+
+        spans = trace.to_record()["spans"]
+        assert sorted(s["name"] for s in spans) == ["mcp0", "mcp1", "mcp2", "search"]
+        assert all(s["parent"] == "search" for s in spans if s["name"] != "search")
+
+    def test_remote_spans_are_prefixed_and_offset(self):
+        remote = [
+            {"name": "retriever.embedding", "parent": None, "start_ms": 1.0, "duration_ms": 5.0},
+            {"name": "retriever.bm25", "parent": "retriever.embedding", "start_ms": 2.0, "duration_ms": 1.0},
+        ]
+        with start_trace(record=True) as trace:
+            with span("mcp"):
+                add_remote_spans(remote, prefix="vector-search:")
+
+        spans = {s["name"]: s for s in trace.to_record()["spans"]}
+        mcp_start = spans["mcp"]["start_ms"]
+        assert spans["vector-search:retriever.embedding"]["parent"] == "mcp"
+        assert spans["vector-search:retriever.bm25"]["parent"] == "vector-search:retriever.embedding"
+        assert spans["vector-search:retriever.embedding"]["start_ms"] == pytest.approx(mcp_start + 1.0, abs=0.01)
+
+
+class TestTraceWriter:
+    def test_writes_one_line_per_trace(self, tmp_path):
+        writer = TraceWriter(str(tmp_path / "traces" / "t.jsonl"))
+        for q in ("q1", "q2"):
+            with start_trace(writer, query=q):
+                with span("router"):
+                    pass
+
+        lines = (tmp_path / "traces" / "t.jsonl").read_text(encoding="utf-8").splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [r["query"] for r in records] == ["q1", "q2"]
+        assert records[0]["trace_id"] != records[1]["trace_id"]
+        assert [s["name"] for s in records[0]["spans"]] == ["router"]
+
+
+class TestLLMSpan:
+    @patch("src.http_session.requests.Session.post")
+    def test_chat_records_ollama_metrics(self, mock_post):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "message": {"content": "INTERNAL_SEARCH"},
+            "total_duration": 1_500_000_000,
+            "prompt_eval_count": 120,
+            "prompt_eval_duration": 300_000_000,
+            "eval_count": 5,
+            "eval_duration": 100_000_000,
+        }
+        mock_post.return_value = mock_response
+
+        adapter = OllamaAdapter(model="m")
+        with start_trace(record=True) as trace:
+            adapter.chat([{"role": "user", "content": "q"}], cache_stage="router")
+
+        (llm,) = trace.to_record()["spans"]
+        assert llm["name"] == "llm"
+        assert llm["stage"] == "router"
+        assert llm["ollama_total_ms"] == 1500.0
+        assert llm["ollama_prompt_eval_ms"] == 300.0
+        assert llm["prompt_eval_count"] == 120
+        assert llm["eval_count"] == 5